@@ -1,37 +1,91 @@
 from pyramid.config import Configurator
-from sqlalchemy import engine_from_config
-from pyramid.session import UnencryptedCookieSessionFactoryConfig
+from pyramid.settings import asbool, aslist
+from pyramid.tweens import INGRESS
 from pyramid.authentication import AuthTktAuthenticationPolicy
 from pyramid.authorization import ACLAuthorizationPolicy
-from plog.security import groupfinder
-from uuid import uuid4
+from plog.security import groupfinder, configure_principal_cache
+from plog.cache import page_cache_from_settings
+from plog.feeds import feed_cache_from_settings
+from plog.slugs import configure_slug_map
+from plog.metrics import instrument_engine, render_timing_deriver
+from plog.passwords import configure_passwords
+from plog.db import make_engine
+from plog.replicas import configure_replicas, router_from_settings
+from plog.sessions import session_factory_from_settings
+from plog.templating import configure_templates
+from plog.assets import configure_assets
+from plog.workers import get_secret, install_fork_hooks, shared_stats_from_settings
 
 from plog.models import (
     DBSession,
     Base,
 )
-sf = UnencryptedCookieSessionFactoryConfig(uuid4().__str__())
+
+DEVELOPMENT_ONLY_INCLUDES = ('pyramid_debugtoolbar',)
+
+
+def apply_profile(settings):
+    """ With ``plog.profile = production``, drop development-only includes
+    and template reloading whatever else the ini file says.
+    """
+    if settings.get('plog.profile') != 'production':
+        return settings
+    includes = aslist(settings.get('pyramid.includes', ''))
+    settings['pyramid.includes'] = '\n'.join(
+        i for i in includes if i not in DEVELOPMENT_ONLY_INCLUDES)
+    for key in ('pyramid.reload_templates', 'jinja2.reload_templates',
+                'pyramid.reload_assets', 'pyramid.debug_authorization',
+                'pyramid.debug_notfound', 'pyramid.debug_routematch'):
+        settings[key] = 'false'
+    return settings
 
 
 def main(global_config, **settings):
     """ This function returns a Pyramid WSGI application.
     """
-    engine = engine_from_config(settings, 'sqlalchemy.')
-    DBSession.configure(bind=engine)
+    apply_profile(settings)
+    prefork = asbool(settings.get('plog.prefork'))
+    engine = make_engine(settings)
+    router = router_from_settings(settings, instrument_engine)
+    DBSession.configure(bind=engine, router=router)
     Base.metadata.bind = engine
+    instrument_engine(engine)
+    configure_principal_cache(settings)
+    # Pre-forked workers warm up after the fork, on their own connections.
+    configure_slug_map(settings, engine, warm=not prefork)
+    configure_passwords(settings)
     authn_policy = AuthTktAuthenticationPolicy(
-        uuid4().__str__(), callback=groupfinder, hashalg='sha512')
+        get_secret(settings, 'plog.secret'), callback=groupfinder, hashalg='sha512')
     authz_policy = ACLAuthorizationPolicy()
+    sf = session_factory_from_settings(settings)
     config = Configurator(settings=settings, root_factory='plog.models.RootFactory', session_factory=sf)
     config.set_authentication_policy(authn_policy)
     config.set_authorization_policy(authz_policy)
+    config.registry.page_cache = page_cache_from_settings(settings)
+    config.registry.feed_cache = feed_cache_from_settings(settings)
+    config.registry.shared_stats = shared_stats_from_settings(config.registry)
+    config.registry.replica_router = router
+    config.registry.session_factory = sf
+    configure_replicas(config, router)
+    if prefork:
+        install_fork_hooks(config.registry)
     config.include('pyramid_jinja2')
+    config.add_tween('plog.metrics.timing_tween_factory', under=INGRESS)
+    config.add_view_deriver(render_timing_deriver)
     config.add_jinja2_search_path("plog:templates")
-    config.add_static_view('static', 'static', cache_max_age=3600)
+    configure_templates(config)
+    configure_assets(config)
+    config.add_tween('plog.compression.compression_tween_factory',
+                     under='plog.assets.static_tween_factory',
+                     over='plog.metrics.timing_tween_factory')
     config.add_route('home', '/')
     config.add_route('login', '/login')
+    config.add_route('search', '/search')
+    config.add_route('feed_atom', '/feed.atom')
+    config.add_route('feed_rss', '/feed.rss')
     config.add_route('logout', '/logout')
     config.add_route('admin', '/admin')
+    config.add_route('metrics', '/admin/metrics')
     config.add_route('add_post', '/post/add')
     config.add_route('add_user', '/user/add')
     config.add_route('add_group', '/group/add')
@@ -42,5 +96,12 @@ def main(global_config, **settings):
     config.add_route('edit_post', '/post/edit/{slug}')
     config.add_route('delete_post', '/post/del/{slug}')
     config.add_route('post', '/post/{slug}')
+    config.add_route('api_posts', '/api/v1/posts')
+    config.add_route('api_posts_batch', '/api/v1/posts/batch')
+    config.add_route('api_post', '/api/v1/posts/{slug}')
+    config.add_route('api_users', '/api/v1/users')
+    config.add_route('api_user', '/api/v1/users/{username}')
+    config.add_route('api_groups', '/api/v1/groups')
+    config.add_route('api_group', '/api/v1/groups/{name}')
     config.scan()
     return config.make_wsgi_app()
@@ -0,0 +1,334 @@
+""" Versioned JSON API under ``/api/v1``.
+
+Reads select only the requested columns (``?fields=title,slug``) with
+Core and serialize the rows directly; no ORM objects are built.  Lists
+are keyset-paginated like the HTML listings (``after``, ``before`` and
+``limit``) and return the cursors of the neighbouring pages.
+
+``POST /api/v1/posts/batch`` creates, updates and deletes up to
+:data:`BATCH_LIMIT` posts in one transaction: either everything in the
+request is applied or nothing is.  Writes go through the ORM so rendering, slug history,
+optimistic locking and the search index stay in step with the HTML
+views.  Write requests must be ``application/json``, which a cross-site
+form can't send.
+"""
+from datetime import datetime
+
+import transaction
+from pyramid.httpexceptions import (
+    HTTPBadRequest,
+    HTTPConflict,
+    HTTPMovedPermanently,
+    HTTPNotFound,
+    HTTPUnsupportedMediaType,
+)
+from pyramid.view import view_config
+from slugify import slugify
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload, undefer
+from sqlalchemy.orm.exc import StaleDataError
+
+from plog.cache import invalidate_posts
+from plog.models import (
+    DBSession,
+    Group,
+    Permission,
+    Post,
+    User,
+    association_table,
+)
+from plog.pagination import int_param, keyset_select, page_size
+from plog.rendering import RENDERER_VERSION, render_markdown
+from plog.slugs import claim_slugs, invalidate_slugs, rename_post, slug_map
+
+posts = Post.__table__
+users = User.__table__
+groups = Group.__table__
+permissions = Permission.__table__
+
+POST_FIELDS = dict((c.name, c) for c in (
+    posts.c.id, posts.c.title, posts.c.slug, posts.c.version, posts.c.updated_at,
+    posts.c.summary, posts.c.word_count, posts.c.reading_time, posts.c.body,
+    posts.c.body_html))
+POST_DEFAULT = ('id', 'title', 'slug', 'version', 'updated_at', 'summary')
+USER_FIELDS = dict((c.name, c) for c in (users.c.id, users.c.username, users.c.email))
+# Fields that are not columns of the resource's own table.
+USER_EXTRA = ('groups',)
+USER_DEFAULT = ('id', 'username', 'email', 'groups')
+GROUP_FIELDS = dict((c.name, c) for c in (groups.c.id, groups.c.name))
+GROUP_EXTRA = ('permission',)
+GROUP_DEFAULT = ('id', 'name', 'permission')
+BATCH_LIMIT = 1000
+
+
+def error(exception, message, **details):
+    return exception(json_body=dict(error=message, **details))
+
+
+def requested_fields(request, available, default, extra=()):
+    """ The ``fields`` parameter, checked against what the resource has. """
+    value = request.params.get('fields')
+    if not value:
+        return list(default)
+    fields = [f.strip() for f in value.split(',') if f.strip()]
+    unknown = [f for f in fields if f not in available and f not in extra]
+    if unknown or not fields:
+        raise error(HTTPBadRequest, 'unknown fields',
+                    fields=unknown, available=sorted(list(available) + list(extra)))
+    return fields
+
+
+def serialize(row, fields):
+    item = {}
+    for field in fields:
+        value = row[field]
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        item[field] = value
+    return item
+
+
+def columns_for(fields, available, key):
+    """ The columns to select: the requested ones plus the keyset column. """
+    names = [key] + [f for f in fields if f in available and f != key]
+    return [available[name] for name in names]
+
+
+def _page_response(page, fields, name):
+    return {name: [serialize(row, fields) for row in page],
+            'next': page.next,
+            'prev': page.prev}
+
+
+def _list(request, query, column):
+    return keyset_select(DBSession, query, column,
+                         after=int_param(request, 'after'),
+                         before=int_param(request, 'before'),
+                         limit=page_size(request))
+
+
+def _post_rows(fields, rows):
+    """ Rows as dicts, with any stale ``body_html`` rendered in memory. """
+    rows = [dict(row) for row in rows]
+    if 'body_html' in fields:
+        stale = [row['id'] for row in rows if row['body_html_version'] != RENDERER_VERSION]
+        if stale:
+            bodies = dict(DBSession.execute(
+                select([posts.c.id, posts.c.body]).where(posts.c.id.in_(stale))).fetchall())
+            for row in rows:
+                if row['id'] in bodies:
+                    row['body_html'] = render_markdown(bodies[row['id']])
+    return rows
+
+
+def _post_columns(fields):
+    columns = columns_for(fields, POST_FIELDS, 'id')
+    if 'body_html' in fields:
+        columns.append(posts.c.body_html_version)
+    return columns
+
+
+@view_config(route_name='api_posts', request_method='GET', renderer='json', permission='view')
+def list_posts(request):
+    fields = requested_fields(request, POST_FIELDS, POST_DEFAULT)
+    page = _list(request, select(_post_columns(fields)), posts.c.id)
+    page.items = _post_rows(fields, page.items)
+    return _page_response(page, fields, 'posts')
+
+
+@view_config(route_name='api_post', request_method='GET', renderer='json', permission='view')
+def get_post(request):
+    slug = request.matchdict['slug']
+    fields = requested_fields(request, POST_FIELDS, POST_DEFAULT)
+
+    def load(found):
+        return found and DBSession.execute(
+            select(_post_columns(fields) + [posts.c.slug.label('current_slug')]).
+            where(posts.c.id == found[0])).first()
+    found = slug_map.lookup(slug)
+    cached = found is not slug_map.unknown
+    if not cached:
+        found = slug_map.query(DBSession, slug)
+    row = load(found)
+    if cached and found is not None and (row is None or row['current_slug'] != slug):
+        # The map may be stale; redirect or 404 on the database's word.
+        row = load(slug_map.query(DBSession, slug))
+    if row is None:
+        raise error(HTTPNotFound, 'no such post', slug=slug)
+    if row['current_slug'] != slug:
+        return HTTPMovedPermanently(location=request.route_url(
+            'api_post', slug=row['current_slug'], _query=request.GET))
+    return serialize(_post_rows(fields, [row])[0], fields)
+
+
+def _user_groups(ids):
+    groups_of = dict((id, []) for id in ids)
+    rows = DBSession.execute(
+        select([association_table.c.users_id, groups.c.name]).
+        select_from(association_table.join(groups)).
+        where(association_table.c.users_id.in_(ids)).order_by(groups.c.name))
+    for user_id, name in rows:
+        groups_of[user_id].append(name)
+    return groups_of
+
+
+def _user_rows(fields, rows):
+    rows = [dict(row) for row in rows]
+    if 'groups' in fields and rows:
+        groups_of = _user_groups([row['id'] for row in rows])
+        for row in rows:
+            row['groups'] = groups_of[row['id']]
+    return rows
+
+
+@view_config(route_name='api_users', request_method='GET', renderer='json', permission='edit')
+def list_users(request):
+    fields = requested_fields(request, USER_FIELDS, USER_DEFAULT, USER_EXTRA)
+    page = _list(request, select(columns_for(fields, USER_FIELDS, 'id')), users.c.id)
+    page.items = _user_rows(fields, page.items)
+    return _page_response(page, fields, 'users')
+
+
+@view_config(route_name='api_user', request_method='GET', renderer='json', permission='edit')
+def get_user(request):
+    fields = requested_fields(request, USER_FIELDS, USER_DEFAULT, USER_EXTRA)
+    row = DBSession.execute(select(columns_for(fields, USER_FIELDS, 'id')).where(
+        users.c.username == request.matchdict['username'])).first()
+    if row is None:
+        raise error(HTTPNotFound, 'no such user', username=request.matchdict['username'])
+    return serialize(_user_rows(fields, [row])[0], fields)
+
+
+def _group_query(fields):
+    columns = columns_for(fields, GROUP_FIELDS, 'id')
+    if 'permission' in fields:
+        return select(columns + [permissions.c.name.label('permission')]).select_from(
+            groups.outerjoin(permissions, groups.c.permission_id == permissions.c.id))
+    return select(columns)
+
+
+@view_config(route_name='api_groups', request_method='GET', renderer='json', permission='edit')
+def list_groups(request):
+    fields = requested_fields(request, GROUP_FIELDS, GROUP_DEFAULT, GROUP_EXTRA)
+    return _page_response(_list(request, _group_query(fields), groups.c.id), fields, 'groups')
+
+
+@view_config(route_name='api_group', request_method='GET', renderer='json', permission='edit')
+def get_group(request):
+    fields = requested_fields(request, GROUP_FIELDS, GROUP_DEFAULT, GROUP_EXTRA)
+    row = DBSession.execute(_group_query(fields).where(
+        groups.c.name == request.matchdict['name'])).first()
+    if row is None:
+        raise error(HTTPNotFound, 'no such group', name=request.matchdict['name'])
+    return serialize(row, fields)
+
+
+def _json_body(request):
+    if request.content_type != 'application/json':
+        raise error(HTTPUnsupportedMediaType, 'expected application/json')
+    try:
+        body = request.json_body
+    except ValueError:
+        raise error(HTTPBadRequest, 'malformed JSON')
+    if not isinstance(body, dict):
+        raise error(HTTPBadRequest, 'expected a JSON object')
+    return body
+
+
+def _operations(body, name, required, optional=()):
+    """ The ``name`` operations, checking that the ``required`` fields are
+    strings and that the ``optional`` ones are strings if present.
+    """
+    items = body.get(name) or []
+    if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+        raise error(HTTPBadRequest, '%s must be a list of objects' % name)
+    for n, item in enumerate(items):
+        missing = [key for key in required if not isinstance(item.get(key), str)]
+        missing += [key for key in optional if key in item and not isinstance(item[key], str)]
+        if missing:
+            raise error(HTTPBadRequest, 'missing or invalid fields', operation=name,
+                        index=n, fields=missing)
+    return items
+
+
+def _fail(exception, message, **details):
+    transaction.doom()
+    return error(exception, message, **details)
+
+
+def _apply(creates, updates, deletes, found):
+    """ Stage the batch in the session and flush it.  The slug queries
+    autoflush, so a duplicate can fail any of them, not just the flush.
+    """
+    touched = set()
+    claimed = []
+    created = []
+    for op in creates:
+        post = Post(op['title'], op['body'])
+        DBSession.add(post)
+        created.append(post)
+        claimed.append(post.slug)
+    updated = []
+    for op in updates:
+        post = found[op['slug']]
+        if 'title' in op:
+            post.title = op['title']
+            claimed.append(slugify(op['title']))
+            rename_post(DBSession, post, claimed[-1], claim=False)
+        if 'body' in op:
+            post.body = op['body']
+        updated.append(post)
+        touched.update((op['slug'], post.slug))
+    for op in deletes:
+        post = found[op['slug']]
+        touched.update([op['slug']] + [r.slug for r in post.redirects])
+        DBSession.delete(post)
+    if claimed:
+        claim_slugs(DBSession, *claimed)
+        touched.update(claimed)
+    DBSession.flush()
+    return created, updated, touched
+
+
+@view_config(route_name='api_posts_batch', request_method='POST', renderer='json',
+             permission='edit')
+def batch_posts(request):
+    """ ``{"create": [{"title", "body"}],
+    "update": [{"slug", "version"?, "title"?, "body"?}],
+    "delete": [{"slug", "version"?}]}``, applied in that order, all or
+    nothing.  A ``version`` that no longer matches is a 409.
+    """
+    body = _json_body(request)
+    creates = _operations(body, 'create', ('title', 'body'))
+    updates = _operations(body, 'update', ('slug',), ('title', 'body'))
+    deletes = _operations(body, 'delete', ('slug',))
+    if len(creates) + len(updates) + len(deletes) > BATCH_LIMIT:
+        raise error(HTTPBadRequest, 'too many operations', limit=BATCH_LIMIT)
+
+    targets = set(op['slug'] for op in updates + deletes)
+    found = {}
+    if targets:
+        found = dict((post.slug, post) for post in DBSession.query(Post).options(
+            undefer(Post.body), selectinload(Post.redirects)).filter(Post.slug.in_(targets)))
+    missing = sorted(targets - set(found))
+    if missing:
+        raise _fail(HTTPNotFound, 'no such posts', slugs=missing)
+    stale = [op['slug'] for op in updates + deletes
+             if op.get('version') is not None and op['version'] != found[op['slug']].version]
+    if stale:
+        raise _fail(HTTPConflict, 'posts changed since they were read', slugs=stale)
+
+    try:
+        created, updated, touched = _apply(creates, updates, deletes, found)
+    except IntegrityError:
+        raise _fail(HTTPConflict, 'duplicate title or slug')
+    except StaleDataError:
+        raise _fail(HTTPConflict, 'posts changed since they were read')
+
+    if touched:
+        invalidate_posts(request, *touched)
+        invalidate_slugs(*touched)
+    return {'created': [{'id': p.id, 'slug': p.slug, 'version': p.version} for p in created],
+            'updated': [{'id': p.id, 'slug': p.slug, 'version': p.version} for p in updated],
+            'deleted': len(deletes)}
@@ -0,0 +1,412 @@
+""" ASGI entry point: the public read routes served from an event loop.
+
+``plog.asgi:main`` builds the usual Pyramid application and wraps it.
+Anonymous ``GET`` and ``HEAD`` requests for the home listing, post pages
+and already generated feeds are answered on the event loop: rows come
+from a small pool of aiosqlite connections and templates are rendered
+with Jinja2's async mode.  A slow client or a query waiting on the
+database then holds a coroutine, not one of a handful of threads.
+
+Everything else, including every request carrying the login cookie,
+search, the admin and the API, is handed to the Pyramid application in
+a thread pool, so its views, security and transactions are unchanged.
+Responses match the WSGI ones: same templates, page cache, ETags,
+``Last-Modified``, 304s, compression and slug redirects.
+
+Only SQLite is supported on the async path; SQLAlchemy statements are
+compiled for it and run on aiosqlite.  Posts whose ``body_html`` is stale
+go through Pyramid, which renders and stores it.
+
+Serve it with any ASGI server, e.g.::
+
+    PLOG_CONFIG=production.ini uvicorn --factory plog.asgi:app_from_config
+"""
+import asyncio
+import os
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from pyramid.httpexceptions import HTTPMovedPermanently, HTTPNotFound
+from pyramid.interfaces import IAuthenticationPolicy, IRoutesMapper
+from pyramid.request import Request
+from pyramid.response import Response
+from sqlalchemy import select
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine.url import make_url
+
+from plog.cache import CachedPage, get_page_cache, listing_key, page_entry
+from plog.compression import Compressor
+from plog.conditional import make_etag, not_modified
+from plog.db import sqlite_pragmas
+from plog.feeds import get_feed_cache
+from plog.models import Post, SlugRedirect
+from plog.pagination import int_param, keyset_result, keyset_statement, page_size
+from plog.rendering import RENDERER_VERSION
+from plog.slugs import slug_map
+from plog.templating import get_environment
+
+try:
+    import aiosqlite
+except ImportError:  # pragma: no cover
+    aiosqlite = None
+
+PREFIX = 'plog.asgi.'
+PROJECT = 'Plog'
+READ_METHODS = ('GET', 'HEAD')
+conn_err_msg = 'Plog is having a problem using your SQL database.'
+
+posts = Post.__table__
+redirects = SlugRedirect.__table__
+LISTING = [posts.c.id, posts.c.title, posts.c.slug, posts.c.version, posts.c.updated_at,
+           posts.c.summary, posts.c.reading_time, posts.c.body_html_version]
+POST = [posts.c.id, posts.c.title, posts.c.slug, posts.c.version, posts.c.updated_at,
+        posts.c.reading_time, posts.c.body_html, posts.c.body_html_version]
+
+
+class Row(dict):
+    """ A result row; templates use attributes, pagination uses keys. """
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+class AsyncDatabase(object):
+    """ A fixed pool of aiosqlite connections running SQLAlchemy Core
+    selects compiled for SQLite.
+    """
+
+    dialect = sqlite.dialect(paramstyle='qmark')
+
+    def __init__(self, path, size=4, pragmas=()):
+        self.path = path
+        self.size = size
+        self.pragmas = list(pragmas)
+        self.queries = 0
+        self._pool = None
+        self._connections = []
+
+    async def open(self):
+        self._pool = asyncio.Queue()
+        for _ in range(self.size):
+            connection = await aiosqlite.connect(self.path)
+            for name, value in self.pragmas:
+                await connection.execute('PRAGMA %s = %s' % (name, value))
+            self._connections.append(connection)
+            self._pool.put_nowait(connection)
+
+    async def close(self):
+        for connection in self._connections:
+            await connection.close()
+        self._connections = []
+        self._pool = None
+
+    def compile(self, statement):
+        """ SQL, parameters and per-column result processors. """
+        compiled = statement.compile(dialect=self.dialect)
+        values = compiled.construct_params()
+        params = []
+        for name in compiled.positiontup:
+            process = compiled.binds[name].type.dialect_impl(self.dialect).\
+                bind_processor(self.dialect)
+            params.append(process(values[name]) if process else values[name])
+        types = dict((c.key, c.type) for c in statement.c)
+        return str(compiled), params, types
+
+    async def fetchall(self, statement):
+        sql, params, types = self.compile(statement)
+        connection = await self._pool.get()
+        try:
+            async with connection.execute(sql, params) as cursor:
+                names = [d[0] for d in cursor.description]
+                rows = await cursor.fetchall()
+        finally:
+            self._pool.put_nowait(connection)
+        self.queries += 1
+        processors = [types[name].dialect_impl(self.dialect).result_processor(self.dialect, None)
+                      for name in names]
+        return [Row((name, process(value) if process else value)
+                    for name, process, value in zip(names, processors, row))
+                for row in rows]
+
+    async def first(self, statement):
+        rows = await self.fetchall(statement.limit(1))
+        return rows[0] if rows else None
+
+
+def environ_from_scope(scope, body=b''):
+    """ The WSGI environ of an ASGI HTTP request. """
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]) if server[1] is not None else '80',
+        'SERVER_PROTOCOL': 'HTTP/%s' % scope.get('http_version', '1.1'),
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name == 'CONTENT_LENGTH':
+            environ['CONTENT_LENGTH'] = value
+        else:
+            key = 'HTTP_' + name
+            if key in environ:
+                value = environ[key] + ('; ' if key == 'HTTP_COOKIE' else ',') + value
+            environ[key] = value
+    return environ
+
+
+def call_wsgi(app, environ):
+    """ Run ``app`` to completion: ``(status, headers, body)``. """
+    started = []
+
+    def start_response(status, headers, exc_info=None):
+        started[:] = [status, headers]
+    result = app(environ, start_response)
+    try:
+        body = b''.join(result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return started[0], started[1], body
+
+
+async def send_response(send, status, headers, body):
+    await send({'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [(k.encode('latin-1'), v.encode('latin-1')) for k, v in headers]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            break
+    return b''.join(chunks)
+
+
+class PlogASGI(object):
+    """ The ASGI application around the Pyramid application ``app``. """
+
+    def __init__(self, app, database, threads=4):
+        self.app = app
+        self.registry = app.registry
+        self.database = database
+        self.executor = ThreadPoolExecutor(threads, thread_name_prefix='plog-asgi')
+        self.compressor = Compressor(self.registry)
+        self.templates = get_environment(self.registry).overlay(enable_async=True)
+        self.mapper = self.registry.queryUtility(IRoutesMapper)
+        policy = self.registry.queryUtility(IAuthenticationPolicy)
+        cookie = getattr(policy, 'cookie', None)
+        self.login_cookie = getattr(cookie, 'cookie_name', 'auth_tkt')
+        self.handlers = {'home': self.home, 'post': self.post,
+                         'feed_atom': self.feed, 'feed_rss': self.feed}
+        self.served = 0
+        self.delegated = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] != 'http':
+            return
+        if scope['method'] not in READ_METHODS:
+            return await self.delegate(environ_from_scope(scope, await read_body(receive)), send)
+        environ = environ_from_scope(scope)
+        request = Request(environ)
+        request.registry = self.registry
+        handler = None
+        if self.login_cookie not in request.cookies:
+            info = self.mapper(request)
+            route = info['route']
+            if route is not None:
+                handler = self.handlers.get(route.name)
+                request.matched_route = route
+                request.matchdict = info['match']
+        if handler is None:
+            return await self.delegate(environ, send)
+        if_none_match = self.compressor.prepare(request) if self.compressor.enabled else None
+        try:
+            response = await handler(request)
+        except sqlite3.Error:
+            response = Response(conn_err_msg, content_type='text/plain', status_int=500)
+        if response is None:
+            # Restore what the client sent; Pyramid does its own negotiation.
+            if if_none_match:
+                environ['HTTP_IF_NONE_MATCH'] = if_none_match
+            return await self.delegate(environ, send)
+        if self.compressor.enabled:
+            response = self.compressor(request, response, if_none_match)
+        self.served += 1
+        await send_response(send, *call_wsgi(response, environ))
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await self.database.open()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.database.close()
+                self.executor.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def delegate(self, environ, send):
+        """ Answer with the Pyramid application, in the thread pool. """
+        self.delegated += 1
+        loop = asyncio.get_running_loop()
+        await send_response(send, *await loop.run_in_executor(
+            self.executor, call_wsgi, self.app, environ))
+
+    async def render(self, request, name, **values):
+        template = self.templates.get_template('plog:templates/%s.jinja2' % name)
+        values.update(request=request, project=PROJECT, logged_in=None)
+        response = request.response
+        response.text = await template.render_async(values)
+        return response
+
+    def cached(self, request, namespace, key):
+        """ The page cache's copy of an anonymous page, or ``None``. """
+        cache = get_page_cache(self.registry)
+        if cache is None or request.method != 'GET':
+            return None
+        entry = page_entry(request, namespace, key, 'anon')
+        page = cache.get(*entry)
+        if page is None:
+            return None
+        request.page_cache_key = entry
+        response = page.to_response()
+        response.headers['X-Cache'] = 'HIT'
+        return response
+
+    def store(self, request, namespace, key, response):
+        cache = get_page_cache(self.registry)
+        if cache is None or request.method != 'GET':
+            return response
+        if response.status_int == 200:
+            entry = page_entry(request, namespace, key, 'anon')
+            cache.set(entry[0], entry[1], CachedPage.from_response(response))
+            request.page_cache_key = entry
+        response.headers['X-Cache'] = 'MISS'
+        return response
+
+    async def home(self, request):
+        key = listing_key(request)
+        response = self.cached(request, 'home', key)
+        if response is not None:
+            return response
+        after, before = int_param(request, 'after'), int_param(request, 'before')
+        limit = page_size(request)
+        rows = await self.database.fetchall(
+            keyset_statement(select(LISTING), posts.c.id, after, before, limit))
+        page = keyset_result(rows, posts.c.id, after, before, limit)
+        etag = make_etag('home', False, page.prev, page.next, RENDERER_VERSION,
+                         *['%s.%s.%s' % (p.id, p.version, p.body_html_version)
+                           for p in page])
+        response = not_modified(request, etag, max([p.updated_at for p in page] or [None]))
+        if response is not None:
+            return response
+        return self.store(request, 'home', key, await self.render(request, 'home', posts=page))
+
+    async def query(self, slug):
+        """ :meth:`plog.slugs.SlugMap.query` on the async connections. """
+        row = await self.database.first(select([posts.c.id]).where(posts.c.slug == slug))
+        if row is not None:
+            found = row['id'], True
+        else:
+            row = await self.database.first(
+                select([redirects.c.post_id]).where(redirects.c.slug == slug))
+            found = (row['post_id'], False) if row is not None else None
+        slug_map.remember(slug, found)
+        return found
+
+    async def load(self, id):
+        return await self.database.first(select(POST).where(posts.c.id == id))
+
+    async def post(self, request):
+        slug = request.matchdict['slug']
+        response = self.cached(request, 'post', slug)
+        if response is not None:
+            return response
+        found = slug_map.lookup(slug)
+        cached = found is not slug_map.unknown
+        if not cached:
+            found = await self.query(slug)
+        post = found and await self.load(found[0])
+        if cached and found is not None and (post is None or post.slug != slug):
+            # The map may be stale; redirect or 404 on the database's word.
+            found = await self.query(slug)
+            post = found and await self.load(found[0])
+        if post is None:
+            return HTTPNotFound()
+        if post.slug != slug:
+            return HTTPMovedPermanently(location=request.route_url('post', slug=post.slug))
+        if post.body_html is None or post.body_html_version != RENDERER_VERSION:
+            return None
+        etag = make_etag('post', False, post.id, post.version, RENDERER_VERSION)
+        response = not_modified(request, etag, post.updated_at)
+        if response is not None:
+            return response
+        return self.store(request, 'post', slug, await self.render(
+            request, 'post', post=post, body_html=post.body_html))
+
+    async def feed(self, request):
+        kind = request.matched_route.name[len('feed_'):]
+        key = (kind, request.application_url)
+        cache = get_feed_cache(self.registry)
+        page = cache.get(key) if cache is not None else None
+        if page is None:
+            return None
+        request.page_cache_key = ('feed', '%s|%s' % key)
+        return page.to_response()
+
+
+def asgi_app(app):
+    """ Wrap the Pyramid application ``app``, configured by its settings. """
+    settings = app.registry.settings
+    url = make_url(settings['sqlalchemy.url'])
+    if url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:'):
+        raise ValueError('the ASGI read path needs a file-backed SQLite database')
+    if aiosqlite is None:
+        raise ImportError('the ASGI read path needs aiosqlite: pip install Plog[asgi]')
+    database = AsyncDatabase(url.database, int(settings.get(PREFIX + 'db_connections', 4)),
+                             sqlite_pragmas(settings))
+    return PlogASGI(app, database, int(settings.get(PREFIX + 'threads', 4)))
+
+
+def main(global_config, **settings):
+    """ This function returns the Plog ASGI application.
+    """
+    from plog import main as make_app
+    return asgi_app(make_app(global_config, **settings))
+
+
+def app_from_config(config_uri=None):
+    """ The ASGI application for an ini file, by default ``$PLOG_CONFIG``. """
+    from pyramid.paster import get_appsettings, setup_logging
+    config_uri = config_uri or os.environ['PLOG_CONFIG']
+    setup_logging(config_uri)
+    return main({}, **get_appsettings(config_uri))
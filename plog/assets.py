@@ -0,0 +1,195 @@
+""" Static assets: content-hashed URLs, far-future caching and
+precompressed variants.
+
+``static_url`` links carry a ``?v=<content hash>`` added by
+:class:`ContentHashCacheBuster`, so a file's URL changes whenever its
+content does.  :func:`static_tween_factory` answers ``/static/`` requests
+before routing, security and the transaction manager get involved.  A
+request whose ``v`` matches the current hash is cached for a year as
+``immutable``; anything else gets ``plog.static.cache_max_age``.  When the
+client accepts it, a ``.br`` or ``.gz`` file written next to the original
+by ``plog_compress_static`` is sent instead; those files are not served
+under their own names.  Paths the tween can't serve fall through to the
+ordinary static view, which returns the 404.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from pkg_resources import resource_filename
+from pyramid.httpexceptions import HTTPNotFound
+from pyramid.response import FileResponse
+from pyramid.settings import asbool
+from pyramid.static import QueryStringCacheBuster
+from pyramid.tweens import INGRESS
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+STATIC_NAME = 'static'
+STATIC_SPEC = 'plog:static/'
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# Preferred first when the client accepts both equally.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+COMPRESSIBLE = ('.css', '.js', '.svg', '.ico', '.html', '.txt', '.json', '.xml')
+
+
+def static_root():
+    return resource_filename('plog', STATIC_NAME)
+
+
+def file_token(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+
+class ContentHashCacheBuster(QueryStringCacheBuster):
+    """ Adds the first 12 hex digits of each file's SHA-1 to its URL.
+    Hashes are computed once per file, or again whenever its mtime changes
+    when ``reload`` is set.
+    """
+
+    def __init__(self, root, param='v', reload=False):
+        QueryStringCacheBuster.__init__(self, param)
+        self.root = root
+        self.reload = reload
+        self._tokens = {}
+
+    def token(self, subpath):
+        cached = self._tokens.get(subpath)
+        if cached is not None and not self.reload:
+            return cached[1]
+        path = os.path.join(self.root, subpath)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        if cached is None or cached[0] != mtime:
+            cached = self._tokens[subpath] = (mtime, file_token(path))
+        return cached[1]
+
+    def tokenize(self, request, subpath, kw):
+        return self.token(subpath) or ''
+
+
+def _safe_subpath(subpath):
+    parts = subpath.split('/')
+    if any(p in ('', '.', '..') or os.sep in p for p in parts):
+        return None
+    return os.path.join(*parts)
+
+
+def _is_variant(subpath):
+    """ Whether ``subpath`` names a precompressed copy of another file. """
+    return any(subpath.endswith(suffix) and subpath[:-len(suffix)].endswith(COMPRESSIBLE)
+               for _, suffix in ENCODINGS)
+
+
+def static_tween_factory(handler, registry):
+    buster = registry.static_cache_buster
+    prefix = '/%s/' % STATIC_NAME
+    max_age = int(registry.settings.get('plog.static.cache_max_age', 3600))
+    # subpath -> (path, {encoding: variant path}); rebuilt per request
+    # with pyramid.reload_assets.
+    files = {}
+
+    def lookup(subpath):
+        found = files.get(subpath)
+        if found is not None and not buster.reload:
+            return found
+        relative = _safe_subpath(subpath)
+        path = relative and os.path.join(buster.root, relative)
+        if not path or not os.path.isfile(path):
+            return None
+        variants = {}
+        if path.endswith(COMPRESSIBLE):
+            variants = dict((encoding, path + suffix) for encoding, suffix in ENCODINGS
+                            if os.path.isfile(path + suffix))
+        found = files[subpath] = (path, variants)
+        return found
+
+    def static_tween(request):
+        if not request.path_info.startswith(prefix) or request.method not in ('GET', 'HEAD'):
+            return handler(request)
+        subpath = request.path_info[len(prefix):]
+        if _is_variant(subpath):
+            # Only sent with Content-Encoding, in place of the original.
+            return HTTPNotFound()
+        found = lookup(subpath)
+        if found is None:
+            return handler(request)
+        path, variants = found
+        filename, encoding = path, None
+        # webob treats a missing header as accepting anything; only send
+        # compressed bytes to clients that asked for them.
+        if variants and 'Accept-Encoding' in request.headers:
+            for offer, q in request.accept_encoding.acceptable_offers(
+                    [e for e, _ in ENCODINGS if e in variants]):
+                filename, encoding = variants[offer], offer
+                break
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        response = FileResponse(filename, request, content_type=content_type)
+        token = buster.token(subpath)
+        response.etag = token + ('-' + encoding if encoding else '')
+        if encoding:
+            response.content_encoding = encoding
+        if path.endswith(COMPRESSIBLE):
+            response.vary = ('Accept-Encoding',)
+        if token and request.GET.get(buster.param) == token:
+            response.headers['Cache-Control'] = IMMUTABLE
+        else:
+            response.cache_expires(max_age)
+        return response
+    return static_tween
+
+
+def compress_directory(root, min_size=1024, log=None):
+    """ Write ``.gz`` (and ``.br``, with the ``brotli`` package) next to each
+    compressible file of at least ``min_size`` bytes.  Existing variants
+    newer than their source are left alone, and variants that don't save
+    at least 5% are not written.  Returns the paths written.
+    """
+    written = []
+    for directory, _, names in os.walk(root):
+        for name in sorted(names):
+            path = os.path.join(directory, name)
+            if not name.endswith(COMPRESSIBLE) or os.path.getsize(path) < min_size:
+                continue
+            data = None
+            for encoding, suffix in ENCODINGS:
+                if encoding == 'br' and brotli is None:
+                    continue
+                target = path + suffix
+                if os.path.exists(target) and \
+                        os.path.getmtime(target) >= os.path.getmtime(path):
+                    continue
+                if data is None:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                if encoding == 'br':
+                    compressed = brotli.compress(data, quality=11)
+                else:
+                    compressed = gzip.compress(data, 9, mtime=0)
+                if len(compressed) > len(data) * 0.95:
+                    continue
+                with open(target, 'wb') as f:
+                    f.write(compressed)
+                written.append(target)
+                if log is not None:
+                    log('%s: %d -> %d bytes' % (target, len(data), len(compressed)))
+    return written
+
+
+def configure_assets(config):
+    settings = config.get_settings()
+    config.add_static_view(STATIC_NAME, STATIC_SPEC,
+                           cache_max_age=int(settings.get('plog.static.cache_max_age', 3600)))
+    buster = ContentHashCacheBuster(static_root(),
+                                    reload=asbool(settings.get('pyramid.reload_assets')))
+    config.add_cache_buster(STATIC_SPEC, buster)
+    config.registry.static_cache_buster = buster
+    config.add_tween('plog.assets.static_tween_factory',
+                     under=INGRESS, over='plog.metrics.timing_tween_factory')
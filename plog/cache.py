@@ -0,0 +1,306 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+import transaction
+from pyramid.response import Response
+from pyramid.security import authenticated_userid
+from pyramid.settings import asbool
+
+from plog.models import DBSession
+from plog.pagination import int_param, page_size
+from plog.replicas import from_replica
+
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Vary')
+# Compressed copies of a page are stored under '<key>|<encoding>'.
+VARIANT_ENCODINGS = ('br', 'gzip')
+
+
+class CachedPage(object):
+    """ The parts of a rendered response worth keeping. """
+
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @classmethod
+    def from_response(cls, response):
+        headers = [(k, v) for k, v in response.headerlist if k in CACHED_HEADERS]
+        return cls(response.status, headers, response.body)
+
+    def to_response(self):
+        response = Response(body=self.body, status=self.status)
+        response.headerlist = list(self.headers) + [('Content-Length', str(len(self.body)))]
+        response.conditional_response = True
+        return response
+
+    def dumps(self):
+        head = json.dumps({'status': self.status, 'headers': self.headers})
+        return head.encode('utf-8') + b'\n' + self.body
+
+    @classmethod
+    def loads(cls, data):
+        head, body = data.split(b'\n', 1)
+        head = json.loads(head.decode('utf-8'))
+        return cls(head['status'], [tuple(h) for h in head['headers']], body)
+
+    @property
+    def size(self):
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers)
+
+
+class MemoryBackend(object):
+    """ In-process LRU bounded by the total size of the cached bodies. """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace, key):
+        with self._lock:
+            page = self._data.get((namespace, key))
+            if page is not None:
+                self._data.move_to_end((namespace, key))
+            return page
+
+    def set(self, namespace, key, page):
+        if page.size > self.max_bytes:
+            return
+        with self._lock:
+            self._pop((namespace, key))
+            self._data[(namespace, key)] = page
+            self.bytes += page.size
+            while self.bytes > self.max_bytes:
+                self._pop(next(iter(self._data)))
+
+    def delete(self, namespace, key):
+        with self._lock:
+            self._pop((namespace, key))
+
+    def clear(self, namespace=None):
+        prefix = '%s/' % namespace
+        with self._lock:
+            for k in [k for k in self._data if namespace is None or k[0] == namespace
+                      or k[0].startswith(prefix)]:
+                self._pop(k)
+
+    def _pop(self, k):
+        page = self._data.pop(k, None)
+        if page is not None:
+            self.bytes -= page.size
+
+
+class FileBackend(object):
+    """ One file per page under ``directory/<namespace>/``, so several worker
+    processes can share it.  Writes go through a temporary file and an
+    atomic rename.  Clearing a namespace clears the ones nested under it.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, namespace, key):
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, namespace, name)
+
+    def get(self, namespace, key):
+        try:
+            with open(self._path(namespace, key), 'rb') as f:
+                return CachedPage.loads(f.read())
+        except (IOError, OSError, ValueError):
+            return None
+
+    def set(self, namespace, key, page):
+        path = self._path(namespace, key)
+        dirname = os.path.dirname(path)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=dirname)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(page.dumps())
+        os.replace(tmp, path)
+
+    def delete(self, namespace, key):
+        try:
+            os.remove(self._path(namespace, key))
+        except OSError:
+            pass
+
+    def clear(self, namespace=None):
+        path = self.directory if namespace is None else os.path.join(self.directory, namespace)
+        shutil.rmtree(path, ignore_errors=True)
+
+
+class PageCache(object):
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.variant_hits = 0
+        self.variant_misses = 0
+
+    def get(self, namespace, key):
+        page = self.backend.get(namespace, key)
+        if page is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return page
+
+    def set(self, namespace, key, page):
+        self.backend.set(namespace, key, page)
+
+    def delete(self, namespace, key):
+        self.backend.delete(namespace, key)
+        for encoding in VARIANT_ENCODINGS:
+            self.backend.delete(namespace, '%s|%s' % (key, encoding))
+
+    def clear(self, namespace=None):
+        self.backend.clear(namespace)
+
+    def get_variant(self, namespace, key, encoding):
+        page = self.backend.get(namespace, '%s|%s' % (key, encoding))
+        if page is None:
+            self.variant_misses += 1
+        else:
+            self.variant_hits += 1
+        return page
+
+    def set_variant(self, namespace, key, encoding, page):
+        self.backend.set(namespace, '%s|%s' % (key, encoding), page)
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return float(self.hits) / total if total else 0.0
+
+    def stats(self):
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hit_ratio,
+                'variant_hits': self.variant_hits,
+                'variant_misses': self.variant_misses}
+
+
+def page_cache_from_settings(settings):
+    kind = settings.get('plog.page_cache', 'off')
+    if kind == 'memory':
+        if asbool(settings.get('plog.prefork')):
+            # An edit would only clear the cache of the worker handling it.
+            raise ValueError('plog.page_cache = memory is per process; '
+                             'use file with plog.prefork')
+        max_bytes = int(settings.get('plog.page_cache.max_bytes', 16 * 1024 * 1024))
+        return PageCache(MemoryBackend(max_bytes))
+    if kind == 'file':
+        return PageCache(FileBackend(settings['plog.page_cache.directory']))
+    if asbool(kind):
+        raise ValueError('Unknown plog.page_cache backend: %r' % kind)
+    return None
+
+
+def get_page_cache(registry):
+    return getattr(registry, 'page_cache', None)
+
+
+def page_entry(request, namespace, key, state=None):
+    """ The ``(namespace, key)`` the page ``key`` of ``namespace`` is cached
+    under for this request.  Every page gets a namespace of its own, holding
+    one copy per logged-in state and host, since the templates link with
+    absolute URLs; clearing it forgets them all.
+    """
+    if state is None:
+        state = 'auth' if authenticated_userid(request) else 'anon'
+    return entry_namespace(namespace, key), '%s|%s' % (state, request.host_url)
+
+
+def entry_namespace(namespace, key):
+    return '%s/%s' % (namespace, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+
+def listing_key(request):
+    """ The paging parameters a listing actually uses, normalized, so that
+    other or malformed query parameters can't add cache entries.
+    """
+    after, before = int_param(request, 'after'), int_param(request, 'before')
+    if before is not None:
+        after = None
+    return 'after=%s&before=%s&limit=%d' % (after, before, page_size(request))
+
+
+def cached_page(namespace, key=listing_key):
+    """ View decorator caching the rendered response of a public page under
+    ``namespace``, keyed by ``key(request)``, the logged-in state and the
+    host (see :func:`page_entry`).  Pages read from a replica aren't
+    stored: a stale copy would outlive the edit that invalidated it.  The
+    key of a cached page is left on ``request.page_cache_key`` for the
+    compression tween to store variants under.
+    """
+    def decorator(view):
+        def wrapper(context, request):
+            cache = get_page_cache(request.registry)
+            if cache is None or request.method != 'GET':
+                return view(context, request)
+            entry = page_entry(request, namespace, key(request))
+            page = cache.get(*entry)
+            if page is not None:
+                request.page_cache_key = entry
+                response = page.to_response()
+                response.headers['X-Cache'] = 'HIT'
+                return response
+            response = view(context, request)
+            if (response.status_int == 200 and 'Set-Cookie' not in response.headers
+                    and not from_replica(DBSession)):
+                cache.set(entry[0], entry[1], CachedPage.from_response(response))
+                request.page_cache_key = entry
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+def slug_key(request):
+    return request.matchdict['slug']
+
+
+def _now_and_after_commit(invalidate):
+    def after_commit(status):
+        if status:
+            invalidate()
+    invalidate()
+    transaction.get().addAfterCommitHook(after_commit)
+
+
+def invalidate_listing(request):
+    """ Forget the cached home listing, now and again after commit. """
+    cache = get_page_cache(request.registry)
+    if cache is not None:
+        _now_and_after_commit(lambda: cache.clear('home'))
+
+
+def invalidate_posts(request, *slugs):
+    """ Forget the home listing, the feeds and the pages of ``slugs``, now
+    and again after commit so a concurrent render can't re-cache the old
+    content.
+    """
+    cache = get_page_cache(request.registry)
+    feeds = getattr(request.registry, 'feed_cache', None)
+    if cache is None and feeds is None:
+        return
+
+    def invalidate():
+        if feeds is not None:
+            feeds.clear()
+        if cache is None:
+            return
+        cache.clear('home')
+        cache.clear('feed')
+        for slug in slugs:
+            cache.clear(entry_namespace('post', slug))
+    _now_and_after_commit(invalidate)
@@ -0,0 +1,230 @@
+""" Response compression negotiated from ``Accept-Encoding``.
+
+The tween compresses rendered pages with brotli (when the ``brotli``
+package is installed) or gzip.  It leaves alone responses that are small,
+not text, not a 200, already encoded, marked ``no-transform`` or
+streamed.  Compressed responses get ``Vary: Accept-Encoding`` and an ETag
+suffixed with the encoding (``"<etag>-gzip"``, as the static tween uses).
+The suffix is stripped from ``If-None-Match`` on the way in, so views and
+the page cache keep comparing against their own ETags.
+
+Pages served through :func:`plog.cache.cached_page` also cache their
+compressed variants, so a page cache hit does not pay for compressing
+again.  Per-route ratios and CPU time go to :data:`compression_stats`.
+"""
+import threading
+import time
+import zlib
+
+from pyramid.httpexceptions import HTTPNotModified
+from pyramid.settings import asbool, aslist
+from webob.etag import ETagMatcher
+
+from plog.cache import CachedPage, get_page_cache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+PREFIX = 'plog.compression.'
+DEFAULT_TYPES = ('text/html', 'text/plain', 'text/css', 'text/xml', 'application/json',
+                 'application/javascript', 'application/xml', 'application/atom+xml',
+                 'application/rss+xml')
+VARIANT_HEADERS = ('Content-Type', 'Content-Encoding', 'ETag', 'Vary')
+NOT_MODIFIED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control', 'Vary', 'X-Cache')
+
+
+def available_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def suffix_etag(etag, encoding):
+    return '%s-%s' % (etag, encoding)
+
+
+def strip_etag_suffix(etag):
+    for encoding in ('br', 'gzip'):
+        if etag.endswith('-' + encoding):
+            return etag[:-len(encoding) - 1]
+    return etag
+
+
+def normalize_if_none_match(value):
+    """ ``If-None-Match`` with encoding suffixes removed from every tag. """
+    if value.strip() == '*':
+        return value
+    return ', '.join('"%s"' % strip_etag_suffix(tag) for tag in ETagMatcher.parse(value).etags)
+
+
+def compress(body, encoding, gzip_level=6, brotli_quality=4):
+    if encoding == 'br':
+        return brotli.compress(body, quality=brotli_quality)
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+
+class RouteCompression(object):
+    def __init__(self):
+        self.responses = 0
+        self.compressed = 0
+        self.cached = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_ms = 0.0
+
+    def as_dict(self):
+        return {'responses': self.responses,
+                'compressed': self.compressed,
+                'cached': self.cached,
+                'bytes_in': self.bytes_in,
+                'bytes_out': self.bytes_out,
+                'ratio': float(self.bytes_out) / self.bytes_in if self.bytes_in else None,
+                'cpu_ms': round(self.cpu_ms, 3)}
+
+
+class CompressionStats(object):
+    """ Per-route counts of compressed responses, bytes before and after,
+    and CPU time spent compressing.  ``cached`` counts variants served from
+    the page cache, whose bytes are counted but cost no CPU.
+    """
+
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def record(self, route, bytes_in=0, bytes_out=0, cpu_ms=0.0, cached=False):
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = RouteCompression()
+            stats.responses += 1
+            if bytes_in:
+                stats.compressed += 1
+                stats.cached += bool(cached)
+                stats.bytes_in += bytes_in
+                stats.bytes_out += bytes_out
+                stats.cpu_ms += cpu_ms
+
+    def snapshot(self):
+        with self._lock:
+            return dict((route, stats.as_dict()) for route, stats in self._routes.items())
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+compression_stats = CompressionStats()
+
+
+def _vary_on_encoding(response):
+    vary = tuple(response.vary or ())
+    if 'Accept-Encoding' not in vary:
+        response.vary = vary + ('Accept-Encoding',)
+
+
+def negotiate(request, encodings):
+    # webob treats a missing header as accepting anything.
+    if 'Accept-Encoding' not in request.headers:
+        return None
+    for offer, q in request.accept_encoding.acceptable_offers(list(encodings)):
+        return offer
+    return None
+
+
+class Compressor(object):
+    """ Compresses responses as configured by the ``plog.compression``
+    settings.  The tween uses one; so does the ASGI read path.
+    """
+
+    def __init__(self, registry):
+        settings = registry.settings
+        self.registry = registry
+        self.enabled = asbool(settings.get(PREFIX.rstrip('.'), False))
+        self.min_size = int(settings.get(PREFIX + 'min_size', 1024))
+        self.gzip_level = int(settings.get(PREFIX + 'gzip_level', 6))
+        self.brotli_quality = int(settings.get(PREFIX + 'brotli_quality', 4))
+        self.types = frozenset(aslist(settings.get(PREFIX + 'types', ''))) or \
+            frozenset(DEFAULT_TYPES)
+        self.encodings = [e for e in aslist(settings.get(PREFIX + 'encodings', 'br gzip'))
+                          if e in available_encodings()]
+
+    def compressible(self, request, response):
+        return (request.method == 'GET' and
+                response.status_int == 200 and
+                response.content_type in self.types and
+                'Content-Encoding' not in response.headers and
+                not response.cache_control.no_transform and
+                isinstance(response.app_iter, (list, tuple)) and
+                len(response.body) >= self.min_size)
+
+    def prepare(self, request):
+        """ Strip encoding suffixes from ``If-None-Match``; returns the
+        header as the client sent it.
+        """
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            request.headers['If-None-Match'] = normalize_if_none_match(if_none_match)
+        return if_none_match
+
+    def __call__(self, request, response, if_none_match):
+        route = getattr(request, 'matched_route', None)
+        route = route.name if route is not None else '<notfound>'
+        encoding = negotiate(request, self.encodings)
+        if response.status_int == 304:
+            if encoding and response.etag:
+                response.etag = suffix_etag(response.etag, encoding)
+            return response
+        if not self.compressible(request, response):
+            compression_stats.record(route)
+            return response
+        _vary_on_encoding(response)
+        if encoding is None:
+            compression_stats.record(route)
+            return response
+
+        etag = response.etag
+        if if_none_match and etag and etag in ETagMatcher.parse(request.headers['If-None-Match']):
+            # A cached page's own conditional check would miss the suffix.
+            response = HTTPNotModified(headers=[
+                (k, v) for k, v in response.headerlist if k in NOT_MODIFIED_HEADERS])
+            response.etag = suffix_etag(etag, encoding)
+            return response
+
+        body = response.body
+        cache = get_page_cache(self.registry)
+        cache_key = getattr(request, 'page_cache_key', None)
+        variant = None
+        if cache is not None and cache_key is not None:
+            variant = cache.get_variant(cache_key[0], cache_key[1], encoding)
+            if variant is not None and etag and \
+                    dict(variant.headers).get('ETag') != '"%s"' % suffix_etag(etag, encoding):
+                variant = None
+        if variant is not None:
+            compressed, cpu_ms = variant.body, 0.0
+        else:
+            start = time.thread_time()
+            compressed = compress(body, encoding, self.gzip_level, self.brotli_quality)
+            cpu_ms = (time.thread_time() - start) * 1000
+        response.body = compressed
+        response.content_encoding = encoding
+        if etag:
+            response.etag = suffix_etag(etag, encoding)
+        if variant is None and cache is not None and cache_key is not None:
+            cache.set_variant(cache_key[0], cache_key[1], encoding, CachedPage(
+                response.status, [(k, v) for k, v in response.headerlist if k in VARIANT_HEADERS],
+                compressed))
+        compression_stats.record(route, len(body), len(compressed), cpu_ms, variant is not None)
+        return response
+
+
+def compression_tween_factory(handler, registry):
+    compressor = Compressor(registry)
+    if not compressor.enabled:
+        return handler
+
+    def compression_tween(request):
+        if_none_match = compressor.prepare(request)
+        return compressor(request, handler(request), if_none_match)
+    return compression_tween
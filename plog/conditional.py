@@ -0,0 +1,42 @@
+import hashlib
+from datetime import timezone
+
+from pyramid.httpexceptions import HTTPNotModified
+from webob.datetime_utils import parse_date
+from webob.etag import ETagMatcher
+
+
+def make_etag(*parts):
+    return hashlib.sha1('|'.join(str(p) for p in parts).encode('utf-8')).hexdigest()[:32]
+
+
+def as_utc(dt):
+    """ Model timestamps are naive UTC; webob hands back aware ones. """
+    if dt is not None and dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def not_modified(request, etag, last_modified=None):
+    """ Set the validators on ``request.response`` and return an
+    :class:`HTTPNotModified` if the client's copy is still fresh, else
+    ``None``.  ``If-None-Match`` wins over ``If-Modified-Since``.
+    """
+    last_modified = as_utc(last_modified)
+    if last_modified is not None:
+        last_modified = last_modified.replace(microsecond=0)
+    response = request.response
+    response.etag = etag
+    response.last_modified = last_modified
+    response.headers['Vary'] = 'Cookie'
+    headers = [(k, response.headers[k]) for k in ('ETag', 'Last-Modified', 'Vary')
+               if k in response.headers]
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        if etag in ETagMatcher.parse(if_none_match):
+            return HTTPNotModified(headers=headers)
+        return None
+    since = parse_date(request.headers.get('If-Modified-Since'))
+    if since is not None and last_modified is not None and last_modified <= since:
+        return HTTPNotModified(headers=headers)
+    return None
@@ -0,0 +1,44 @@
+from sqlalchemy import engine_from_config, event
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.pool import QueuePool
+
+SQLITE_PREFIX = 'plog.sqlite.'
+# PRAGMAs applied to every new SQLite connection, in this order.
+SQLITE_PRAGMAS = ('journal_mode', 'synchronous', 'busy_timeout', 'mmap_size',
+                  'cache_size', 'temp_store')
+POOL_OPTIONS = ('pool_size', 'max_overflow', 'pool_recycle', 'pool_timeout')
+
+
+def sqlite_pragmas(settings):
+    return [(name, settings[SQLITE_PREFIX + name]) for name in SQLITE_PRAGMAS
+            if settings.get(SQLITE_PREFIX + name)]
+
+
+def make_engine(settings, prefix='sqlalchemy.'):
+    """ ``engine_from_config`` plus what the ini file can't express.
+
+    A file-backed SQLite database gets a real ``QueuePool`` (shared across
+    threads) when any pool option is set, and each new connection runs the
+    ``plog.sqlite.*`` PRAGMAs, e.g. ``journal_mode = wal`` and
+    ``busy_timeout = 5000``.
+    """
+    # Replicas have their own engines (plog.replicas).
+    settings = dict((k, v) for k, v in settings.items()
+                    if not k.startswith(prefix + 'replicas.'))
+    url = make_url(settings[prefix + 'url'])
+    kw = {}
+    is_sqlite = url.get_backend_name() == 'sqlite'
+    if is_sqlite and url.database not in (None, '', ':memory:') and \
+            any(settings.get(prefix + option) for option in POOL_OPTIONS):
+        kw['poolclass'] = QueuePool
+        kw['connect_args'] = {'check_same_thread': False}
+    engine = engine_from_config(settings, prefix, **kw)
+    pragmas = sqlite_pragmas(settings) if is_sqlite else []
+    if pragmas:
+        @event.listens_for(engine, 'connect')
+        def set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas:
+                cursor.execute('PRAGMA %s = %s' % (name, value))
+            cursor.close()
+    return engine
@@ -0,0 +1,224 @@
+""" Atom and RSS feeds of the latest posts.
+
+Feed readers poll, so a feed is generated once per content change and
+then served from :class:`FeedCache` until one of the post write views
+calls :func:`plog.cache.invalidate_posts`.  Generation is incremental:
+each post's entry is kept, keyed by its id and version, and only posts
+added or changed since the last generation have their HTML loaded.
+
+With ``plog.feed.directory`` set the documents are also written there,
+and every worker checks the file before trusting its memory copy, so
+an invalidation in one process is seen by all of them.  Without it each
+process keeps its own copy, which is only right with a single worker.
+
+Responses carry an ETag and Last-Modified and answer conditional
+requests with a 304 without touching the database.
+"""
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from email.utils import format_datetime
+from xml.sax.saxutils import escape, quoteattr
+
+from sqlalchemy.orm import undefer
+
+from plog.cache import CachedPage
+from plog.conditional import as_utc, make_etag
+from plog.models import Post
+from plog.rendering import RENDERER_VERSION, post_html
+
+KINDS = {'atom': 'application/atom+xml', 'rss': 'application/rss+xml'}
+TITLE = 'Plog'
+# Feeds are keyed by the application URL they link to; bound how many
+# distinct Host headers can be cached at once, in memory and on disk.
+MAX_DOCUMENTS = 16
+
+
+class FeedCache(object):
+    """ Generated feed documents, plus the per-post entries they were
+    built from.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.generated = 0
+        self._documents = OrderedDict()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, make_etag(key))
+
+    def get(self, key):
+        with self._lock:
+            cached = self._documents.get(key)
+        if self.directory is None:
+            return cached and cached[1]
+        try:
+            stamp = os.stat(self._path(key)).st_mtime_ns
+        except OSError:
+            return None
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        try:
+            with open(self._path(key), 'rb') as f:
+                page = CachedPage.loads(f.read())
+        except (IOError, OSError, ValueError):
+            return None
+        self._remember(key, stamp, page)
+        return page
+
+    def set(self, key, page):
+        stamp = None
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, prefix='.')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(page.dumps())
+            os.replace(tmp, self._path(key))
+            stamp = os.stat(self._path(key)).st_mtime_ns
+            self._prune()
+        self._remember(key, stamp, page)
+
+    def _prune(self):
+        """ Remove all but the ``MAX_DOCUMENTS`` newest documents on disk. """
+        documents = []
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith('.'):
+                # Another process's document, not yet renamed into place.
+                continue
+            try:
+                documents.append((entry.stat().st_mtime_ns, entry.path))
+            except OSError:
+                pass
+        documents.sort(reverse=True)
+        for _, path in documents[MAX_DOCUMENTS:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _remember(self, key, stamp, page):
+        with self._lock:
+            self._documents.pop(key, None)
+            self._documents[key] = (stamp, page)
+            while len(self._documents) > MAX_DOCUMENTS:
+                self._documents.popitem(last=False)
+
+    def entries(self, key):
+        """ The entry cache of one feed: ``(id, version) -> xml``. """
+        with self._lock:
+            entries = self._entries.pop(key, None)
+            entries = self._entries[key] = entries if entries is not None else {}
+            while len(self._entries) > MAX_DOCUMENTS:
+                self._entries.popitem(last=False)
+            return entries
+
+    def clear(self):
+        """ Forget every document; entries stay, as they are keyed by version. """
+        with self._lock:
+            self._documents.clear()
+        if self.directory is not None and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+def feed_cache_from_settings(settings):
+    return FeedCache(settings.get('plog.feed.directory') or None)
+
+
+def get_feed_cache(registry):
+    return getattr(registry, 'feed_cache', None)
+
+
+def _atom_date(dt):
+    return as_utc(dt).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _rss_date(dt):
+    return format_datetime(as_utc(dt), usegmt=True)
+
+
+def atom_entry(request, post, html):
+    url = request.route_url('post', slug=post.slug)
+    return (u'<entry><title>%s</title><id>%s</id><link href=%s/><updated>%s</updated>'
+            u'<summary>%s</summary><content type="html">%s</content></entry>' % (
+                escape(post.title), escape(entry_id(request, post.id)), quoteattr(url),
+                _atom_date(post.updated_at), escape(post.summary or ''), escape(html)))
+
+
+def rss_entry(request, post, html):
+    url = request.route_url('post', slug=post.slug)
+    return (u'<item><title>%s</title><link>%s</link><guid isPermaLink="false">%s</guid>'
+            u'<pubDate>%s</pubDate><description>%s</description></item>' % (
+                escape(post.title), escape(url), escape(entry_id(request, post.id)),
+                _rss_date(post.updated_at), escape(html)))
+
+
+def entry_id(request, post_id):
+    # Stable across slug changes, unlike the post URL.
+    return '%s/#post-%d' % (request.application_url, post_id)
+
+
+def atom_document(request, updated, entries):
+    home = request.route_url('home')
+    yield (u'<?xml version="1.0" encoding="utf-8"?>\n'
+           u'<feed xmlns="http://www.w3.org/2005/Atom"><title>%s</title><id>%s</id>'
+           u'<link href=%s/><link rel="self" href=%s/><updated>%s</updated>'
+           u'<author><name>%s</name></author>' % (
+               escape(TITLE), escape(home), quoteattr(home),
+               quoteattr(request.route_url('feed_atom')),
+               _atom_date(updated), escape(TITLE)))
+    for entry in entries:
+        yield entry
+    yield u'</feed>\n'
+
+
+def rss_document(request, updated, entries):
+    home = request.route_url('home')
+    yield (u'<?xml version="1.0" encoding="utf-8"?>\n'
+           u'<rss version="2.0"><channel><title>%s</title><link>%s</link>'
+           u'<description>%s</description><lastBuildDate>%s</lastBuildDate>' % (
+               escape(TITLE), escape(home), escape(TITLE), _rss_date(updated)))
+    for entry in entries:
+        yield entry
+    yield u'</channel></rss>\n'
+
+
+ENTRY = {'atom': atom_entry, 'rss': rss_entry}
+DOCUMENT = {'atom': atom_document, 'rss': rss_document}
+
+
+def generate_feed(request, session, kind, size):
+    """ The feed of the ``size`` most recent posts as a :class:`CachedPage`,
+    reusing cached entries for posts that have not changed.
+    """
+    cache = get_feed_cache(request.registry)
+    entries = cache.entries((kind, request.application_url))
+    posts = session.query(Post.id, Post.version, Post.title, Post.slug, Post.updated_at,
+                          Post.summary).order_by(Post.id.desc()).limit(size).all()
+    current = [(p.id, p.version) for p in posts]
+    fragments = dict((k, entries.get(k)) for k in current)
+    missing = [id for (id, version), xml in fragments.items() if xml is None]
+    if missing:
+        for post in session.query(Post).options(undefer(Post.body_html)).\
+                filter(Post.id.in_(missing)):
+            fragments[(post.id, post.version)] = entries[(post.id, post.version)] = \
+                ENTRY[kind](request, post, post_html(session, post))
+    for stale in set(entries) - set(current):
+        entries.pop(stale, None)
+    updated = max([p.updated_at for p in posts] or [datetime.utcnow()])
+    body = u''.join(DOCUMENT[kind](request, updated, (
+        fragments[k] for k in current if fragments[k] is not None)))
+    etag = make_etag('feed', kind, RENDERER_VERSION, *['%s.%s' % k for k in current])
+    headers = [('Content-Type', '%s; charset=UTF-8' % KINDS[kind]),
+               ('ETag', '"%s"' % etag)]
+    if posts:
+        headers.append(('Last-Modified', _rss_date(updated.replace(microsecond=0))))
+    cache.generated += 1
+    return CachedPage('200 OK', headers, body.encode('utf-8'))
@@ -0,0 +1,59 @@
+""" Invalidation shared by the worker processes on a host.
+
+The principal cache and the slug map are per process, so an edit only
+clears the copy in the worker that handled it.  With
+``plog.invalidation.directory`` set each of them watches a file there:
+an invalidation replaces the file, and every other worker, seeing a
+different file on its next lookup, drops its whole copy.  A lookup costs
+one ``stat``.  ``plog.prefork`` requires the setting.
+"""
+import os
+import tempfile
+
+from pyramid.settings import asbool
+
+
+class Generation(object):
+    """ The file ``path`` as a counter every worker can bump and watch. """
+
+    def __init__(self, path):
+        self.path = path
+        self._seen = self._stamp()
+
+    def _stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        # Each bump is a new file, so its inode changes even when two
+        # bumps land within the clock's resolution.
+        return stat.st_ino, stat.st_mtime_ns
+
+    def bump(self):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.')
+        os.close(fd)
+        os.replace(tmp, self.path)
+        self._seen = self._stamp()
+
+    def changed(self):
+        """ Whether another process bumped it since the last call. """
+        stamp = self._stamp()
+        if stamp == self._seen:
+            return False
+        self._seen = stamp
+        return True
+
+
+def generation_from_settings(settings, name):
+    """ The :class:`Generation` ``name`` under ``plog.invalidation.directory``,
+    or ``None`` without one.
+    """
+    directory = settings.get('plog.invalidation.directory')
+    if directory:
+        return Generation(os.path.join(directory, name))
+    if asbool(settings.get('plog.prefork')):
+        raise ValueError('plog.invalidation.directory must be set with plog.prefork, '
+                         'or workers keep stale principals and slugs')
+    return None
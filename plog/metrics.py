@@ -0,0 +1,234 @@
+import bisect
+import threading
+import time
+import weakref
+
+from pyramid.events import BeforeRender, subscriber
+from pyramid.settings import asbool
+from sqlalchemy import event
+
+# Histogram bucket upper bounds, in milliseconds.
+BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, float('inf'))
+
+
+class Histogram(object):
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def merge(self, data):
+        """ Add the counts of another histogram's :meth:`as_dict`. """
+        for bound, n in data['buckets'].items():
+            self.counts[BUCKETS.index(float(bound))] += n
+        self.count += data['count']
+        self.total += data['mean'] * data['count']
+        self.max = max(self.max, data['max'])
+
+    def percentile(self, q):
+        """ Upper bound of the bucket holding the ``q``th percentile. """
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self):
+        return {'count': self.count,
+                'mean': self.total / self.count if self.count else 0.0,
+                'max': self.max,
+                'p50': self.percentile(50),
+                'p95': self.percentile(95),
+                'p99': self.percentile(99),
+                'buckets': dict((str(b), n) for b, n in zip(BUCKETS, self.counts) if n)}
+
+
+class RouteMetrics(object):
+    def __init__(self):
+        self.total = Histogram()
+        self.db = Histogram()
+        self.template = Histogram()
+        self.queries = Histogram()
+
+    def as_dict(self):
+        return {'total_ms': self.total.as_dict(),
+                'db_ms': self.db.as_dict(),
+                'template_ms': self.template.as_dict(),
+                'queries': self.queries.as_dict()}
+
+
+class Metrics(object):
+    """ Per-process aggregate of request timings, keyed by route name. """
+
+    def __init__(self):
+        self.routes = {}
+        self._lock = threading.Lock()
+
+    def record(self, route, stats):
+        with self._lock:
+            route_metrics = self.routes.get(route)
+            if route_metrics is None:
+                route_metrics = self.routes[route] = RouteMetrics()
+            route_metrics.total.add(stats.total_ms)
+            route_metrics.db.add(stats.db_ms)
+            route_metrics.template.add(stats.template_ms)
+            route_metrics.queries.add(stats.queries)
+
+    def snapshot(self):
+        with self._lock:
+            return dict((route, m.as_dict()) for route, m in self.routes.items())
+
+    def reset(self):
+        with self._lock:
+            self.routes.clear()
+
+
+metrics = Metrics()
+
+
+class EngineMetrics(object):
+    """ Per-process query times and errors, keyed by engine name. """
+
+    def __init__(self):
+        self.engines = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name):
+        engine = self.engines.get(name)
+        if engine is None:
+            engine = self.engines[name] = {'query_ms': Histogram(), 'errors': 0}
+        return engine
+
+    def record(self, name, ms):
+        with self._lock:
+            self._get(name)['query_ms'].add(ms)
+
+    def error(self, name):
+        with self._lock:
+            self._get(name)['errors'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict((name, {'query_ms': e['query_ms'].as_dict(), 'errors': e['errors']})
+                        for name, e in self.engines.items())
+
+    def reset(self):
+        with self._lock:
+            self.engines.clear()
+
+
+engine_metrics = EngineMetrics()
+
+
+class RequestStats(object):
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_ms = 0.0
+        self.render_start = None
+        self.template_ms = 0.0
+        self.total_ms = 0.0
+
+    def finish(self):
+        self.total_ms = (time.perf_counter() - self.start) * 1000
+
+    def server_timing(self):
+        return 'db;dur=%.2f;desc="%d queries", tpl;dur=%.2f, total;dur=%.2f' % (
+            self.db_ms, self.queries, self.template_ms, self.total_ms)
+
+
+_local = threading.local()
+
+
+def current_stats():
+    return getattr(_local, 'stats', None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('plog_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    ms = (time.perf_counter() - conn.info['plog_query_start'].pop()) * 1000
+    engine_metrics.record(_engine_names.get(conn.engine, '<other>'), ms)
+    stats = current_stats()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_ms += ms
+
+
+def _handle_error(context):
+    if context.connection is not None:
+        context.connection.info.get('plog_query_start', [None]).pop()
+    engine_metrics.error(_engine_names.get(context.engine, '<other>'))
+
+
+_engine_names = weakref.WeakKeyDictionary()
+
+
+def instrument_engine(engine, name='primary'):
+    """ Time every query of ``engine``, for the current request and under
+    ``name`` in :data:`engine_metrics`.
+    """
+    _engine_names[engine] = name
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(engine, 'handle_error', _handle_error)
+
+
+@subscriber(BeforeRender)
+def mark_render_start(event):
+    stats = current_stats()
+    if stats is not None:
+        stats.render_start = time.perf_counter()
+
+
+def render_timing_deriver(view, info):
+    """ View deriver sitting just outside ``rendered_view``: template time
+    runs from ``BeforeRender`` to the rendered response coming back here.
+    """
+    def wrapper(context, request):
+        response = view(context, request)
+        stats = current_stats()
+        if stats is not None and stats.render_start is not None:
+            stats.template_ms += (time.perf_counter() - stats.render_start) * 1000
+            stats.render_start = None
+        return response
+    return wrapper
+
+
+def timing_tween_factory(handler, registry):
+    """ Records query count, DB time, template time and total time of each
+    request into :data:`metrics`.
+    """
+    # Off unless asked for: timings tell any client about the database.
+    server_timing = asbool(registry.settings.get('plog.metrics.server_timing', False))
+
+    def timing_tween(request):
+        stats = _local.stats = RequestStats()
+        try:
+            response = handler(request)
+        finally:
+            _local.stats = None
+            stats.finish()
+            route = getattr(request, 'matched_route', None)
+            metrics.record(route.name if route is not None else '<notfound>', stats)
+            shared = getattr(registry, 'shared_stats', None)
+            if shared is not None:
+                shared.tick()
+        if server_timing:
+            response.headers['Server-Timing'] = stats.server_timing()
+        return response
+    return timing_tween
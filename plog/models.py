@@ -1,5 +1,8 @@
+from datetime import datetime
+
 from sqlalchemy import (
     Column,
+    DateTime,
     Integer,
     Text,
     Table,
@@ -12,6 +15,8 @@ from sqlalchemy.orm import (
     scoped_session,
     sessionmaker,
     relationship,
+    validates,
+    deferred,
 )
 from pyramid.security import (
     Allow,
@@ -20,9 +25,12 @@ from pyramid.security import (
 
 from zope.sqlalchemy import ZopeTransactionExtension
 from slugify import slugify
-from passlib.hash import sha256_crypt
+from plog.passwords import hash_password
+from plog.rendering import render_post
+from plog.replicas import RoutingSession
 
-DBSession = scoped_session(sessionmaker(extension=ZopeTransactionExtension()))
+DBSession = scoped_session(sessionmaker(class_=RoutingSession,
+                                        extension=ZopeTransactionExtension()))
 Base = declarative_base()
 
 
@@ -39,17 +47,49 @@ class Post(Base):
     id = Column(Integer, primary_key=True)
     title = Column(Text, nullable=False, unique=True)
     slug = Column(Text, nullable=False, unique=True)
-    body = Column(Text, nullable=False)
+    # Listings never need the (possibly large) bodies.
+    body = deferred(Column(Text, nullable=False))
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = Column(Integer, nullable=False, default=1)
+    # Derived from body on write; see plog.rendering.
+    body_html = deferred(Column(Text))
+    body_html_version = Column(Integer)
+    summary = Column(Text)
+    word_count = Column(Integer)
+    reading_time = Column(Integer)
+
+    # Former slugs, which redirect here.
+    redirects = relationship('SlugRedirect', cascade='all, delete-orphan')
+
+    __mapper_args__ = {'version_id_col': version}
 
     def __init__(self, title, body):
         self.title = title
         self.slug = slugify(self.title)
         self.body = body
 
+    @validates('body')
+    def _render_body(self, key, body):
+        if body != self.body or self.body_html is None:
+            for column, value in render_post(body).items():
+                setattr(self, column, value)
+        return body
+
+
+class SlugRedirect(Base):
+    __tablename__ = 'slug_redirects'
+    id = Column(Integer, primary_key=True)
+    slug = Column(Text, nullable=False, unique=True)
+    post_id = Column(Integer, ForeignKey('posts.id', ondelete='CASCADE'), nullable=False, index=True)
+
+    def __init__(self, slug, post_id):
+        self.slug = slug
+        self.post_id = post_id
+
 
 association_table = Table('association', Base.metadata,
-                          Column('users_id', Integer, ForeignKey('users.id')),
-                          Column('groups_id', Integer, ForeignKey('groups.id'))
+                          Column('users_id', Integer, ForeignKey('users.id'), index=True),
+                          Column('groups_id', Integer, ForeignKey('groups.id'), index=True)
                           )
 
 
@@ -63,7 +103,7 @@ class User(Base):
 
     def __init__(self, username, password, email):
         self.username = username
-        self.password = sha256_crypt.encrypt(password)
+        self.password = hash_password(password)
         self.email = email
 
 
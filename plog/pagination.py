@@ -0,0 +1,117 @@
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+# Larger values don't fit an SQLite (or any 64-bit) integer bind.
+INT_MAX = 2 ** 63 - 1
+
+
+class Page(object):
+    """ One page of a keyset-paginated query.
+
+    ``next`` and ``prev`` are the cursor values to pass back as ``after``
+    and ``before``; either is ``None`` when there is nothing in that
+    direction.
+    """
+
+    def __init__(self, items, next=None, prev=None):
+        self.items = items
+        self.next = next
+        self.prev = prev
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def page_size(request, param='limit'):
+    default = int(request.registry.settings.get('plog.page_size', DEFAULT_PAGE_SIZE))
+    size = int_param(request, param)
+    if size is None or size < 1:
+        return default
+    return min(size, MAX_PAGE_SIZE)
+
+
+def int_param(request, name):
+    """ The integer parameter ``name``, or ``None`` if it is missing,
+    malformed or outside the 64-bit range.
+    """
+    try:
+        value = int(request.params[name])
+    except (KeyError, ValueError):
+        return None
+    return value if -INT_MAX - 1 <= value <= INT_MAX else None
+
+
+def keyset_page(query, column, after=None, before=None, limit=DEFAULT_PAGE_SIZE):
+    """ Return a :class:`Page` of ``query`` ordered by the unique, indexed
+    ``column``, starting right after ``after`` or ending right before
+    ``before``.  Only ``limit + 1`` rows are ever fetched.
+    """
+    key = column.key
+    if before is not None:
+        rows = query.filter(column < before).\
+            order_by(column.desc()).limit(limit + 1).all()
+        more = len(rows) > limit
+        rows = rows[:limit][::-1]
+        if not rows:
+            return Page(rows)
+        return Page(rows,
+                    next=getattr(rows[-1], key),
+                    prev=getattr(rows[0], key) if more else None)
+    if after is not None:
+        query = query.filter(column > after)
+    rows = query.order_by(column.asc()).limit(limit + 1).all()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if not rows:
+        return Page(rows)
+    return Page(rows,
+                next=getattr(rows[-1], key) if more else None,
+                prev=getattr(rows[0], key) if after is not None else None)
+
+
+def paginate(request, query, column, prefix=''):
+    """ :func:`keyset_page` driven by the ``<prefix>after``,
+    ``<prefix>before`` and ``<prefix>limit`` request parameters.
+    """
+    return keyset_page(query, column,
+                       after=int_param(request, prefix + 'after'),
+                       before=int_param(request, prefix + 'before'),
+                       limit=page_size(request, prefix + 'limit'))
+
+
+def keyset_statement(query, column, after=None, before=None, limit=DEFAULT_PAGE_SIZE):
+    """ The Core ``select`` for one page of ``query``; hand its rows to
+    :func:`keyset_result`.  Split so that any executor, sync or not, can
+    run it.
+    """
+    if before is not None:
+        return query.where(column < before).order_by(column.desc()).limit(limit + 1)
+    if after is not None:
+        query = query.where(column > after)
+    return query.order_by(column.asc()).limit(limit + 1)
+
+
+def keyset_result(rows, column, after=None, before=None, limit=DEFAULT_PAGE_SIZE):
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if before is not None:
+        rows = rows[::-1]
+    if not rows:
+        return Page(rows)
+    if before is not None:
+        return Page(rows,
+                    next=rows[-1][column.key],
+                    prev=rows[0][column.key] if more else None)
+    return Page(rows,
+                next=rows[-1][column.key] if more else None,
+                prev=rows[0][column.key] if after is not None else None)
+
+
+def keyset_select(session, query, column, after=None, before=None, limit=DEFAULT_PAGE_SIZE):
+    """ :func:`keyset_page` for a Core ``select``, executed on ``session``
+    and returning its rows as they come back from the database.
+    """
+    rows = session.execute(keyset_statement(query, column, after, before, limit)).fetchall()
+    return keyset_result(rows, column, after, before, limit)
@@ -0,0 +1,112 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+PREFIX = 'plog.passwords.'
+# Every scheme but the first is deprecated, so hashes made under an older
+# default are flagged for rehashing too.
+DEFAULT_POLICY = {'schemes': 'sha256_crypt', 'deprecated': 'auto'}
+
+pwd_context = CryptContext(**DEFAULT_POLICY)
+
+
+class PoolBusy(Exception):
+    """ Raised when a verification couldn't get a slot in time. """
+
+
+def policy_from_settings(settings):
+    """ passlib ``CryptContext`` options from ``plog.passwords.*`` settings.
+
+    ``<scheme>__rounds`` is pinned as both the minimum and maximum too, so
+    hashes made under an older rounds policy are flagged for rehashing.
+    """
+    policy = dict(DEFAULT_POLICY)
+    for key, value in settings.items():
+        name = key[len(PREFIX):]
+        if key.startswith(PREFIX) and not name.startswith('pool.'):
+            policy[name] = value
+    for key, value in list(policy.items()):
+        if key.endswith('__rounds'):
+            scheme = key[:-len('__rounds')]
+            policy.setdefault(scheme + '__min_rounds', value)
+            policy.setdefault(scheme + '__max_rounds', value)
+    return policy
+
+
+def hash_password(password):
+    return pwd_context.hash(password)
+
+
+_contexts = {}
+
+
+def _verify_and_update(policy, password, hashed):
+    # Runs in the pool; process workers build their own context once.
+    key = tuple(sorted(policy.items()))
+    context = _contexts.get(key)
+    if context is None:
+        context = _contexts[key] = CryptContext(**policy)
+    return context.verify_and_update(password, hashed)
+
+
+class VerifyPool(object):
+    """ Runs password verification off the request thread on a fixed
+    number of workers.  At most ``max_pending`` verifications may be
+    running or queued, and each holds its request thread while it waits,
+    so ``max_pending`` must stay below the server's thread count.  Beyond
+    that callers get :class:`PoolBusy` at once, or after waiting up to
+    ``timeout`` seconds for a slot, so a login storm is turned away
+    instead of tying up every server thread.
+    """
+
+    def __init__(self, policy=None, workers=2, max_pending=4, timeout=0.0, kind='thread'):
+        self.policy = dict(policy or DEFAULT_POLICY)
+        self.timeout = timeout
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(max_pending)
+        executor = ProcessPoolExecutor if kind == 'process' else ThreadPoolExecutor
+        self._executor = executor(max_workers=workers)
+
+    def verify_and_update(self, password, hashed):
+        if self.timeout > 0:
+            acquired = self._slots.acquire(timeout=self.timeout)
+        else:
+            acquired = self._slots.acquire(blocking=False)
+        if not acquired:
+            self.rejected += 1
+            raise PoolBusy()
+        try:
+            future = self._executor.submit(_verify_and_update, self.policy, password, hashed)
+            return future.result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+verify_pool = None
+
+
+def configure_passwords(settings):
+    global verify_pool
+    policy = policy_from_settings(settings)
+    pwd_context.load(policy)
+    if verify_pool is not None:
+        verify_pool.shutdown()
+    verify_pool = VerifyPool(
+        policy,
+        workers=int(settings.get(PREFIX + 'pool.workers', 2)),
+        max_pending=int(settings.get(PREFIX + 'pool.max_pending', 4)),
+        timeout=float(settings.get(PREFIX + 'pool.timeout', 0)),
+        kind=settings.get(PREFIX + 'pool.kind', 'thread'))
+
+
+def verify_and_update(password, hashed):
+    """ ``(valid, new_hash)``; ``new_hash`` is set when ``hashed`` no
+    longer matches the configured policy and should be stored instead.
+    """
+    if verify_pool is None:
+        return pwd_context.verify_and_update(password, hashed)
+    return verify_pool.verify_and_update(password, hashed)
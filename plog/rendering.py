@@ -0,0 +1,159 @@
+""" Markdown rendering of post bodies.
+
+Posts are rendered once, when their body is set, into ``Post.body_html``
+stamped with :data:`RENDERER_VERSION`, along with the plain-text
+``summary``, ``word_count`` and ``reading_time`` listings show.  Rows
+whose stamp is missing or older (Core imports, or posts rendered before
+the renderer changed) are re-rendered the first time they are viewed, or
+in bulk by ``plog_render_posts``.  Bump :data:`RENDERER_VERSION` whenever the
+extensions, their configuration or the summary rules change.
+
+Raw HTML in the source is escaped rather than passed through, and links
+or images with a scheme other than http, https or mailto lose it.  The
+scheme is read the way a browser reads it: after decoding character
+references and dropping whitespace and control characters.
+"""
+import html
+import math
+import re
+import threading
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+
+import markdown
+from markdown.extensions import Extension
+from markdown.treeprocessors import Treeprocessor
+from markdown.util import AMP_SUBSTITUTE
+from sqlalchemy import or_
+from sqlalchemy.orm.attributes import set_committed_value
+from zope.sqlalchemy import mark_changed
+
+from plog.replicas import from_replica
+
+RENDERER_VERSION = 3
+SUMMARY_WORDS = 50
+WORDS_PER_MINUTE = 200
+EXTENSIONS = ['fenced_code', 'tables', 'codehilite', 'sane_lists']
+EXTENSION_CONFIGS = {'codehilite': {'guess_lang': False, 'css_class': 'codehilite'}}
+SAFE_SCHEMES = ('', 'http', 'https', 'mailto')
+IGNORED_IN_URLS = re.compile(r'[\x00-\x20\x7f]+')
+
+
+def url_scheme(value):
+    """ The scheme a browser would see in the attribute ``value``. """
+    value = html.unescape(value.replace(AMP_SUBSTITUTE, '&'))
+    return urlparse(IGNORED_IN_URLS.sub('', value)).scheme.lower()
+
+
+class _SafeLinks(Treeprocessor):
+    def run(self, root):
+        for element in root.iter():
+            for attribute in ('href', 'src'):
+                value = element.get(attribute)
+                if value is not None and url_scheme(value) not in SAFE_SCHEMES:
+                    del element.attrib[attribute]
+
+
+class SafeExtension(Extension):
+    def extendMarkdown(self, md):
+        md.preprocessors.deregister('html_block')
+        md.inlinePatterns.deregister('html')
+        md.treeprocessors.register(_SafeLinks(md), 'safe_links', 0)
+
+
+_local = threading.local()
+
+
+def _markdown():
+    # Markdown instances hold per-document state, so one per thread.
+    md = getattr(_local, 'md', None)
+    if md is None:
+        md = _local.md = markdown.Markdown(extensions=EXTENSIONS + [SafeExtension()],
+                                           extension_configs=EXTENSION_CONFIGS)
+    return md
+
+
+def render_markdown(text):
+    return _markdown().reset().convert(text or '')
+
+
+class _TextExtractor(HTMLParser):
+    """ Text of rendered HTML, leaving out code blocks. """
+
+    def __init__(self):
+        HTMLParser.__init__(self)
+        self.parts = []
+        self._pre = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'pre':
+            self._pre += 1
+
+    def handle_endtag(self, tag):
+        if tag == 'pre':
+            self._pre -= 1
+
+    def handle_data(self, data):
+        if not self._pre:
+            self.parts.append(data)
+
+
+def plain_text(html):
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return ' '.join(''.join(parser.parts).split())
+
+
+def render_post(body):
+    """ Every column derived from a post body, keyed by column name. """
+    html = render_markdown(body)
+    words = plain_text(html).split()
+    summary = ' '.join(words[:SUMMARY_WORDS])
+    if len(words) > SUMMARY_WORDS:
+        summary += u'\u2026'
+    return {'body_html': html,
+            'body_html_version': RENDERER_VERSION,
+            'summary': summary,
+            'word_count': len(words),
+            'reading_time': max(1, int(math.ceil(len(words) / float(WORDS_PER_MINUTE))))}
+
+
+def is_stale(post):
+    return post.body_html is None or post.body_html_version != RENDERER_VERSION
+
+
+def stale_clause(table):
+    return or_(table.c.body_html_version.is_(None),
+               table.c.body_html_version != RENDERER_VERSION)
+
+
+def saves_renders(session):
+    """ Whether :func:`post_html` saves what it re-renders in ``session``. """
+    return not from_replica(session)
+
+
+def post_html(session, post):
+    """ ``post.body_html``, re-rendering and saving it first if it is stale.
+    The save goes through Core so it neither bumps ``version`` nor touches
+    ``updated_at``: the post's content did not change.
+
+    A post read from a replica may be behind the primary, so it is only
+    rendered in memory.  Otherwise the save is skipped if the row's
+    version or stamp changed since it was read.
+    """
+    if not is_stale(post):
+        return post.body_html
+    values = render_post(post.body)
+    if saves_renders(session):
+        table = post.__table__
+        stamp = table.c.body_html_version
+        session.execute(table.update().where(
+            (table.c.id == post.id) & (table.c.version == post.version) &
+            (stamp.is_(None) if post.body_html_version is None
+             else stamp == post.body_html_version)).values(
+            updated_at=table.c.updated_at, **values))
+        mark_changed(session())
+    for key, value in values.items():
+        set_committed_value(post, key, value)
+    return values['body_html']
@@ -0,0 +1,224 @@
+""" Read replicas for :data:`plog.models.DBSession`.
+
+Each ``sqlalchemy.replicas.<name>.url`` setting (plus any other engine
+option under the same prefix) adds a replica engine.  During ``GET`` and
+``HEAD`` requests the session sends ``SELECT`` statements to one of the
+healthy replicas, the same one for the whole request.  Everything else
+goes to the primary, and so does every statement that follows a write
+in the same request.
+
+A replica is checked out before each request uses it.  One that can't
+be connected to, or whose statement fails with an operational or
+disconnect error, is taken out of rotation for
+``plog.replicas.retry_interval`` seconds; after that the next request to
+pick it runs ``plog.replicas.health_query`` on it first.  With no usable
+replica, reads go to the primary.
+
+Replicas lag behind the primary, so a client that just wrote (any
+request other than ``GET`` or ``HEAD``) gets a ``plog_primary`` cookie
+and reads from the primary for ``plog.replicas.sticky_seconds``.  The
+cookie only chooses the engine, so it needs no signature.
+"""
+import itertools
+import threading
+import time
+
+from pyramid.settings import asbool
+from pyramid.tweens import MAIN
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.sql.expression import SelectBase
+
+from plog.db import make_engine
+
+PREFIX = 'sqlalchemy.replicas.'
+SETTINGS = 'plog.replicas.'
+STICKY_COOKIE = 'plog_primary'
+READ_METHODS = ('GET', 'HEAD')
+
+
+class Replica(object):
+    def __init__(self, name, engine):
+        self.name = name
+        self.engine = engine
+        self.healthy = True
+        self.retry_at = 0.0
+        self.failures = 0
+        self.chosen = 0
+
+
+class ReplicaRouter(object):
+    """ Picks a healthy replica, round robin, and keeps track of which
+    ones are failing.
+    """
+
+    def __init__(self, replicas, retry_interval=30.0, health_query='SELECT 1'):
+        self.replicas = list(replicas)
+        self.retry_interval = retry_interval
+        self.health_query = health_query
+        self._cycle = itertools.cycle(self.replicas)
+        self._lock = threading.Lock()
+        for replica in self.replicas:
+            self._watch(replica)
+
+    def _watch(self, replica):
+        @event.listens_for(replica.engine, 'handle_error')
+        def on_error(context):
+            if context.is_disconnect or isinstance(context.sqlalchemy_exception,
+                                                   OperationalError):
+                self.mark_down(replica)
+
+    def mark_down(self, replica):
+        with self._lock:
+            if replica.healthy:
+                replica.failures += 1
+            replica.healthy = False
+            replica.retry_at = time.monotonic() + self.retry_interval
+
+    def _next(self):
+        """ The next healthy replica, or one that is due for a retry. """
+        with self._lock:
+            for _ in range(len(self.replicas)):
+                replica = next(self._cycle)
+                if replica.healthy:
+                    return replica
+                if replica.retry_at <= time.monotonic():
+                    # Only this request retries it; others keep skipping it.
+                    replica.retry_at = time.monotonic() + self.retry_interval
+                    return replica
+        return None
+
+    def _check(self, replica):
+        """ Can ``replica`` be used?  A connection checkout for a healthy
+        one, the health query for one being retried.
+        """
+        try:
+            with replica.engine.connect() as connection:
+                if not replica.healthy:
+                    connection.execute(text(self.health_query))
+        except DBAPIError:
+            self.mark_down(replica)
+            return False
+        with self._lock:
+            replica.healthy = True
+            replica.chosen += 1
+        return True
+
+    def choose(self):
+        """ A usable replica's engine, or ``None`` to use the primary. """
+        for _ in range(len(self.replicas)):
+            replica = self._next()
+            if replica is None:
+                return None
+            if self._check(replica):
+                return replica.engine
+        return None
+
+    def stats(self):
+        with self._lock:
+            return dict((r.name, {'healthy': int(r.healthy),
+                                  'failures': r.failures,
+                                  'chosen': r.chosen}) for r in self.replicas)
+
+
+def replica_names(settings):
+    return sorted(set(key[len(PREFIX):].split('.', 1)[0] for key in settings
+                      if key.startswith(PREFIX) and key.endswith('.url')))
+
+
+def router_from_settings(settings, instrument=None):
+    """ A :class:`ReplicaRouter` for the configured replicas, or ``None``. """
+    replicas = []
+    for name in replica_names(settings):
+        engine = make_engine(settings, prefix='%s%s.' % (PREFIX, name))
+        if instrument is not None:
+            instrument(engine, 'replica:' + name)
+        replicas.append(Replica(name, engine))
+    if not replicas:
+        return None
+    return ReplicaRouter(replicas,
+                         retry_interval=float(settings.get(SETTINGS + 'retry_interval', 30)),
+                         health_query=settings.get(SETTINGS + 'health_query', 'SELECT 1'))
+
+
+def _is_read(clause):
+    if isinstance(clause, SelectBase):
+        return True
+    return isinstance(clause, TextClause) and clause.text.lstrip()[:6].upper() == 'SELECT'
+
+
+class RoutingSession(Session):
+    """ A session that reads from a replica while ``info['read_only']``
+    is set and nothing has been written.
+    """
+
+    def __init__(self, router=None, **kw):
+        super(RoutingSession, self).__init__(**kw)
+        self.router = router
+
+    def get_bind(self, mapper=None, clause=None):
+        info = self.info
+        if self.router is None or not info.get('read_only'):
+            return super(RoutingSession, self).get_bind(mapper, clause)
+        if self._flushing or isinstance(clause, UpdateBase) or not _is_read(clause):
+            info['wrote'] = True
+        if info.get('wrote'):
+            return super(RoutingSession, self).get_bind(mapper, clause)
+        if 'replica' not in info:
+            info['replica'] = self.router.choose()
+        return info['replica'] or super(RoutingSession, self).get_bind(mapper, clause)
+
+
+def from_replica(session):
+    """ Whether ``session`` has been reading from a replica.  What it read
+    may lag the primary, so it is served but neither saved nor cached.
+    """
+    return session.info.get('replica') is not None
+
+
+def _sticky(request):
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def replica_tween_factory(handler, registry):
+    """ Marks the session read-only for ``GET`` and ``HEAD`` requests of
+    clients that haven't written recently, and sets the sticky cookie
+    after a write.
+    """
+    # plog.models builds DBSession from RoutingSession.
+    from plog.models import DBSession
+    settings = registry.settings
+    sticky_seconds = int(settings.get(SETTINGS + 'sticky_seconds', 10))
+    secure = asbool(settings.get(SETTINGS + 'secure_cookie', False))
+
+    def replica_tween(request):
+        session = DBSession()
+        session.info.pop('replica', None)
+        session.info.pop('wrote', None)
+        session.info['read_only'] = request.method in READ_METHODS and not _sticky(request)
+        try:
+            response = handler(request)
+        finally:
+            session.info.pop('read_only', None)
+        if request.method not in READ_METHODS and sticky_seconds:
+            response.set_cookie(STICKY_COOKIE, str(int(time.time()) + sticky_seconds),
+                                max_age=sticky_seconds, httponly=True, secure=secure)
+        return response
+    return replica_tween
+
+
+def configure_replicas(config, router):
+    if router is None:
+        return
+    config.add_tween('plog.replicas.replica_tween_factory',
+                     over=('pyramid_tm.tm_tween_factory', MAIN))
+
+
+def get_router(registry):
+    return getattr(registry, 'replica_router', None)
@@ -0,0 +1,245 @@
+""" Bulk import and export of posts.
+
+Both directions stream: imports read one record at a time and insert in
+fixed-size batches, each in its own transaction, and exports page through
+the posts table with ``yield_per``, so memory use does not grow with the
+size of the archive.
+
+JSON-lines records look like ``{"title": ..., "body": ...}`` with optional
+``slug`` and ``updated_at``.  Markdown files hold one post each, with the
+same keys as ``key: value`` lines in a front-matter block::
+
+    ---
+    title: Hello World
+    ---
+    First post of Plog project.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+from pyramid.paster import (
+    get_appsettings,
+    setup_logging,
+)
+from slugify import slugify
+
+from plog.db import make_engine
+from plog.models import (
+    DBSession,
+    Post,
+)
+
+FRONT_MATTER = '---'
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+class Progress(object):
+    """ Counts rows and prints the running rate at most every
+    ``interval`` seconds.
+    """
+
+    def __init__(self, verb, out=sys.stderr, interval=1.0):
+        self.verb = verb
+        self.out = out
+        self.interval = interval
+        self.count = 0
+        self.skipped = 0
+        self.start = self.last = time.time()
+
+    def update(self, count, skipped=0):
+        self.count += count
+        self.skipped += skipped
+        if time.time() - self.last >= self.interval:
+            self.last = time.time()
+            self.report()
+
+    def report(self, final=False):
+        elapsed = time.time() - self.start
+        rate = self.count / elapsed if elapsed else 0.0
+        self.out.write('%s%s %d posts (%d skipped) in %.1fs, %.0f rows/s\n' % (
+            'done: ' if final else '', self.verb, self.count, self.skipped, elapsed, rate))
+        self.out.flush()
+
+
+def parse_markdown(text):
+    record = {}
+    lines = text.splitlines(True)
+    if lines and lines[0].strip() == FRONT_MATTER:
+        for i, line in enumerate(lines[1:], 1):
+            if line.strip() == FRONT_MATTER:
+                lines = lines[i + 1:]
+                break
+            key, sep, value = line.partition(':')
+            if sep:
+                record[key.strip()] = value.strip()
+        else:
+            raise ValueError('unterminated front matter')
+    record['body'] = ''.join(lines).strip('\n')
+    return record
+
+
+def format_markdown(record):
+    head = ['%s: %s' % (k, record[k]) for k in ('title', 'slug', 'updated_at')]
+    return '\n'.join([FRONT_MATTER] + head + [FRONT_MATTER, record['body'], ''])
+
+
+def iter_paths(paths, suffix):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(suffix):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def read_records(paths, fmt):
+    if fmt == 'jsonl':
+        for path in paths:
+            f = sys.stdin if path == '-' else io.open(path, encoding='utf-8')
+            with f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+    else:
+        for path in iter_paths(paths, '.md'):
+            with io.open(path, encoding='utf-8') as f:
+                yield parse_markdown(f.read())
+
+
+def make_row(record):
+    title = record['title']
+    row = {'title': title,
+           'slug': record.get('slug') or slugify(title),
+           'body': record['body']}
+    # Every row needs the same keys: an executemany compiles its INSERT
+    # from the first one.
+    if record.get('updated_at'):
+        row['updated_at'] = datetime.strptime(record['updated_at'][:19], TIMESTAMP_FORMAT)
+    else:
+        row['updated_at'] = datetime.utcnow()
+    return row
+
+
+def dedupe(conn, rows):
+    """ Drop rows whose title is already taken and suffix slugs that
+    collide, looking only at the current batch and the rows it touches.
+    """
+    table = Post.__table__
+    titles = set(r[0] for r in conn.execute(
+        table.select().with_only_columns([table.c.title]).
+        where(table.c.title.in_([row['title'] for row in rows]))))
+    kept = []
+    for row in rows:
+        if row['title'] in titles:
+            continue
+        titles.add(row['title'])
+        kept.append(row)
+    bases = set(row['slug'] for row in kept)
+    taken = set(r[0] for r in conn.execute(
+        table.select().with_only_columns([table.c.slug]).
+        where(table.c.slug.in_(bases))))
+    for row in kept:
+        slug, n = row['slug'], 1
+        while slug in taken or (n > 1 and conn.execute(
+                table.select().where(table.c.slug == slug)).first()):
+            n += 1
+            slug = '%s-%d' % (row['slug'], n)
+        taken.add(slug)
+        row['slug'] = slug
+    return kept
+
+
+def import_posts(engine, records, batch_size=500, progress=None):
+    table = Post.__table__
+
+    def flush(batch):
+        with engine.begin() as conn:
+            rows = dedupe(conn, batch)
+            if rows:
+                conn.execute(table.insert(), rows)
+        if progress is not None:
+            progress.update(len(rows), len(batch) - len(rows))
+
+    batch = []
+    for record in records:
+        batch.append(make_row(record))
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+
+def export_records(session, batch_size=500):
+    query = session.query(Post.title, Post.slug, Post.body, Post.updated_at).\
+        order_by(Post.id).yield_per(batch_size)
+    for title, slug, body, updated_at in query:
+        yield {'title': title,
+               'slug': slug,
+               'body': body,
+               'updated_at': updated_at.strftime(TIMESTAMP_FORMAT) if updated_at else ''}
+
+
+def write_records(records, output, fmt, progress=None):
+    if fmt == 'jsonl':
+        f = sys.stdout if output == '-' else io.open(output, 'w', encoding='utf-8')
+        try:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+                if progress is not None:
+                    progress.update(1)
+        finally:
+            if f is not sys.stdout:
+                f.close()
+    else:
+        if not os.path.isdir(output):
+            os.makedirs(output)
+        for record in records:
+            with io.open(os.path.join(output, record['slug'] + '.md'), 'w', encoding='utf-8') as f:
+                f.write(format_markdown(record))
+            if progress is not None:
+                progress.update(1)
+
+
+def _parser(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('config_uri', help='e.g. development.ini')
+    parser.add_argument('--format', choices=('jsonl', 'markdown'), default='jsonl')
+    parser.add_argument('--batch-size', type=int, default=500)
+    return parser
+
+
+def _engine(config_uri):
+    setup_logging(config_uri)
+    settings = get_appsettings(config_uri)
+    return make_engine(settings)
+
+
+def import_main(argv=sys.argv):
+    parser = _parser('Import posts from JSON-lines or Markdown files.')
+    parser.add_argument('paths', nargs='+',
+                        help="files or directories to read ('-' for stdin with jsonl)")
+    args = parser.parse_args(argv[1:])
+    engine = _engine(args.config_uri)
+    progress = Progress('imported')
+    import_posts(engine, read_records(args.paths, args.format), args.batch_size, progress)
+    progress.report(final=True)
+
+
+def export_main(argv=sys.argv):
+    parser = _parser('Export posts to JSON-lines or Markdown files.')
+    parser.add_argument('output',
+                        help="jsonl file ('-' for stdout) or directory for markdown")
+    args = parser.parse_args(argv[1:])
+    DBSession.configure(bind=_engine(args.config_uri))
+    progress = Progress('exported')
+    write_records(export_records(DBSession, args.batch_size), args.output, args.format, progress)
+    progress.report(final=True)
@@ -0,0 +1,157 @@
+""" Concurrent-connection scaling of the read path: waitress vs. ASGI.
+
+Seeds a SQLite file with ``--posts`` posts and serves it twice, each in
+its own process: the WSGI application under waitress with ``--threads``
+threads, and :mod:`plog.asgi` under uvicorn.  For each count in
+``--connections`` an asyncio client opens that many keep-alive
+connections at once, each sending ``--requests`` anonymous requests for
+the home page or a random post, and reports requests per second and
+p50/p99 latency per server.
+
+The client shares the machine with the server under test, so absolute
+numbers are pessimistic; compare the two servers' curves, not either one
+with the single-client benchmark.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import shutil
+import socket
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+
+from plog.scripts.benchmark import DEFAULT_SETTINGS, summarize
+from plog.scripts.render_posts import render_posts
+from plog.scripts.seed import post_slug, seed_database
+
+SERVERS = ('waitress', 'asgi')
+
+
+def free_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def serve(kind, settings, port, threads):
+    """ Run one server until the process is terminated. """
+    from plog import main as make_app
+    app = make_app({}, **settings)
+    if kind == 'waitress':
+        import logging
+        import waitress
+        # Queue depth warnings are the point of the exercise, not news.
+        logging.getLogger('waitress.queue').setLevel(logging.ERROR)
+        waitress.serve(app, host='127.0.0.1', port=port, threads=threads, _quiet=True)
+    else:
+        import uvicorn
+        from plog.asgi import asgi_app
+        uvicorn.run(asgi_app(app), host='127.0.0.1', port=port, log_level='warning',
+                    access_log=False)
+
+
+def wait_for(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError('server on port %d did not start' % port)
+
+
+async def fetch(reader, writer, path):
+    writer.write(('GET %s HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n' % path).encode('ascii'))
+    status = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status.split()[1])
+
+
+async def drive(port, connections, requests, posts, seed):
+    rng = random.Random(seed)
+    latencies, errors = [], []
+
+    async def client():
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            for _ in range(requests):
+                path = '/' if rng.random() < 0.25 else '/post/' + post_slug(rng.randrange(posts))
+                t = time.perf_counter()
+                status = await fetch(reader, writer, path)
+                latencies.append(time.perf_counter() - t)
+                if status != 200:
+                    errors.append(status)
+        finally:
+            writer.close()
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(connections)])
+    result = summarize(latencies, [], time.perf_counter() - start)
+    result['errors'] = len(errors)
+    return result
+
+
+def bench(kind, settings, args):
+    port = free_port()
+    process = multiprocessing.Process(target=serve, args=(kind, settings, port, args.threads))
+    process.start()
+    try:
+        wait_for(port)
+        # Warm the templates, slug map and connection pools.
+        asyncio.run(drive(port, 4, 10, args.posts, args.seed))
+        return [(n, asyncio.run(drive(port, n, args.requests, args.posts, args.seed)))
+                for n in args.connections]
+    finally:
+        process.terminate()
+        process.join()
+
+
+def main(argv=sys.argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--connections', type=int, nargs='+', default=[1, 10, 50, 200])
+    parser.add_argument('--requests', type=int, default=20, help='per connection')
+    parser.add_argument('--threads', type=int, default=8, help='waitress threads')
+    parser.add_argument('--page-cache', action='store_true',
+                        help='serve from the memory page cache')
+    parser.add_argument('--server', action='append', choices=SERVERS,
+                        help='only benchmark these servers')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv[1:])
+
+    directory = tempfile.mkdtemp()
+    try:
+        settings = dict(DEFAULT_SETTINGS)
+        settings['sqlalchemy.url'] = 'sqlite:///%s' % os.path.join(directory, 'bench.sqlite')
+        settings['plog.sqlite.journal_mode'] = 'wal'
+        settings['plog.page_cache'] = 'memory' if args.page_cache else 'off'
+        engine = create_engine(settings['sqlalchemy.url'])
+        seed_database(engine, args.posts, 1, 1, args.seed)
+        render_posts(engine)
+        engine.dispose()
+
+        print('%-9s %11s %9s %8s %8s %7s' % (
+            'server', 'connections', 'req/s', 'p50 ms', 'p99 ms', 'errors'))
+        for kind in args.server or SERVERS:
+            for connections, r in bench(kind, settings, args):
+                print('%-9s %11d %9.1f %8.2f %8.2f %7d' % (
+                    kind, connections, r['req_per_sec'], r['p50_ms'], r['p99_ms'],
+                    r['errors']))
+    finally:
+        shutil.rmtree(directory)
+    return 0
@@ -0,0 +1,76 @@
+""" Login verification throughput for a range of hashing rounds.
+
+Each round count is measured by pushing ``--logins`` verifications
+through a :class:`plog.passwords.VerifyPool` from ``--clients``
+concurrent threads, the way waitress threads would under a login storm.
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+
+from passlib.context import CryptContext
+
+from plog.passwords import VerifyPool, PoolBusy
+
+
+def run(scheme, rounds, logins, clients, workers, max_pending, kind):
+    policy = {'schemes': scheme, '%s__rounds' % scheme: rounds}
+    pool = VerifyPool(policy, workers=workers, max_pending=max_pending, timeout=60, kind=kind)
+    hashed = CryptContext(**policy).hash('secret')
+    latencies = []
+    lock = threading.Lock()
+    remaining = [logins]
+
+    def client():
+        while True:
+            with lock:
+                if not remaining[0]:
+                    return
+                remaining[0] -= 1
+            start = time.perf_counter()
+            try:
+                pool.verify_and_update('secret', hashed)
+            except PoolBusy:
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    pool.shutdown()
+    latencies.sort()
+    return {'rounds': rounds,
+            'logins_per_sec': len(latencies) / elapsed,
+            'p50_ms': latencies[len(latencies) // 2] * 1000,
+            'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000}
+
+
+def main(argv=sys.argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scheme', default='sha256_crypt')
+    parser.add_argument('--rounds', default='5000,50000,100000,535000',
+                        help='comma separated round counts')
+    parser.add_argument('--logins', type=int, default=50)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--max-pending', type=int, default=8)
+    parser.add_argument('--kind', choices=('thread', 'process'), default='thread')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args(argv[1:])
+    results = [run(args.scheme, int(r), args.logins, args.clients, args.workers,
+                   args.max_pending, args.kind)
+               for r in args.rounds.split(',')]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print('%10s %12s %10s %10s' % ('rounds', 'logins/s', 'p50 ms', 'p95 ms'))
+    for r in results:
+        print('%10d %12.1f %10.1f %10.1f' % (
+            r['rounds'], r['logins_per_sec'], r['p50_ms'], r['p95_ms']))
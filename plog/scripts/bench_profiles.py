@@ -0,0 +1,147 @@
+""" Compare request throughput of deployment profiles under waitress.
+
+Each ini file is served by an in-process waitress server against its own
+freshly seeded SQLite file.  Client threads log in as an admin and then
+mix reads (home and post pages) with post edits, which is what exposes
+"database is locked" errors and readers stalling behind writers.
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from http.client import HTTPConnection
+from urllib.parse import urlencode
+
+import transaction
+from pyramid.paster import get_appsettings
+
+from plog import main as make_app
+from plog.models import (
+    DBSession,
+    Base,
+    Post,
+    User,
+    Group,
+    Permission,
+)
+from plog.search import ensure_search_index
+from plog.scripts.benchmark import start_server, stop_server
+
+PASSWORD = 'bench'
+
+
+def seed(engine, posts):
+    Base.metadata.create_all(engine)
+    ensure_search_index(engine)
+    with engine.begin() as conn:
+        conn.execute(Post.__table__.insert(), [
+            {'title': 'Post %d' % i, 'slug': 'post-%d' % i, 'body': 'lorem ipsum ' * 200}
+            for i in range(posts)])
+    with transaction.manager:
+        user = User('admin', PASSWORD, 'admin@example.com')
+        user.group.append(Group('admins', Permission('edit')))
+        DBSession.add(user)
+        DBSession.add(Permission('view'))
+
+
+def serve(config_uri, directory, posts, threads):
+    settings = get_appsettings(config_uri)
+    settings['sqlalchemy.url'] = 'sqlite:///%s' % os.path.join(directory, 'bench.sqlite')
+    # Logins aren't what is being measured here.
+    settings['plog.passwords.sha256_crypt__rounds'] = '1000'
+    settings['plog.page_cache'] = 'off'
+    app = make_app({}, **settings)
+    seed(DBSession.bind, posts)
+    return start_server(app, threads)
+
+
+class Client(threading.Thread):
+    def __init__(self, port, posts, write_ratio, deadline, seed):
+        threading.Thread.__init__(self)
+        self.port = port
+        self.posts = posts
+        self.write_ratio = write_ratio
+        self.deadline = deadline
+        self.random = random.Random(seed)
+        self.latencies = []
+        self.errors = 0
+        self.cookie = ''
+
+    def request(self, conn, method, path, body=None):
+        headers = {'Cookie': self.cookie}
+        if body is not None:
+            body = urlencode(body)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        conn.request(method, path, body, headers)
+        response = conn.getresponse()
+        response.read()
+        cookies = [v.split(';', 1)[0] for k, v in response.getheaders()
+                   if k.lower() == 'set-cookie' and v.startswith('auth_tkt=')]
+        if cookies:
+            self.cookie = cookies[-1]
+        return response.status
+
+    def run(self):
+        conn = HTTPConnection('127.0.0.1', self.port)
+        self.request(conn, 'POST', '/login', {'login': 'admin', 'password': PASSWORD,
+                                              'came_from': '/', 'form.submitted': '1'})
+        while time.time() < self.deadline:
+            n = self.random.randrange(self.posts)
+            if self.random.random() < self.write_ratio:
+                args = ('POST', '/post/edit/post-%d' % n,
+                        {'title': 'Post %d' % n, 'body': 'edited %f' % time.time()})
+            elif self.random.random() < 0.2:
+                args = ('GET', '/')
+            else:
+                args = ('GET', '/post/post-%d' % n)
+            start = time.perf_counter()
+            status = self.request(conn, *args)
+            self.latencies.append(time.perf_counter() - start)
+            if status >= 500:
+                self.errors += 1
+        conn.close()
+
+
+def run(config_uri, posts, clients, threads, duration, write_ratio):
+    directory = tempfile.mkdtemp()
+    try:
+        server = serve(config_uri, directory, posts, threads)
+        deadline = time.time() + duration
+        workers = [Client(server.effective_port, posts, write_ratio, deadline, i)
+                   for i in range(clients)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        stop_server(server)
+    finally:
+        shutil.rmtree(directory)
+    latencies = sorted(l for w in workers for l in w.latencies)
+    return {'profile': config_uri,
+            'requests': len(latencies),
+            'req_per_sec': len(latencies) / float(duration),
+            'errors': sum(w.errors for w in workers),
+            'p50_ms': latencies[len(latencies) // 2] * 1000,
+            'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000}
+
+
+def main(argv=sys.argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('config_uris', nargs='+', help='e.g. development.ini production.ini')
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--threads', type=int, default=8, help='waitress threads')
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--write-ratio', type=float, default=0.1)
+    args = parser.parse_args(argv[1:])
+    print('%-20s %9s %9s %7s %8s %8s' % ('profile', 'requests', 'req/s', 'errors', 'p50 ms', 'p95 ms'))
+    for config_uri in args.config_uris:
+        r = run(config_uri, args.posts, args.clients, args.threads, args.duration, args.write_ratio)
+        print('%-20s %9d %9.1f %7d %8.1f %8.1f' % (
+            os.path.basename(r['profile']), r['requests'], r['req_per_sec'],
+            r['errors'], r['p50_ms'], r['p95_ms']))
@@ -0,0 +1,387 @@
+""" Latency and throughput benchmark for every Plog route.
+
+Builds the real WSGI application from ``plog.main`` against a SQLite file
+seeded by :mod:`plog.scripts.seed` with ``--posts`` posts, ``--users``
+users and ``--groups`` groups, then drives each route scenario either
+in-process through WebTest or, with ``--concurrency``, from client
+threads against a waitress server.
+
+Each scenario reports p50/p95/p99 latency, requests per second and
+queries per request (read from the ``Server-Timing`` header).  Results
+can be written as a JSON baseline with ``--output`` and compared against
+an earlier one with ``--baseline``; the command exits non-zero when a
+scenario regressed by more than ``--threshold`` percent.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.client import HTTPConnection
+from urllib.parse import urlencode
+
+import waitress
+from pyramid.paster import get_appsettings
+from webtest import TestApp
+
+from plog import main as make_app
+from plog.models import DBSession
+from plog.scripts.render_posts import render_posts
+from plog.scripts.seed import (
+    WORDS,
+    seed_database,
+    post_slug,
+    post_title,
+    username,
+    group_name,
+)
+
+PASSWORD = 'bench'
+QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+CSRF_RE = re.compile(r'name="csrf_token" value="([^"]+)"')
+
+DEFAULT_SETTINGS = {
+    'pyramid.includes': 'pyramid_tm\npyramid_jinja2',
+    'jinja2.filters': 'route_url = pyramid_jinja2.filters:route_url_filter\n'
+                      'static_url = pyramid_jinja2.filters:static_url_filter',
+}
+
+
+class Context(object):
+    """ What scenarios draw their URLs and form data from. """
+
+    def __init__(self, posts, users, groups, seed=0):
+        self.posts = posts
+        self.users = users
+        self.groups = groups
+        self.random = random.Random(seed)
+        self.csrf_token = None
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def next(self, kind='default'):
+        with self._lock:
+            self._counters[kind] = self._counters.get(kind, 0) + 1
+            return self._counters[kind]
+
+    def post(self):
+        return post_slug(self.random.randrange(self.posts))
+
+    def user(self):
+        return username(self.random.randrange(self.users))
+
+    def group(self):
+        return group_name(self.random.randrange(self.groups))
+
+    # Extra rows past the requested counts exist only to be deleted.
+    def victim_post(self):
+        return post_slug(self.posts + self.next('post') - 1)
+
+    def victim_user(self):
+        return username(self.users + self.next('user') - 1)
+
+    def victim_group(self):
+        return group_name(self.groups + self.next('group') - 1)
+
+
+# (name, method, url factory, form data factory or None); method JSON is
+# a POST of the data as a JSON body.  Edits keep the title so slugs stay
+# stable across iterations.  login and logout come last: logging in
+# starts a new session, which has a new CSRF token, and only the first
+# logout runs logged in.
+SCENARIOS = [
+    ('home', 'GET', lambda c: '/', None),
+    ('home_next_page', 'GET', lambda c: '/?after=%d' % c.random.randrange(1, c.posts), None),
+    ('post', 'GET', lambda c: '/post/' + c.post(), None),
+    ('feed', 'GET', lambda c: '/feed.atom', None),
+    ('feed_rss', 'GET', lambda c: '/feed.rss', None),
+    ('search', 'GET', lambda c: '/search?q=' + c.random.choice(WORDS), None),
+    ('login_form', 'GET', lambda c: '/login', None),
+    ('static', 'GET', lambda c: '/static/css/bootstrap.min.css', None),
+    ('admin', 'GET', lambda c: '/admin', None),
+    ('metrics', 'GET', lambda c: '/admin/metrics', None),
+    ('profile', 'GET', lambda c: '/user/profile/' + c.user(), None),
+    ('edit_user_form', 'GET', lambda c: '/user/edit/' + c.user(), None),
+    ('edit_post_form', 'GET', lambda c: '/post/edit/' + c.post(), None),
+    ('add_post_form', 'GET', lambda c: '/post/add', None),
+    ('add_user_form', 'GET', lambda c: '/user/add', None),
+    ('add_group_form', 'GET', lambda c: '/group/add', None),
+    ('add_post', 'POST', lambda c: '/post/add',
+     lambda c, path: {'csrf_token': c.csrf_token, 'title': 'Bench post %d' % c.next(),
+                      'body': 'x'}),
+    ('edit_post', 'POST', lambda c: '/post/edit/' + c.post(),
+     lambda c, path: {'title': post_title(int(path.rsplit('-', 1)[1])),
+                      'body': 'edited %d' % c.next()}),
+    ('delete_post', 'GET', lambda c: '/post/del/' + c.victim_post(), None),
+    ('del_user', 'GET', lambda c: '/user/del/' + c.victim_user(), None),
+    ('del_group', 'GET', lambda c: '/group/del/' + c.victim_group(), None),
+    ('add_user', 'POST', lambda c: '/user/add',
+     lambda c, path: dict(csrf_token=c.csrf_token, username='bench.new%d' % c.next('new'),
+                          password=PASSWORD, group_name='admins',
+                          email='bench.new%d@example.com' % c.next('new'))),
+    ('add_group', 'POST', lambda c: '/group/add',
+     lambda c, path: {'csrf_token': c.csrf_token, 'group_name': 'bench-%d' % c.next('new'),
+                      'permission_name': 'view'}),
+    ('edit_user', 'POST', lambda c: '/user/edit/' + c.user(),
+     lambda c, path: {'csrf_token': c.csrf_token, 'username': path.rsplit('/', 1)[1],
+                      'email': 'edited%d@example.com' % c.next(), 'group_name': 'admins'}),
+    ('api_posts', 'GET', lambda c: '/api/v1/posts', None),
+    ('api_post', 'GET', lambda c: '/api/v1/posts/' + c.post(), None),
+    ('api_users', 'GET', lambda c: '/api/v1/users', None),
+    ('api_user', 'GET', lambda c: '/api/v1/users/' + c.user(), None),
+    ('api_groups', 'GET', lambda c: '/api/v1/groups', None),
+    ('api_group', 'GET', lambda c: '/api/v1/groups/' + c.group(), None),
+    ('api_posts_batch', 'JSON', lambda c: '/api/v1/posts/batch',
+     lambda c, path: {'create': [{'title': 'Bench batch %d' % c.next(), 'body': 'x'}],
+                      'update': [{'slug': c.post(), 'body': 'batch %d' % c.next()}]}),
+    ('login', 'POST', lambda c: '/login',
+     lambda c, path: {'login': 'admin', 'password': PASSWORD, 'came_from': '/',
+                      'form.submitted': '1'}),
+    ('logout', 'GET', lambda c: '/logout', None),
+]
+
+
+def summarize(latencies, queries, elapsed):
+    latencies = sorted(latencies)
+    n = len(latencies)
+
+    def pct(q):
+        return latencies[min(n - 1, int(n * q / 100.0))] * 1000 if n else 0.0
+    return {'requests': n,
+            'req_per_sec': n / elapsed if elapsed else 0.0,
+            'p50_ms': pct(50),
+            'p95_ms': pct(95),
+            'p99_ms': pct(99),
+            'queries_per_request': float(sum(queries)) / n if n else 0.0}
+
+
+def build_app(config_uri, directory, args):
+    settings = dict(get_appsettings(config_uri)) if config_uri else dict(DEFAULT_SETTINGS)
+    settings['sqlalchemy.url'] = 'sqlite:///%s' % os.path.join(directory, 'bench.sqlite')
+    settings['plog.metrics.server_timing'] = 'true'
+    settings['plog.passwords.sha256_crypt__rounds'] = '1000'
+    app = make_app({}, **settings)
+    victims = args.requests * (args.concurrency or 1) + 1
+    seed_database(DBSession.bind, args.posts + victims, args.users + victims,
+                  args.groups + victims, args.seed, PASSWORD)
+    # Measure the steady state, not each post's first (rendering) view.
+    render_posts(DBSession.bind)
+    return app
+
+
+def run_inprocess(app, context, scenarios, requests):
+    client = TestApp(app)
+    client.post('/login', {'login': 'admin', 'password': PASSWORD,
+                           'came_from': '/', 'form.submitted': '1'})
+    context.csrf_token = CSRF_RE.search(client.get('/post/add').text).group(1)
+    results = {}
+    for name, method, url, form in scenarios:
+        latencies, queries = [], []
+        start = time.perf_counter()
+        for _ in range(requests):
+            path = url(context)
+            data = form(context, path) if form else None
+            t = time.perf_counter()
+            if method == 'POST':
+                response = client.post(path, data, status='*')
+            elif method == 'JSON':
+                response = client.post_json(path, data, status='*')
+            else:
+                response = client.get(path, status='*')
+            latencies.append(time.perf_counter() - t)
+            match = QUERIES_RE.search(response.headers.get('Server-Timing', ''))
+            queries.append(int(match.group(1)) if match else 0)
+        results[name] = summarize(latencies, queries, time.perf_counter() - start)
+    return results
+
+
+def start_server(app, threads):
+    server = waitress.create_server(app, host='127.0.0.1', port=0, threads=threads)
+
+    def run():
+        try:
+            server.run()
+        except (OSError, ValueError):
+            pass  # closed under the event loop by stop_server()
+    thread = threading.Thread(target=run)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def stop_server(server):
+    # Let in-flight tasks finish before their trigger goes away.
+    server.task_dispatcher.shutdown()
+    server.close()
+    engine = DBSession.bind
+    DBSession.remove()
+    engine.dispose()
+
+
+class HTTPClient(object):
+    """ Keep-alive connection that remembers cookies. """
+
+    def __init__(self, port, cookies=None):
+        self.conn = HTTPConnection('127.0.0.1', port)
+        self.cookies = dict(cookies or {})
+
+    def request(self, method, path, data=None):
+        headers = {'Cookie': '; '.join('%s=%s' % kv for kv in self.cookies.items())}
+        body = None
+        if method == 'JSON':
+            method, body = 'POST', json.dumps(data)
+            headers['Content-Type'] = 'application/json'
+        elif data is not None:
+            body = urlencode(data)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        self.conn.request(method, path, body, headers)
+        response = self.conn.getresponse()
+        text = response.read()
+        for k, v in response.getheaders():
+            if k.lower() == 'set-cookie':
+                name, _, value = v.split(';', 1)[0].partition('=')
+                self.cookies[name] = value
+        return response, text
+
+    def close(self):
+        self.conn.close()
+
+
+def run_concurrent(app, context, scenarios, requests, concurrency, threads):
+    server = start_server(app, threads)
+    port = server.effective_port
+    try:
+        login = HTTPClient(port)
+        login.request('POST', '/login', {'login': 'admin', 'password': PASSWORD,
+                                         'came_from': '/', 'form.submitted': '1'})
+        _, page = login.request('GET', '/post/add')
+        context.csrf_token = CSRF_RE.search(page.decode('utf-8')).group(1)
+        login.close()
+        results = {}
+        for name, method, url, form in scenarios:
+            latencies, queries = [], []
+            lock = threading.Lock()
+
+            def worker():
+                client = HTTPClient(port, login.cookies)
+                for _ in range(requests):
+                    with lock:
+                        path = url(context)
+                        data = form(context, path) if form else None
+                    t = time.perf_counter()
+                    response, _ = client.request(method, path, data)
+                    elapsed = time.perf_counter() - t
+                    match = QUERIES_RE.search(response.getheader('Server-Timing') or '')
+                    with lock:
+                        latencies.append(elapsed)
+                        queries.append(int(match.group(1)) if match else 0)
+                client.close()
+            workers = [threading.Thread(target=worker) for _ in range(concurrency)]
+            start = time.perf_counter()
+            for w in workers:
+                w.start()
+            for w in workers:
+                w.join()
+            results[name] = summarize(latencies, queries, time.perf_counter() - start)
+        return results
+    finally:
+        stop_server(server)
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.STDOUT).decode('ascii').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, meta, baseline, threshold):
+    """ Print per-scenario changes against ``baseline`` and return the
+    names of scenarios whose p50 or throughput got worse than
+    ``threshold`` percent.
+    """
+    regressions = []
+    changed = [k for k in ('posts', 'users', 'groups', 'requests', 'concurrency')
+               if baseline.get('meta', {}).get(k) != meta[k]]
+    if changed:
+        print('\nwarning: baseline was run with different %s' % ', '.join(changed))
+    print('\n%-18s %12s %12s' % ('vs baseline', 'p50', 'req/s'))
+    for name, r in sorted(results.items()):
+        old = baseline.get('results', {}).get(name)
+        if not old:
+            continue
+        p50 = (r['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100 if old['p50_ms'] else 0.0
+        rps = (r['req_per_sec'] - old['req_per_sec']) / old['req_per_sec'] * 100 \
+            if old['req_per_sec'] else 0.0
+        flag = ''
+        if p50 > threshold or -rps > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print('%-18s %+11.1f%% %+11.1f%%%s' % (name, p50, rps, flag))
+    return regressions
+
+
+def main(argv=sys.argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--config', help='ini file to take app settings from')
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--groups', type=int, default=10)
+    parser.add_argument('--requests', type=int, default=50, help='per scenario (and per client)')
+    parser.add_argument('--concurrency', type=int, default=0,
+                        help='client threads against waitress; 0 runs in-process')
+    parser.add_argument('--threads', type=int, default=8, help='waitress threads')
+    parser.add_argument('--scenario', action='append', help='only run these scenarios')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write results JSON here')
+    parser.add_argument('--baseline', help='compare against this results JSON')
+    parser.add_argument('--threshold', type=float, default=10.0)
+    args = parser.parse_args(argv[1:])
+
+    scenarios = [s for s in SCENARIOS if not args.scenario or s[0] in args.scenario]
+    context = Context(args.posts, args.users, args.groups, args.seed)
+    directory = tempfile.mkdtemp()
+    try:
+        app = build_app(args.config, directory, args)
+        if args.concurrency:
+            results = run_concurrent(app, context, scenarios, args.requests,
+                                     args.concurrency, args.threads)
+        else:
+            results = run_inprocess(app, context, scenarios, args.requests)
+    finally:
+        shutil.rmtree(directory)
+
+    print('%-18s %8s %9s %8s %8s %8s %8s' % (
+        'scenario', 'requests', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'queries'))
+    for name, _, _, _ in scenarios:
+        r = results[name]
+        print('%-18s %8d %9.1f %8.2f %8.2f %8.2f %8.1f' % (
+            name, r['requests'], r['req_per_sec'], r['p50_ms'], r['p95_ms'],
+            r['p99_ms'], r['queries_per_request']))
+
+    report = {'meta': {'revision': git_revision(),
+                       'date': datetime.utcnow().isoformat(),
+                       'config': args.config,
+                       'posts': args.posts,
+                       'users': args.users,
+                       'groups': args.groups,
+                       'requests': args.requests,
+                       'concurrency': args.concurrency},
+              'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, report['meta'], baseline, args.threshold):
+            return 1
+    return 0
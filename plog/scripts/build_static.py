@@ -0,0 +1,257 @@
+""" Render the public pages of the blog to a directory of static files.
+
+The home listing and every post page are rendered with the application's
+own templates and routes, as an anonymous visitor would see them, and
+``plog:static`` is copied alongside.  A front-end server can then answer
+the read path from the directory and pass everything else to Plog.
+
+Builds are incremental.  ``.plog-manifest.json`` in the output directory
+records a hash of each file's inputs: the rows it shows, plus a
+fingerprint of the templates, the static files, the renderer version and
+the base URL.  Only files whose inputs changed are rendered again, and
+files of deleted or renamed posts are removed.  Changed posts are
+rendered by a pool of ``--jobs`` processes, each with its own copy of
+the application.
+
+Pages are written as::
+
+    index.html                 /
+    home/after-<id>.html       /?after=<id>
+    home/before-<id>.html      /?before=<id>
+    post/<slug>.html           /post/<slug>
+    static/...                 /static/...
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import transaction
+from pkg_resources import resource_filename
+from pyramid.paster import (
+    get_appsettings,
+    setup_logging,
+)
+from pyramid.renderers import render
+from pyramid.request import Request
+from pyramid.scripting import prepare
+from sqlalchemy import select
+from sqlalchemy.orm import undefer
+
+from plog.assets import file_token, static_root
+from plog.db import make_engine
+from plog.models import DBSession, Post
+from plog.pagination import DEFAULT_PAGE_SIZE, Page
+from plog.rendering import RENDERER_VERSION, is_stale, render_markdown
+from plog.templating import DIRECTORY, PACKAGE
+
+MANIFEST = '.plog-manifest.json'
+PROJECT = 'Plog'
+# Columns the home and post templates show, besides the body.
+LISTING = ('id', 'version', 'title', 'slug', 'summary', 'reading_time')
+
+
+def _digest(*parts):
+    return hashlib.sha1(json.dumps(parts, default=str).encode('utf-8')).hexdigest()
+
+
+def _tree_digest(root):
+    digest = hashlib.sha1()
+    for directory, dirs, names in os.walk(root):
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(directory, name)
+            digest.update(os.path.relpath(path, root).encode('utf-8'))
+            digest.update(file_token(path).encode('ascii'))
+    return digest.hexdigest()
+
+
+def fingerprint(base_url, page_size):
+    """ Everything every page depends on besides its own rows. """
+    return _digest(RENDERER_VERSION, base_url, page_size,
+                   _tree_digest(resource_filename(PACKAGE, DIRECTORY)),
+                   _tree_digest(static_root()))
+
+
+def load_manifest(output):
+    try:
+        with open(os.path.join(output, MANIFEST)) as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return {}
+
+
+def write_file(output, path, data):
+    """ Atomically replace ``output/path`` with ``data``. """
+    target = os.path.join(output, path)
+    directory = os.path.dirname(target)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, target)
+
+
+def plan(engine, base, page_size):
+    """ ``{path: (input hash, job)}`` for every page of the site, where a
+    job is ``('post', id)`` or ``('home', items, next, prev)``.
+    """
+    table = Post.__table__
+    rows = [dict(zip(LISTING, row)) for row in engine.execute(
+        select([table.c[c] for c in LISTING]).order_by(table.c.id))]
+    pages = {}
+    for row in rows:
+        pages['post/%s.html' % row['slug']] = (_digest(base, row), ('post', row['id']))
+    chunks = [rows[i:i + page_size] for i in range(0, len(rows), page_size)] or [[]]
+    for n, items in enumerate(chunks):
+        more = n + 1 < len(chunks)
+        job = ('home', items, items[-1]['id'] if more else None,
+               items[0]['id'] if n else None)
+        paths = ['index.html'] if not n else ['home/after-%d.html' % chunks[n - 1][-1]['id']]
+        if more:
+            paths.append('home/before-%d.html' % chunks[n + 1][0]['id'])
+        for path in paths:
+            pages[path] = (_digest(base, job), job)
+    return pages
+
+
+_worker = {}
+
+
+def init_worker(settings, base_url):
+    """ Build the application once per worker process. """
+    from plog import main
+    # Pages are rendered by id; the slug map would only cost startup time.
+    app = main({}, **dict(settings, **{'plog.slug_map.warm': 'false'}))
+    _worker['env'] = prepare(request=Request.blank('/', base_url=base_url),
+                             registry=app.registry)
+
+
+def _values(**values):
+    values.update(project=PROJECT, logged_in=None)
+    return values
+
+
+def render_jobs(output, jobs):
+    """ Render ``[(path, job)]`` into ``output``; returns the paths written. """
+    request = _worker['env']['request']
+    posts = [job[1] for path, job in jobs if job[0] == 'post']
+    by_id = {}
+    try:
+        if posts:
+            query = DBSession.query(Post).options(undefer(Post.body_html)).\
+                filter(Post.id.in_(posts))
+            by_id = dict((post.id, post) for post in query)
+        written = []
+        for path, job in jobs:
+            if job[0] == 'post':
+                post = by_id.get(job[1])
+                if post is None:
+                    continue
+                # A build is read-only; plog_render_posts stores stale HTML.
+                html = render_markdown(post.body) if is_stale(post) else post.body_html
+                body = render('templates/post.jinja2',
+                              _values(post=post, body_html=html), request=request)
+            else:
+                _, items, next, prev = job
+                body = render('templates/home.jinja2',
+                              _values(posts=Page(items, next=next, prev=prev)), request=request)
+            write_file(output, path, body.encode('utf-8'))
+            written.append(path)
+        return written
+    finally:
+        transaction.abort()
+        DBSession.remove()
+
+
+def copy_static(output, manifest, files):
+    """ Copy changed files of ``plog:static`` into ``output/static``. """
+    copied = []
+    root = static_root()
+    for directory, _, names in os.walk(root):
+        for name in names:
+            source = os.path.join(directory, name)
+            path = os.path.join('static', os.path.relpath(source, root))
+            files[path] = token = file_token(source)
+            if manifest.get(path) != token or not os.path.exists(os.path.join(output, path)):
+                os.makedirs(os.path.dirname(os.path.join(output, path)), exist_ok=True)
+                shutil.copy2(source, os.path.join(output, path))
+                copied.append(path)
+    return copied
+
+
+def _chunks(items, jobs):
+    size = max(1, min(200, len(items) // (jobs * 4) or 1))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def build_static(settings, output, base_url, jobs=1, everything=False):
+    """ Bring ``output`` up to date; returns counts of what was done. """
+    page_size = int(settings.get('plog.page_size', DEFAULT_PAGE_SIZE))
+    manifest = load_manifest(output)
+    base = fingerprint(base_url, page_size)
+    old = manifest.get('files', {}) if not everything else {}
+    engine = make_engine(settings)
+    try:
+        pages = plan(engine, base, page_size)
+    finally:
+        # Don't hand open connections to forked workers.
+        engine.dispose()
+    todo = [(path, job) for path, (digest, job) in sorted(pages.items())
+            if old.get(path) != digest or not os.path.exists(os.path.join(output, path))]
+
+    written = []
+    if todo and jobs > 1:
+        chunks = _chunks(todo, jobs)
+        with ProcessPoolExecutor(jobs, initializer=init_worker,
+                                 initargs=(settings, base_url)) as pool:
+            for paths in pool.map(render_jobs, [output] * len(chunks), chunks):
+                written.extend(paths)
+    elif todo:
+        init_worker(settings, base_url)
+        try:
+            written = render_jobs(output, todo)
+        finally:
+            _worker.pop('env')['closer']()
+
+    files = dict((path, digest) for path, (digest, job) in pages.items())
+    copied = copy_static(output, old, files)
+    removed = 0
+    for path in set(old) - set(files):
+        try:
+            os.remove(os.path.join(output, path))
+            removed += 1
+        except OSError:
+            pass
+    write_file(output, MANIFEST, json.dumps({'files': files}, indent=0, sort_keys=True).
+               encode('utf-8'))
+    return {'pages': len(pages),
+            'written': len(written),
+            'unchanged': len(pages) - len(todo),
+            'removed': removed,
+            'static': len(copied)}
+
+
+def main(argv=sys.argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('config_uri', help='e.g. production.ini')
+    parser.add_argument('output', help='directory to write the site to')
+    parser.add_argument('--base-url', default='http://localhost',
+                        help='scheme and host the pages link to (default: %(default)s)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='rendering processes (default: %(default)s)')
+    parser.add_argument('--all', action='store_true',
+                        help='render every page, ignoring the manifest')
+    args = parser.parse_args(argv[1:])
+    setup_logging(args.config_uri)
+    start = time.time()
+    result = build_static(dict(get_appsettings(args.config_uri)), args.output,
+                          args.base_url.rstrip('/'), args.jobs, args.all)
+    print('%(pages)d pages: %(written)d written, %(unchanged)d unchanged, '
+          '%(removed)d removed; %(static)d static files copied' % result +
+          ' in %.2fs' % (time.time() - start))
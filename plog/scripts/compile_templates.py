@@ -0,0 +1,26 @@
+import argparse
+import sys
+import time
+
+from pyramid.paster import bootstrap
+from pyramid.settings import asbool
+
+from plog.templating import compile_templates, get_environment
+
+
+def main(argv=sys.argv):
+    parser = argparse.ArgumentParser(
+        description='Fill the Jinja2 bytecode cache with every Plog template.')
+    parser.add_argument('config_uri', help='e.g. production.ini')
+    args = parser.parse_args(argv[1:])
+    env = bootstrap(args.config_uri)
+    try:
+        settings = env['registry'].settings
+        if not asbool(settings.get('jinja2.bytecode_caching')):
+            parser.error('jinja2.bytecode_caching is off in %s' % args.config_uri)
+        start = time.time()
+        count = compile_templates(get_environment(env['registry']))
+        print('compiled %d templates into %s in %.2fs' % (
+            count, settings.get('jinja2.bytecode_caching_directory'), time.time() - start))
+    finally:
+        env['closer']()
@@ -0,0 +1,15 @@
+import argparse
+import sys
+
+from plog.assets import compress_directory, static_root
+
+
+def main(argv=sys.argv):
+    parser = argparse.ArgumentParser(
+        description='Write .gz and .br variants of the static assets.')
+    parser.add_argument('--directory', default=static_root())
+    parser.add_argument('--min-size', type=int, default=1024,
+                        help='leave smaller files uncompressed')
+    args = parser.parse_args(argv[1:])
+    written = compress_directory(args.directory, args.min_size, log=print)
+    print('wrote %d files' % len(written))
@@ -2,13 +2,12 @@ import os
 import sys
 import transaction
 
-from sqlalchemy import engine_from_config
-
 from pyramid.paster import (
     get_appsettings,
     setup_logging,
 )
 
+from plog.db import make_engine
 from plog.models import (
     DBSession,
     Post,
@@ -17,6 +16,7 @@ from plog.models import (
     Permission,
     Base,
 )
+from plog.search import ensure_search_index
 
 
 def usage(argv):
@@ -32,9 +32,10 @@ def main(argv=sys.argv):
     config_uri = argv[1]
     setup_logging(config_uri)
     settings = get_appsettings(config_uri)
-    engine = engine_from_config(settings, 'sqlalchemy.')
+    engine = make_engine(settings)
     DBSession.configure(bind=engine)
     Base.metadata.create_all(engine)
+    ensure_search_index(engine)
     with transaction.manager:
         post = Post(title='Hello World', body='First post of Plog project.')
         DBSession.add(post)
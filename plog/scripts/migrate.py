@@ -0,0 +1,75 @@
+import os
+import sys
+from datetime import datetime
+
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateIndex
+
+from pyramid.paster import (
+    get_appsettings,
+    setup_logging,
+)
+
+from plog.db import make_engine
+from plog.models import Base
+from plog.search import ensure_search_index
+
+# Values for columns added to tables that already hold rows, keyed by
+# (table, column).  Callables are evaluated once per migration run.
+BACKFILL = {
+    ('posts', 'updated_at'): datetime.utcnow,
+    ('posts', 'version'): 1,
+    # Left unrendered: posts render on first view, or all at once with
+    # plog_render_posts.
+    ('posts', 'body_html'): None,
+    ('posts', 'body_html_version'): None,
+    ('posts', 'summary'): None,
+    ('posts', 'word_count'): None,
+    ('posts', 'reading_time'): None,
+}
+
+
+def usage(argv):
+    cmd = os.path.basename(argv[0])
+    print('usage: %s <config_uri>\n'
+          '(example: "%s development.ini")' % (cmd, cmd))
+    sys.exit(1)
+
+
+def upgrade(engine, log=print):
+    """ Bring a database created by an older ``initialize_Plog_db`` up to
+    the current models: create missing tables, add missing columns (and
+    backfill them) and create missing indexes.  Safe to run repeatedly.
+    """
+    Base.metadata.create_all(engine)
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = set(c['name'] for c in inspector.get_columns(table.name))
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                log('Adding column %s.%s' % (table.name, column.name))
+                conn.execute('ALTER TABLE %s ADD COLUMN %s %s' % (
+                    table.name, column.name, column.type.compile(engine.dialect)))
+                value = BACKFILL.get((table.name, column.name))
+                if callable(value):
+                    value = value()
+                if value is not None:
+                    conn.execute(table.update().values({column.name: value}))
+            indexes = set(i['name'] for i in inspector.get_indexes(table.name))
+            for index in table.indexes:
+                if index.name not in indexes:
+                    log('Creating index %s' % index.name)
+                    conn.execute(CreateIndex(index))
+    ensure_search_index(engine)
+
+
+def main(argv=sys.argv):
+    if len(argv) != 2:
+        usage(argv)
+    config_uri = argv[1]
+    setup_logging(config_uri)
+    settings = get_appsettings(config_uri)
+    engine = make_engine(settings)
+    upgrade(engine)
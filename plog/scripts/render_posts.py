@@ -0,0 +1,56 @@
+""" Re-render the stored Markdown HTML and summaries of posts in batches.
+
+Only posts whose ``body_html`` is missing or stamped with an older
+renderer version are touched, unless ``--all`` is given.  Each batch is
+read by primary key after the last one and written back in its own
+transaction, without bumping the post's ``version`` or ``updated_at``.
+"""
+import argparse
+import sys
+
+from pyramid.paster import (
+    get_appsettings,
+    setup_logging,
+)
+from sqlalchemy import bindparam, select
+
+from plog.db import make_engine
+from plog.models import Post
+from plog.rendering import render_post, stale_clause
+from plog.scripts.archive import Progress
+
+
+def render_posts(engine, batch_size=500, everything=False, progress=None):
+    table = Post.__table__
+    columns = ('body_html', 'body_html_version', 'summary', 'word_count', 'reading_time')
+    update = table.update().where(table.c.id == bindparam('post_id')).values(
+        updated_at=table.c.updated_at, **dict((c, bindparam('new_' + c)) for c in columns))
+    last = 0
+    while True:
+        query = select([table.c.id, table.c.body]).where(table.c.id > last)
+        if not everything:
+            query = query.where(stale_clause(table))
+        rows = engine.execute(query.order_by(table.c.id).limit(batch_size)).fetchall()
+        if not rows:
+            return
+        with engine.begin() as conn:
+            conn.execute(update, [
+                dict([('post_id', id)] + [('new_' + k, v) for k, v in render_post(body).items()])
+                for id, body in rows])
+        last = rows[-1][0]
+        if progress is not None:
+            progress.update(len(rows))
+
+
+def main(argv=sys.argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('config_uri', help='e.g. development.ini')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--all', action='store_true',
+                        help='re-render posts that are already up to date too')
+    args = parser.parse_args(argv[1:])
+    setup_logging(args.config_uri)
+    engine = make_engine(get_appsettings(args.config_uri))
+    progress = Progress('rendered')
+    render_posts(engine, args.batch_size, args.all, progress)
+    progress.report(final=True)
@@ -0,0 +1,239 @@
+""" Deterministic synthetic data for scale testing.
+
+Fills an empty database with ``--posts`` posts, ``--users`` users and
+``--groups`` groups.  Everything is drawn from a ``random.Random`` seeded
+with ``--seed``, so the same arguments always build the same database.
+
+Post bodies are Markdown-ish paragraphs whose lengths follow a log-normal
+distribution (median around 2.5k characters, with a long tail), built from
+a Zipf-weighted vocabulary so full-text search sees realistic term
+frequencies.  Titles and slugs are unique and derived from the post number
+(see :func:`post_title` and :func:`post_slug`).  Group sizes are skewed
+the same way, most groups only get ``view``, and every user shares one
+password hash, because hashing millions of passwords is not what is being
+tested.  An ``admin`` user in the ``admins`` group (``edit``) is always
+created.
+
+Rows go in with Core ``executemany`` in ``--batch-size`` transactions.
+On a fresh database the full-text index is built once at the end rather
+than row by row through its triggers.
+"""
+import argparse
+import itertools
+import math
+import random
+import sys
+from datetime import datetime, timedelta
+
+from pyramid.paster import (
+    get_appsettings,
+    setup_logging,
+)
+from sqlalchemy import func, inspect, select
+
+from plog.db import make_engine
+from plog.models import (
+    Base,
+    Post,
+    User,
+    Group,
+    Permission,
+    association_table,
+)
+from plog.passwords import hash_password
+from plog.scripts.archive import Progress
+from plog.search import ensure_search_index
+
+WORDS = """
+the of and to in is that it for was on are as with be at by this have from
+or one had not but what all were when we there can an your which their said
+if do will each about how up out them then she many some so these would other
+into has more her two like him see time could no make than first been its who
+now people my made over did down only way find use may water long little very
+after words called just where most know get through back much before go good
+new write our used me man too any day same right look think also around
+another came come work three word must because does part even place well such
+here take why help put different away again off went old number great tell
+men say small every found still between name should home big give air line set
+own under read last never us left end along while might next sound below saw
+something thought both few those always show large often together asked house
+world going want school important until form food keep children feet land side
+without boy once animal life enough took four head above kind began almost live
+page got earth need far hand high year mother light country father let night
+picture being study second soon story since white ever paper hard near sentence
+better best across during today however sure knew try told young sun thing
+whole hear example heard several change answer room sea against top turned
+learn point city play toward five himself usually money seen car morning
+python pyramid sqlalchemy database query index cache request response server
+template session performance latency throughput benchmark deploy release
+""".split()
+TITLE_ADJECTIVES = ('quick', 'quiet', 'bright', 'hidden', 'simple', 'curious',
+                    'ancient', 'modern', 'gentle', 'bold', 'silent', 'golden')
+TITLE_NOUNS = ('notes', 'thoughts', 'guide', 'journey', 'story', 'lessons',
+               'review', 'diary', 'sketch', 'letter', 'report', 'field')
+FIRST_NAMES = ('alice', 'bob', 'carol', 'dave', 'erin', 'frank', 'grace',
+               'heidi', 'ivan', 'judy', 'mallory', 'oscar', 'peggy', 'trent')
+LAST_NAMES = ('smith', 'jones', 'brown', 'miller', 'davis', 'garcia', 'wilson',
+              'moore', 'taylor', 'clark', 'lewis', 'walker', 'young', 'king')
+TEAMS = ('editors', 'authors', 'reviewers', 'readers', 'moderators', 'guests')
+# Post body lengths in characters: log-normal, clipped.
+BODY_MEDIAN = 2500
+BODY_SIGMA = 0.9
+BODY_MIN = 200
+BODY_MAX = 100000
+SENTENCES = 20000
+# Share of groups that get the ``edit`` permission.
+EDIT_GROUP_RATIO = 0.1
+EPOCH = datetime(2014, 1, 1)
+SPAN_SECONDS = 10 * 365 * 24 * 3600
+
+
+def post_title(n):
+    return '%s %s %s %d' % (TITLE_ADJECTIVES[n % len(TITLE_ADJECTIVES)].capitalize(),
+                            TITLE_NOUNS[n // len(TITLE_ADJECTIVES) % len(TITLE_NOUNS)],
+                            WORDS[n * 7919 % len(WORDS)], n)
+
+
+def post_slug(n):
+    return post_title(n).lower().replace(' ', '-')
+
+
+def username(n):
+    return '%s.%s%d' % (FIRST_NAMES[n % len(FIRST_NAMES)],
+                        LAST_NAMES[n // len(FIRST_NAMES) % len(LAST_NAMES)], n)
+
+
+def group_name(n):
+    return '%s-%d' % (TEAMS[n % len(TEAMS)], n)
+
+
+def zipf_weights(n, s=1.1):
+    """ Cumulative weights for ``random.choices`` favouring low indexes. """
+    return list(itertools.accumulate(1.0 / (i + 1) ** s for i in range(n)))
+
+
+class BodyGenerator(object):
+    """ Builds post bodies from a fixed pool of sentences so millions of
+    posts don't each pay for word-by-word generation.
+    """
+
+    def __init__(self, rnd):
+        self.random = rnd
+        weights = zipf_weights(len(WORDS))
+        self.sentences = []
+        for _ in range(SENTENCES):
+            words = rnd.choices(WORDS, cum_weights=weights, k=rnd.randint(6, 20))
+            words[0] = words[0].capitalize()
+            if rnd.random() < 0.05:
+                words[-1] = '`%s`' % words[-1]
+            elif rnd.random() < 0.05:
+                words[-1] = '[%s](https://example.com/%s)' % (words[-1], words[-1])
+            self.sentences.append(' '.join(words) + '.')
+        self.average = sum(len(s) + 1 for s in self.sentences) / float(SENTENCES)
+
+    def length(self):
+        n = int(self.random.lognormvariate(math.log(BODY_MEDIAN), BODY_SIGMA))
+        return max(BODY_MIN, min(BODY_MAX, n))
+
+    def __call__(self):
+        rnd = self.random
+        sentences = rnd.choices(self.sentences, k=max(1, int(self.length() / self.average)))
+        paragraphs = []
+        for i in range(0, len(sentences), 5):
+            chunk = sentences[i:i + 5]
+            roll = rnd.random()
+            if roll < 0.05:
+                paragraphs.append('## ' + chunk[0].rstrip('.'))
+                chunk = chunk[1:]
+            elif roll < 0.1:
+                paragraphs.append('\n'.join('- ' + s for s in chunk))
+                continue
+            if chunk:
+                paragraphs.append(' '.join(chunk))
+        return '\n\n'.join(paragraphs)
+
+
+def _batches(rows, batch_size):
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _insert(engine, table, rows, batch_size, progress=None):
+    for batch in _batches(rows, batch_size):
+        with engine.begin() as conn:
+            conn.execute(table.insert(), batch)
+        if progress is not None:
+            progress.update(len(batch))
+
+
+def seed_database(engine, posts, users, groups, seed=0, password='admin',
+                  batch_size=10000, progress=None):
+    """ Create the schema if needed and fill it.  The tables must be empty. """
+    rnd = random.Random(seed)
+    fresh = 'posts_fts' not in inspect(engine).get_table_names()
+    Base.metadata.create_all(engine)
+    if engine.execute(select([func.count()]).select_from(Post.__table__)).scalar() or \
+            engine.execute(select([func.count()]).select_from(User.__table__)).scalar():
+        raise ValueError('database is not empty')
+
+    hashed = hash_password(password)
+    with engine.begin() as conn:
+        conn.execute(Permission.__table__.insert(), [{'id': 1, 'name': 'edit'},
+                                                     {'id': 2, 'name': 'view'}])
+        conn.execute(Group.__table__.insert(), [{'id': 1, 'name': 'admins', 'permission_id': 1}])
+        conn.execute(User.__table__.insert(), [{'id': 1, 'username': 'admin', 'password': hashed,
+                                                'email': 'admin@example.com'}])
+        conn.execute(association_table.insert(), [{'users_id': 1, 'groups_id': 1}])
+
+    _insert(engine, Group.__table__, (
+        {'id': n + 2, 'name': group_name(n),
+         'permission_id': 1 if rnd.random() < EDIT_GROUP_RATIO else 2}
+        for n in range(groups)), batch_size)
+    _insert(engine, User.__table__, (
+        {'id': n + 2, 'username': username(n), 'password': hashed,
+         'email': '%s@example.com' % username(n)}
+        for n in range(users)), batch_size)
+    if groups:
+        weights = zipf_weights(groups, 0.8)
+        group_ids = range(2, groups + 2)
+
+        def memberships():
+            for n in range(users):
+                for group_id in set(rnd.choices(group_ids, cum_weights=weights,
+                                                k=rnd.randint(1, 3))):
+                    yield {'users_id': n + 2, 'groups_id': group_id}
+        _insert(engine, association_table, memberships(), batch_size)
+
+    body = BodyGenerator(rnd)
+    _insert(engine, Post.__table__, (
+        {'title': post_title(n), 'slug': post_slug(n), 'body': body(),
+         'updated_at': EPOCH + timedelta(seconds=SPAN_SECONDS * n // max(posts, 1)
+                                         + rnd.randrange(3600))}
+        for n in range(posts)), batch_size, progress)
+    if fresh:
+        ensure_search_index(engine)
+
+
+def main(argv=sys.argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('config_uri', help='e.g. development.ini')
+    parser.add_argument('--posts', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--groups', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--password', default='admin', help='shared by every user')
+    parser.add_argument('--batch-size', type=int, default=10000)
+    args = parser.parse_args(argv[1:])
+    setup_logging(args.config_uri)
+    engine = make_engine(get_appsettings(args.config_uri))
+    progress = Progress('seeded')
+    try:
+        seed_database(engine, args.posts, args.users, args.groups, args.seed,
+                      args.password, args.batch_size, progress)
+    except ValueError as e:
+        parser.error('%s: %s' % (engine.url, e))
+    progress.report(final=True)
@@ -0,0 +1,259 @@
+import math
+import re
+import threading
+import weakref
+from collections import defaultdict
+
+from markupsafe import Markup, escape
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from plog.models import (
+    DBSession,
+    Post,
+)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+# Snippet highlight markers; swapped for <mark> after the text is escaped.
+MARK_OPEN = u'\x02'
+MARK_CLOSE = u'\x03'
+
+FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+    "title, body, content='posts', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN "
+    "INSERT INTO posts_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, body ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO posts_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+
+
+def tokenize(value):
+    return TOKEN_RE.findall(value.lower())
+
+
+def highlight(snippet):
+    return Markup(escape(snippet).replace(MARK_OPEN, Markup('<mark>')).
+                  replace(MARK_CLOSE, Markup('</mark>')))
+
+
+class SearchResult(object):
+    def __init__(self, id, title, slug, snippet, rank):
+        self.id = id
+        self.title = title
+        self.slug = slug
+        self.snippet = highlight(snippet)
+        self.rank = rank
+
+
+def has_fts_table(bind):
+    if bind.dialect.name != 'sqlite':
+        return False
+    return bind.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts_fts'")).first() is not None
+
+
+def ensure_search_index(engine):
+    """ Create the SQLite FTS5 index over posts and the triggers keeping it
+    in sync, filling it from existing rows if it is new.  Returns ``False``
+    when the database can't host it and the in-process index is used.
+    """
+    if engine.dialect.name != 'sqlite':
+        return False
+    with engine.begin() as conn:
+        existed = has_fts_table(conn)
+        try:
+            for statement in FTS_DDL:
+                conn.execute(text(statement))
+        except OperationalError:
+            return False
+        if not existed:
+            conn.execute(text("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')"))
+    _backends.clear()
+    return True
+
+
+class FTSBackend(object):
+    name = 'fts5'
+
+    def search(self, session, terms, limit, offset):
+        match = ' '.join('"%s"' % t for t in terms)
+        rows = session.execute(text(
+            "SELECT p.id, p.title, p.slug, "
+            "snippet(posts_fts, 1, :open, :close, '...', 24) AS snippet, "
+            "bm25(posts_fts, 10.0, 1.0) AS rank "
+            "FROM posts_fts JOIN posts p ON p.id = posts_fts.rowid "
+            "WHERE posts_fts MATCH :match ORDER BY rank LIMIT :limit OFFSET :offset"),
+            {'open': MARK_OPEN, 'close': MARK_CLOSE, 'match': match,
+             'limit': limit, 'offset': offset})
+        return [SearchResult(*row) for row in rows]
+
+
+class InvertedIndex(object):
+    """ Pure-Python BM25 index for databases without FTS5.
+
+    Built from the posts table on first use and kept current by the session
+    hooks at the bottom of this module, which apply ORM changes once their
+    transaction commits.  Bulk loads through Core should call
+    :meth:`invalidate`.
+    """
+    name = 'memory'
+    k1 = 1.2
+    b = 0.75
+    title_weight = 10
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.lengths = {}
+        self.tokens = {}
+        self.built = False
+        self._lock = threading.RLock()
+
+    def invalidate(self):
+        with self._lock:
+            self.postings.clear()
+            self.lengths.clear()
+            self.tokens.clear()
+            self.built = False
+
+    def build(self, session):
+        with self._lock:
+            self.invalidate()
+            query = session.query(Post.id, Post.title, Post.body).yield_per(1000)
+            for id, title, body in query:
+                self._add(id, title, body)
+            self.built = True
+
+    def _add(self, id, title, body):
+        counts = defaultdict(int)
+        for token in tokenize(title):
+            counts[token] += self.title_weight
+        for token in tokenize(body):
+            counts[token] += 1
+        for token, n in counts.items():
+            self.postings[token][id] = n
+        self.lengths[id] = sum(counts.values())
+        self.tokens[id] = list(counts)
+
+    def _remove(self, id):
+        self.lengths.pop(id, None)
+        for token in self.tokens.pop(id, ()):
+            docs = self.postings[token]
+            docs.pop(id, None)
+            if not docs:
+                del self.postings[token]
+
+    def update(self, id, title, body):
+        with self._lock:
+            if self.built:
+                self._remove(id)
+                self._add(id, title, body)
+
+    def remove(self, id):
+        with self._lock:
+            if self.built:
+                self._remove(id)
+
+    def rank(self, terms):
+        with self._lock:
+            docs = [self.postings.get(t, {}) for t in terms]
+            if not docs or not all(docs):
+                return []
+            matches = set(docs[0]).intersection(*docs[1:])
+            n = len(self.lengths)
+            avg = float(sum(self.lengths.values())) / n
+            scores = []
+            for id in matches:
+                score = 0.0
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[id] / avg)
+                for postings in docs:
+                    idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                    tf = postings[id]
+                    score += idf * tf * (self.k1 + 1) / (tf + norm)
+                scores.append((-score, id))
+        scores.sort()
+        return scores
+
+    def search(self, session, terms, limit, offset):
+        if not self.built:
+            self.build(session)
+        scores = self.rank(terms)[offset:offset + limit]
+        if not scores:
+            return []
+        rows = dict((row.id, row) for row in session.query(
+            Post.id, Post.title, Post.slug, Post.body).
+            filter(Post.id.in_([id for _, id in scores])))
+        return [SearchResult(id, rows[id].title, rows[id].slug,
+                             make_snippet(rows[id].body, terms), score)
+                for score, id in scores if id in rows]
+
+
+def make_snippet(body, terms, width=160):
+    lowered = body.lower()
+    positions = [lowered.find(t) for t in terms]
+    positions = [p for p in positions if p >= 0]
+    start = max(0, min(positions) - width // 4) if positions else 0
+    snippet = body[start:start + width]
+    pattern = re.compile(r'\b(%s)\b' % '|'.join(re.escape(t) for t in terms),
+                         re.IGNORECASE | re.UNICODE)
+    snippet = pattern.sub(lambda m: MARK_OPEN + m.group(0) + MARK_CLOSE, snippet)
+    if start > 0:
+        snippet = '...' + snippet
+    if start + width < len(body):
+        snippet += '...'
+    return snippet
+
+
+_backends = weakref.WeakKeyDictionary()
+
+
+def get_backend(session):
+    """ The search backend for the engine ``session`` is bound to. """
+    bind = session.get_bind()
+    backend = _backends.get(bind)
+    if backend is None:
+        backend = _backends[bind] = FTSBackend() if has_fts_table(bind) else InvertedIndex()
+    return backend
+
+
+def search_posts(terms, limit, offset=0, session=DBSession):
+    if not terms:
+        return []
+    return get_backend(session).search(session, terms, limit, offset)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_post_changes(session, flush_context):
+    changes = session.info.setdefault('plog_search_changes', {})
+    for obj in session.new.union(session.dirty):
+        if isinstance(obj, Post):
+            changes[obj.id] = (obj.title, obj.body)
+    for obj in session.deleted:
+        if isinstance(obj, Post):
+            changes[obj.id] = None
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_post_changes(session):
+    changes = session.info.pop('plog_search_changes', {})
+    if not changes:
+        return
+    index = _backends.get(session.get_bind())
+    if not isinstance(index, InvertedIndex):
+        return
+    for id, change in changes.items():
+        if change is None:
+            index.remove(id)
+        else:
+            index.update(id, *change)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_post_changes(session):
+    session.info.pop('plog_search_changes', None)
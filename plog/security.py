@@ -1,12 +1,123 @@
+import threading
+import time
+from collections import OrderedDict
+
+import transaction
+
+from plog.generations import generation_from_settings
 from plog.models import (
     DBSession,
     User,
+    Group,
 )
 
 
+class PrincipalCache(object):
+    """ Per-process LRU cache of userid -> group names with a TTL.
+
+    A cached value of ``None`` records that the user does not exist, so
+    requests carrying a stale auth ticket don't hit the database either.
+    With a shared ``generation`` (see :mod:`plog.generations`) it is
+    cleared when another worker invalidates.
+    """
+    missing = object()
+    generation = None
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, maxsize=None, ttl=None):
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not None:
+                self.ttl = ttl
+            self._data.clear()
+
+    def get(self, userid):
+        with self._lock:
+            if self.generation is not None and self.generation.changed():
+                self._data.clear()
+            entry = self._data.get(userid)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(userid)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[userid]
+            self.misses += 1
+            return self.missing
+
+    def set(self, userid, groups):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[userid] = (time.monotonic() + self.ttl, groups)
+            self._data.move_to_end(userid)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, userid=None):
+        with self._lock:
+            if userid is None:
+                self._data.clear()
+            else:
+                self._data.pop(userid, None)
+
+    def notify_workers(self):
+        if self.generation is not None:
+            self.generation.bump()
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'size': len(self._data)}
+
+
+principal_cache = PrincipalCache()
+
+
+def configure_principal_cache(settings):
+    principal_cache.configure(
+        maxsize=int(settings.get('plog.principal_cache.size', 1024)),
+        ttl=float(settings.get('plog.principal_cache.ttl', 300)))
+    principal_cache.generation = generation_from_settings(settings, 'principals')
+
+
+def invalidate_principals(userid=None):
+    """ Drop cached groups for ``userid`` (or everyone) now and again once
+    the current transaction commits, so a concurrent request can't re-cache
+    the pre-commit membership.  Other workers drop all of theirs.
+    """
+    def invalidate():
+        principal_cache.invalidate(userid)
+        principal_cache.notify_workers()
+
+    def after_commit(status):
+        if status:
+            invalidate()
+    invalidate()
+    transaction.get().addAfterCommitHook(after_commit)
+
+
+def load_groups(userid):
+    rows = DBSession.query(User.id, Group.name).\
+        outerjoin(User.group).\
+        filter(User.username == userid).all()
+    if not rows:
+        return None
+    return [name for _, name in rows if name is not None]
+
+
 def groupfinder(userid, request):
-    users = [i.username for i in DBSession.query(User).all()]
-    if userid in users:
-        user = DBSession.query(User).filter_by(username=userid).one()
-        groups = [g.name for g in user.group]
-        return groups
\ No newline at end of file
+    groups = principal_cache.get(userid)
+    if groups is principal_cache.missing:
+        groups = load_groups(userid)
+        principal_cache.set(userid, groups)
+    return groups
@@ -0,0 +1,331 @@
+""" Server-side sessions.
+
+The session cookie holds only a random id; the data stays in a store:
+
+``memory``
+    An LRU of at most ``plog.session.max_entries`` sessions in this
+    process.  Only right with a single worker.
+``sqlite``
+    A table in the SQLite file ``plog.session.path``, which every worker
+    on the host can share.
+``cookie``
+    The old unencrypted cookie session, signed with the session secret.
+
+Pyramid only builds ``request.session`` when a view touches it, so other
+requests (static files, the public pages) never reach the store, and a
+request without a session cookie doesn't either.  A session is written
+back only if it changed, or every ``plog.session.renew`` seconds while in
+use, which keeps it from expiring ``plog.session.timeout`` seconds after
+its last write.  Expired sessions are ignored when read and deleted in
+bulk, at most every ``plog.session.sweep_interval`` seconds, by whichever
+request writes next.
+"""
+import binascii
+import json
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from pyramid.interfaces import ISession
+from pyramid.session import (
+    UnencryptedCookieSessionFactoryConfig,
+    manage_accessed,
+    manage_changed,
+)
+from pyramid.settings import asbool
+from zope.interface import implementer
+
+PREFIX = 'plog.session.'
+SESSION_ID = re.compile(r'^[A-Za-z0-9_-]{32}$')
+
+
+def new_session_id():
+    return secrets.token_urlsafe(24)
+
+
+class StoreStats(object):
+    def __init__(self):
+        self.reads = 0
+        self.misses = 0
+        self.writes = 0
+        self.deletes = 0
+        self.swept = 0
+        self.sweeps = 0
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+
+class MemoryStore(object):
+    """ Sessions in a bounded, per-process LRU. """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.stats = StoreStats()
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, id, now):
+        """ ``(expires, created, data)`` of an unexpired session, else
+        ``None``.
+        """
+        with self._lock:
+            self.stats.reads += 1
+            entry = self._data.get(id)
+            if entry is None or entry[0] <= now:
+                self.stats.misses += 1
+                return None
+            self._data.move_to_end(id)
+            return entry[0], entry[1], json.loads(entry[2])
+
+    def set(self, id, created, data, expires):
+        with self._lock:
+            self.stats.writes += 1
+            self._data[id] = (expires, created, json.dumps(data))
+            self._data.move_to_end(id)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, id):
+        with self._lock:
+            self.stats.deletes += 1
+            self._data.pop(id, None)
+
+    def sweep(self, now):
+        with self._lock:
+            expired = [id for id, entry in self._data.items() if entry[0] <= now]
+            for id in expired:
+                del self._data[id]
+            self.stats.sweeps += 1
+            self.stats.swept += len(expired)
+        return len(expired)
+
+
+class SQLiteStore(object):
+    """ Sessions in an SQLite file shared by every worker on the host. """
+
+    def __init__(self, path):
+        self.path = path
+        self.stats = StoreStats()
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS sessions ('
+                               'id TEXT PRIMARY KEY, expires REAL NOT NULL, '
+                               'created REAL NOT NULL, data TEXT NOT NULL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS ix_sessions_expires '
+                               'ON sessions (expires)')
+
+    def _connection(self):
+        # One connection per thread, and per process after a fork.
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode = wal')
+            connection.execute('PRAGMA synchronous = NORMAL')
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    def get(self, id, now):
+        self.stats.reads += 1
+        row = self._connection().execute(
+            'SELECT expires, created, data FROM sessions WHERE id = ? AND expires > ?',
+            (id, now)).fetchone()
+        if row is None:
+            self.stats.misses += 1
+            return None
+        return row[0], row[1], json.loads(row[2])
+
+    def set(self, id, created, data, expires):
+        self.stats.writes += 1
+        self._connection().execute(
+            'INSERT OR REPLACE INTO sessions (id, expires, created, data) VALUES (?, ?, ?, ?)',
+            (id, expires, created, json.dumps(data)))
+
+    def delete(self, id):
+        self.stats.deletes += 1
+        self._connection().execute('DELETE FROM sessions WHERE id = ?', (id,))
+
+    def sweep(self, now):
+        swept = self._connection().execute(
+            'DELETE FROM sessions WHERE expires <= ?', (now,)).rowcount
+        self.stats.sweeps += 1
+        self.stats.swept += swept
+        return swept
+
+
+@implementer(ISession)
+class ServerSession(dict):
+    """ A session whose data lives in ``factory.store``. """
+
+    _dirty = False
+
+    def __init__(self, request, factory, id, state, created, renewed, new):
+        self.request = request
+        self.factory = factory
+        self.id = id
+        self.created = created
+        self.renewed = renewed
+        self.accessed = time.time()
+        self.new = new
+        self._reissue_time = factory.renew
+        self._invalidated = None
+        dict.__init__(self, state)
+
+    def changed(self):
+        if not self._dirty:
+            self._dirty = True
+            self.request.add_response_callback(self._save)
+
+    def invalidate(self):
+        if not self.new:
+            self._invalidated = self.id
+        self.id = None
+        self.new = True
+        self.created = time.time()
+        dict.clear(self)
+        self.changed()
+
+    def _save(self, request, response):
+        self.request = None
+        factory = self.factory
+        if self._invalidated is not None:
+            factory.store.delete(self._invalidated)
+        if self.id is None and not self:
+            # Invalidated and left empty: nothing to keep, and no cookie
+            # to drop unless a stored session was invalidated.
+            if self._invalidated is not None:
+                response.delete_cookie(factory.cookie_name, path=factory.path,
+                                       domain=factory.domain)
+            return
+        if self.id is None or self.new:
+            self.id = self.id or new_session_id()
+            response.set_cookie(factory.cookie_name, self.id, path=factory.path,
+                                domain=factory.domain, secure=factory.secure,
+                                httponly=factory.httponly, samesite=factory.samesite)
+        now = time.time()
+        factory.store.set(self.id, self.created, dict(self), now + factory.timeout)
+        factory.maybe_sweep(now)
+
+    get = manage_accessed(dict.get)
+    __getitem__ = manage_accessed(dict.__getitem__)
+    items = manage_accessed(dict.items)
+    values = manage_accessed(dict.values)
+    keys = manage_accessed(dict.keys)
+    __contains__ = manage_accessed(dict.__contains__)
+    __len__ = manage_accessed(dict.__len__)
+    __iter__ = manage_accessed(dict.__iter__)
+
+    clear = manage_changed(dict.clear)
+    update = manage_changed(dict.update)
+    setdefault = manage_changed(dict.setdefault)
+    pop = manage_changed(dict.pop)
+    popitem = manage_changed(dict.popitem)
+    __setitem__ = manage_changed(dict.__setitem__)
+    __delitem__ = manage_changed(dict.__delitem__)
+
+    @manage_changed
+    def flash(self, msg, queue='', allow_duplicate=True):
+        storage = self.setdefault('_f_' + queue, [])
+        if allow_duplicate or (msg not in storage):
+            storage.append(msg)
+
+    @manage_changed
+    def pop_flash(self, queue=''):
+        return self.pop('_f_' + queue, [])
+
+    @manage_accessed
+    def peek_flash(self, queue=''):
+        return self.get('_f_' + queue, [])
+
+    @manage_changed
+    def new_csrf_token(self):
+        token = binascii.hexlify(os.urandom(20)).decode('ascii')
+        self['_csrft_'] = token
+        return token
+
+    @manage_accessed
+    def get_csrf_token(self):
+        token = self.get('_csrft_', None)
+        if token is None:
+            token = self.new_csrf_token()
+        return token
+
+
+class ServerSessionFactory(object):
+    """ Pyramid session factory over ``store``. """
+
+    def __init__(self, store, cookie_name='plog_session', timeout=86400, renew=None,
+                 sweep_interval=300, path='/', domain=None, secure=False, httponly=True,
+                 samesite='Lax'):
+        self.store = store
+        self.cookie_name = cookie_name
+        self.timeout = timeout
+        self.renew = renew if renew is not None else timeout // 10
+        self.sweep_interval = sweep_interval
+        self.path = path
+        self.domain = domain
+        self.secure = secure
+        self.httponly = httponly
+        self.samesite = samesite
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        id = request.cookies.get(self.cookie_name)
+        now = time.time()
+        found = None
+        if id is not None and SESSION_ID.match(id):
+            found = self.store.get(id, now)
+        if found is None:
+            return ServerSession(request, self, None, {}, now, now, True)
+        expires, created, state = found
+        # Reading it more than ``renew`` seconds after the last write
+        # writes it again, which pushes its expiry back.
+        return ServerSession(request, self, id, state, created,
+                             expires - self.timeout, False)
+
+    def maybe_sweep(self, now):
+        with self._lock:
+            if now < self._next_sweep:
+                return
+            self._next_sweep = now + self.sweep_interval
+        self.store.sweep(now)
+
+
+def session_factory_from_settings(settings):
+    """ The session factory ``plog.session.store`` asks for. """
+    kind = settings.get(PREFIX + 'store', 'memory')
+    if kind == 'cookie':
+        # plog.workers reports the stores' statistics.
+        from plog.workers import get_secret
+        return UnencryptedCookieSessionFactoryConfig(
+            get_secret(settings, 'plog.session_secret'))
+    if kind == 'memory':
+        if asbool(settings.get('plog.prefork')):
+            raise ValueError('plog.session.store = memory is per process; '
+                             'use sqlite with plog.prefork')
+        store = MemoryStore(int(settings.get(PREFIX + 'max_entries', 10000)))
+    elif kind == 'sqlite':
+        store = SQLiteStore(settings[PREFIX + 'path'])
+    else:
+        raise ValueError('Unknown plog.session.store: %r' % kind)
+    timeout = int(settings.get(PREFIX + 'timeout', 86400))
+    renew = settings.get(PREFIX + 'renew')
+    return ServerSessionFactory(
+        store,
+        cookie_name=settings.get(PREFIX + 'cookie_name', 'plog_session'),
+        timeout=timeout,
+        renew=int(renew) if renew else None,
+        sweep_interval=int(settings.get(PREFIX + 'sweep_interval', 300)),
+        secure=asbool(settings.get(PREFIX + 'secure', False)))
+
+
+def get_session_store(registry):
+    factory = getattr(registry, 'session_factory', None)
+    return getattr(factory, 'store', None)
@@ -0,0 +1,225 @@
+import threading
+import time
+from collections import OrderedDict
+
+import transaction
+from pyramid.settings import asbool
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+
+from plog.generations import generation_from_settings
+from plog.models import Post, SlugRedirect
+from plog.replicas import from_replica
+
+
+class SlugMap(object):
+    """ Per-process map of post slugs, current and former, to post ids.
+
+    It is warmed from the database at startup and the post write views
+    drop the slugs they change, but other processes write too, so it is
+    only a hint.  A slug it doesn't know is looked up in the database, and
+    entries expire after ``ttl`` seconds.  Callers load the post by id and
+    :meth:`query` the database before answering with a redirect or a 404
+    on the map's word alone, so a stale entry costs a query, never a wrong
+    answer.  Slugs found in neither table are
+    remembered in a bounded LRU for ``negative_ttl`` seconds, so repeated
+    junk slugs don't reach the database either.  With a shared
+    ``generation`` (see :mod:`plog.generations`) the whole map is dropped
+    when another worker changes slugs.
+    """
+    generation = None
+
+    def __init__(self, ttl=300, negative_size=10000, negative_ttl=60):
+        self.ttl = ttl
+        self.negative_size = negative_size
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.negative_hits = 0
+        self.lookups = 0
+        self._ids = {}
+        self._redirects = {}
+        self._missing = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, ttl=None, negative_size=None, negative_ttl=None):
+        with self._lock:
+            if ttl is not None:
+                self.ttl = ttl
+            if negative_size is not None:
+                self.negative_size = negative_size
+            if negative_ttl is not None:
+                self.negative_ttl = negative_ttl
+            self._missing.clear()
+
+    def warm(self, engine):
+        """ Load every current and former slug. """
+        posts, history = Post.__table__, SlugRedirect.__table__
+        ids = engine.execute(select([posts.c.slug, posts.c.id])).fetchall()
+        redirects = engine.execute(select([history.c.slug, history.c.post_id])).fetchall()
+        expires = self._expires()
+        with self._lock:
+            self._ids = dict((slug, (id, expires)) for slug, id in ids)
+            self._redirects = dict((slug, (id, expires)) for slug, id in redirects)
+            self._missing.clear()
+        return len(ids) + len(redirects)
+
+    unknown = object()
+
+    def _expires(self):
+        return time.monotonic() + self.ttl if self.ttl > 0 else float('inf')
+
+    def lookup(self, slug):
+        """ What the map knows of ``slug`` without asking the database:
+        ``(post id, is_current)``, ``None`` for a known miss, or
+        :attr:`unknown`.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self.generation is not None and self.generation.changed():
+                self._ids.clear()
+                self._redirects.clear()
+                self._missing.clear()
+            for entries, is_current in ((self._ids, True), (self._redirects, False)):
+                entry = entries.get(slug)
+                if entry is not None and entry[1] > now:
+                    self.hits += 1
+                    return entry[0], is_current
+            expires = self._missing.get(slug)
+            if expires is not None and expires > now:
+                self._missing.move_to_end(slug)
+                self.negative_hits += 1
+                return None
+            self.lookups += 1
+            return self.unknown
+
+    def remember(self, slug, found):
+        """ Record the database's answer for a slug :meth:`lookup` didn't know. """
+        if found is None:
+            self.set_missing(slug)
+        elif found[1]:
+            self.set(slug, found[0])
+        else:
+            self.set_redirect(slug, found[0])
+
+    def query(self, session, slug):
+        """ ``(post id, is_current)`` for ``slug`` from the database, or
+        ``None`` if no post has or had it.  Answers read from a replica
+        aren't remembered, as the replica may not have a post created a
+        moment ago yet.
+        """
+        id = session.query(Post.id).filter_by(slug=slug).scalar()
+        if id is not None:
+            found = id, True
+        else:
+            id = session.query(SlugRedirect.post_id).filter_by(slug=slug).scalar()
+            found = (id, False) if id is not None else None
+        if from_replica(session):
+            self.forget(slug)
+        else:
+            self.remember(slug, found)
+        return found
+
+    def set(self, slug, id):
+        expires = self._expires()
+        with self._lock:
+            self._ids[slug] = id, expires
+            self._redirects.pop(slug, None)
+            self._missing.pop(slug, None)
+
+    def set_redirect(self, slug, id):
+        expires = self._expires()
+        with self._lock:
+            self._redirects[slug] = id, expires
+            self._ids.pop(slug, None)
+            self._missing.pop(slug, None)
+
+    def set_missing(self, slug):
+        if self.negative_size <= 0:
+            return
+        with self._lock:
+            self._missing[slug] = time.monotonic() + self.negative_ttl
+            self._missing.move_to_end(slug)
+            while len(self._missing) > self.negative_size:
+                self._missing.popitem(last=False)
+
+    def forget(self, *slugs):
+        with self._lock:
+            for slug in slugs:
+                self._ids.pop(slug, None)
+                self._redirects.pop(slug, None)
+                self._missing.pop(slug, None)
+
+    def notify_workers(self):
+        if self.generation is not None:
+            self.generation.bump()
+
+    def clear(self):
+        with self._lock:
+            self._ids.clear()
+            self._redirects.clear()
+            self._missing.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'slugs': len(self._ids),
+                    'redirects': len(self._redirects),
+                    'missing': len(self._missing),
+                    'hits': self.hits,
+                    'negative_hits': self.negative_hits,
+                    'lookups': self.lookups}
+
+
+slug_map = SlugMap()
+
+
+def configure_slug_map(settings, engine, warm=True):
+    slug_map.configure(
+        ttl=float(settings.get('plog.slug_map.ttl', 300)),
+        negative_size=int(settings.get('plog.slug_map.negative_size', 10000)),
+        negative_ttl=float(settings.get('plog.slug_map.negative_ttl', 60)))
+    slug_map.generation = generation_from_settings(settings, 'slugs')
+    if warm:
+        warm_slug_map(settings, engine)
+
+
+def warm_slug_map(settings, engine):
+    if asbool(settings.get('plog.slug_map.warm', True)):
+        try:
+            slug_map.warm(engine)
+        except DBAPIError:
+            # No tables yet; the map fills in as slugs are looked up.
+            pass
+
+
+def invalidate_slugs(*slugs):
+    """ Forget ``slugs`` now and again once the current transaction
+    commits; the next lookup of each goes to the database.  Other workers
+    drop their whole map.
+    """
+    def invalidate():
+        slug_map.forget(*slugs)
+        slug_map.notify_workers()
+
+    def after_commit(status):
+        if status:
+            invalidate()
+    invalidate()
+    transaction.get().addAfterCommitHook(after_commit)
+
+
+def claim_slugs(session, *slugs):
+    """ Drop the redirects that posts taking ``slugs`` would shadow. """
+    session.query(SlugRedirect).filter(SlugRedirect.slug.in_(slugs)).\
+        delete(synchronize_session=False)
+
+
+def rename_post(session, post, slug, claim=True):
+    """ Move ``post`` to ``slug``, keeping its old slug as a redirect.
+    Pass ``claim=False`` if the caller claims the new slug itself.
+    """
+    if slug == post.slug:
+        return
+    if claim:
+        claim_slugs(session, slug)
+    session.add(SlugRedirect(post.slug, post.id))
+    post.slug = slug
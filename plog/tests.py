@@ -14,6 +14,8 @@ def _init_testing_db():
         User,
         Base
     )
+    from .slugs import slug_map
+    slug_map.clear()
     engine = create_engine('sqlite://')
     Base.metadata.create_all(engine)
     DBSession.configure(bind=engine)
@@ -33,8 +35,12 @@ def _init_testing_db():
 def _register_routes(config):
     config.add_route('home', '/')
     config.add_route('login', '/login')
+    config.add_route('search', '/search')
+    config.add_route('feed_atom', '/feed.atom')
+    config.add_route('feed_rss', '/feed.rss')
     config.add_route('logout', '/logout')
     config.add_route('admin', '/admin')
+    config.add_route('metrics', '/admin/metrics')
     config.add_route('add_post', '/post/add')
     config.add_route('add_user', '/user/add')
     config.add_route('add_group', '/group/add')
@@ -45,6 +51,55 @@ def _register_routes(config):
     config.add_route('edit_post', '/post/edit/{slug}')
     config.add_route('delete_post', '/post/del/{slug}')
     config.add_route('post', '/post/{slug}')
+    config.add_route('api_posts', '/api/v1/posts')
+    config.add_route('api_posts_batch', '/api/v1/posts/batch')
+    config.add_route('api_post', '/api/v1/posts/{slug}')
+    config.add_route('api_users', '/api/v1/users')
+    config.add_route('api_user', '/api/v1/users/{username}')
+    config.add_route('api_groups', '/api/v1/groups')
+    config.add_route('api_group', '/api/v1/groups/{name}')
+
+
+def _render_settings():
+    return {'jinja2.filters': 'route_url = pyramid_jinja2.filters:route_url_filter\n'
+                              'static_url = pyramid_jinja2.filters:static_url_filter'}
+
+
+def _setup_renderer(config):
+    config.include('pyramid_jinja2')
+    config.add_jinja2_search_path('plog:templates')
+    config.add_static_view('static', 'plog:static')
+
+
+class _QueryBudget(object):
+    """ Fails ``test`` if the block runs more than ``limit`` SQL statements.
+
+        with _QueryBudget(self, 3):
+            render_the_view()
+    """
+
+    def __init__(self, test, limit):
+        from .models import DBSession
+        self.test = test
+        self.limit = limit
+        self.engine = DBSession.bind
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        from sqlalchemy import event
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        from sqlalchemy import event
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+        if exc_type is None:
+            self.test.assertLessEqual(
+                len(self.statements), self.limit,
+                'query budget of %d exceeded:\n%s' % (self.limit, '\n'.join(self.statements)))
 
 
 class PostModelTests(unittest.TestCase):
@@ -479,4 +534,1922 @@ class AdminViewTests(unittest.TestCase):
         response = self._call_fut(request)
         self.assertEqual(len(response['posts']), 1)
         self.assertIsNotNone(response['users'])
-        self.assertIsNotNone(response['groups'])
\ No newline at end of file
+        self.assertIsNotNone(response['groups'])
+
+
+class GroupfinderTests(unittest.TestCase):
+    def setUp(self):
+        from .security import principal_cache
+        self.session = _init_testing_db()
+        self.config = testing.setUp()
+        self.cache = principal_cache
+        self.cache.configure(maxsize=10, ttl=60)
+
+    def tearDown(self):
+        self.cache.invalidate()
+        self.session.remove()
+        testing.tearDown()
+
+    @staticmethod
+    def _call_fut(userid):
+        from .security import groupfinder
+        return groupfinder(userid, testing.DummyRequest())
+
+    def test_it(self):
+        self.assertEqual(self._call_fut('test_user'), ['A group'])
+        self.assertIsNone(self._call_fut('nobody'))
+
+    def test_cached(self):
+        self._call_fut('test_user')
+        self._call_fut('test_user')
+        stats = self.cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_lru_eviction(self):
+        self.cache.configure(maxsize=1)
+        self.cache.set('a', ['x'])
+        self.cache.set('b', ['y'])
+        self.assertIs(self.cache.get('a'), self.cache.missing)
+        self.assertEqual(self.cache.get('b'), ['y'])
+
+    def test_ttl_expiry(self):
+        self.cache.configure(ttl=-1)
+        self.cache.set('a', ['x'])
+        self.assertIs(self.cache.get('a'), self.cache.missing)
+
+    def test_invalidated_by_del_group(self):
+        from .views import del_group
+        _register_routes(self.config)
+        self._call_fut('test_user')
+        request = testing.DummyRequest()
+        request.matchdict['group_name'] = 'A group'
+        del_group(request)
+        self.assertEqual(self._call_fut('test_user'), [])
+
+    def test_invalidated_by_edit_user(self):
+        from .views import edit_user
+        _register_routes(self.config)
+        self._call_fut('test_user')
+        self._call_fut('new_username')
+        request = testing.DummyRequest()
+        request.method = 'POST'
+        request.params['csrf_token'] = request.session.get_csrf_token()
+        request.params['username'] = 'new_username'
+        request.params['email'] = 'new_mail@example.com'
+        request.params['group_name'] = 'A group'
+        request.matchdict['username'] = 'test_user'
+        edit_user(request)
+        self.assertIsNone(self._call_fut('test_user'))
+        self.assertEqual(self._call_fut('new_username'), ['A group'])
+
+
+class KeysetPageTests(unittest.TestCase):
+    def setUp(self):
+        from .models import Post
+        self.session = _init_testing_db()
+        with transaction.manager:
+            for i in range(2, 8):
+                self.session.add(Post('Post %d' % i, 'body'))
+
+    def tearDown(self):
+        self.session.remove()
+
+    def _call_fut(self, **kw):
+        from .models import Post
+        from .pagination import keyset_page
+        query = self.session.query(Post.id, Post.title, Post.slug)
+        return keyset_page(query, Post.id, limit=3, **kw)
+
+    def test_first_page(self):
+        page = self._call_fut()
+        self.assertEqual([p.id for p in page], [1, 2, 3])
+        self.assertIsNone(page.prev)
+        self.assertEqual(page.next, 3)
+
+    def test_after(self):
+        page = self._call_fut(after=3)
+        self.assertEqual([p.id for p in page], [4, 5, 6])
+        self.assertEqual(page.prev, 4)
+        self.assertEqual(page.next, 6)
+
+    def test_last_page(self):
+        page = self._call_fut(after=6)
+        self.assertEqual([p.id for p in page], [7])
+        self.assertIsNone(page.next)
+
+    def test_before(self):
+        page = self._call_fut(before=4)
+        self.assertEqual([p.id for p in page], [1, 2, 3])
+        self.assertIsNone(page.prev)
+        self.assertEqual(page.next, 3)
+
+    def test_int_param_range(self):
+        from .pagination import int_param
+        request = testing.DummyRequest(params={'after': '9' * 30, 'before': str(2 ** 63 - 1)})
+        self.assertIsNone(int_param(request, 'after'))
+        self.assertEqual(int_param(request, 'before'), 2 ** 63 - 1)
+
+    def test_home_view_page_size(self):
+        from .views import home_view
+        config = testing.setUp(settings={'plog.page_size': '2'})
+        _register_routes(config)
+        request = testing.DummyRequest(params={'after': '2'})
+        response = home_view(request)
+        self.assertEqual([p.slug for p in response['posts']], ['post-3', 'post-4'])
+        testing.tearDown()
+
+
+class PageCacheTests(unittest.TestCase):
+    def setUp(self):
+        from .cache import PageCache, MemoryBackend
+        self.session = _init_testing_db()
+        self.config = testing.setUp()
+        _register_routes(self.config)
+        self.cache = self.config.registry.page_cache = PageCache(MemoryBackend())
+
+    def tearDown(self):
+        self.session.remove()
+        testing.tearDown()
+
+    @staticmethod
+    def _make_view(body='page'):
+        from pyramid.response import Response
+        from .cache import cached_page, slug_key
+        calls = []
+
+        def view(context, request):
+            calls.append(request)
+            return Response(body)
+        return cached_page('post', slug_key)(view), calls
+
+    @staticmethod
+    def _make_request(slug='test-post'):
+        request = testing.DummyRequest()
+        request.matchdict['slug'] = slug
+        return request
+
+    def test_hit(self):
+        view, calls = self._make_view()
+        self.assertEqual(view(None, self._make_request()).headers['X-Cache'], 'MISS')
+        response = view(None, self._make_request())
+        self.assertEqual(response.headers['X-Cache'], 'HIT')
+        self.assertEqual(response.body, b'page')
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.cache.hit_ratio, 0.5)
+
+    def test_keyed_by_login_state(self):
+        view, calls = self._make_view()
+        view(None, self._make_request())
+        self.config.testing_securitypolicy(userid='test_user')
+        view(None, self._make_request())
+        self.assertEqual(len(calls), 2)
+
+    def test_keyed_by_host(self):
+        from .cache import invalidate_posts
+        view, calls = self._make_view()
+        for host_url in ('http://evil.example', 'http://example.com', 'http://example.com'):
+            request = self._make_request()
+            request.host_url = host_url
+            view(None, request)
+        self.assertEqual(len(calls), 2)
+        invalidate_posts(self._make_request(), 'test-post')
+        self.assertEqual(self.cache.backend._data, {})
+
+    def test_edit_post_invalidates_old_slug(self):
+        from .views import edit_post
+        view, calls = self._make_view()
+        view(None, self._make_request('test-post'))
+        request = self._make_request('test-post')
+        request.method = 'POST'
+        request.params['title'] = 'New Title'
+        request.params['body'] = 'New body'
+        edit_post(request)
+        view(None, self._make_request('test-post'))
+        self.assertEqual(len(calls), 2)
+
+    def test_listing_key_ignores_other_parameters(self):
+        from pyramid.response import Response
+        from .cache import cached_page
+        calls = []
+        view = cached_page('home')(lambda context, request: calls.append(1) or Response('x'))
+        for params in ({}, {'junk': '1'}, {'junk': '2', 'limit': 'x'}, {'limit': '20'},
+                       {'after': '5', 'before': '9'}, {'before': '9', 'utm': 'a'}):
+            view(None, testing.DummyRequest(params=params))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(self.cache.backend._data), 2)
+
+    def test_memory_backend_byte_budget(self):
+        from .cache import MemoryBackend, CachedPage
+        backend = MemoryBackend(max_bytes=10)
+        backend.set('post', 'a', CachedPage('200 OK', [], b'123456'))
+        backend.set('post', 'b', CachedPage('200 OK', [], b'123456'))
+        self.assertIsNone(backend.get('post', 'a'))
+        self.assertEqual(backend.get('post', 'b').body, b'123456')
+        self.assertEqual(backend.bytes, 6)
+
+    def test_file_backend(self):
+        import tempfile
+        import shutil
+        from .cache import FileBackend, CachedPage
+        directory = tempfile.mkdtemp()
+        try:
+            backend = FileBackend(directory)
+            backend.set('home', 'anon|', CachedPage('200 OK', [('Content-Type', 'text/html')], b'x\ny'))
+            page = backend.get('home', 'anon|')
+            self.assertEqual(page.headers, [('Content-Type', 'text/html')])
+            self.assertEqual(page.body, b'x\ny')
+            backend.clear('home')
+            self.assertIsNone(backend.get('home', 'anon|'))
+        finally:
+            shutil.rmtree(directory)
+
+
+class ConditionalGetTests(unittest.TestCase):
+    def setUp(self):
+        self.session = _init_testing_db()
+        self.config = testing.setUp()
+        _register_routes(self.config)
+
+    def tearDown(self):
+        self.session.remove()
+        testing.tearDown()
+
+    @staticmethod
+    def _call_fut(request):
+        from .views import post_view
+        return post_view(request)
+
+    def _make_request(self, **headers):
+        request = testing.DummyRequest(headers=headers)
+        request.matchdict['slug'] = 'test-post'
+        return request
+
+    def test_validators(self):
+        request = self._make_request()
+        self._call_fut(request)
+        self.assertTrue(request.response.etag)
+        self.assertIsNotNone(request.response.last_modified)
+
+    def test_if_none_match(self):
+        request = self._make_request()
+        self._call_fut(request)
+        etag = request.response.headers['ETag']
+        response = self._call_fut(self._make_request(**{'If-None-Match': etag}))
+        self.assertEqual(response.status_int, 304)
+        response = self._call_fut(self._make_request(**{'If-None-Match': '"other"'}))
+        self.assertEqual(response['post'].title, 'Test Post')
+
+    def test_if_modified_since(self):
+        request = self._make_request()
+        self._call_fut(request)
+        since = request.response.headers['Last-Modified']
+        response = self._call_fut(self._make_request(**{'If-Modified-Since': since}))
+        self.assertEqual(response.status_int, 304)
+
+    def test_edit_changes_etag(self):
+        from .models import Post
+        request = self._make_request()
+        self._call_fut(request)
+        etag = request.response.etag
+        post = self.session.query(Post).filter_by(slug='test-post').one()
+        post.body = 'Changed'
+        self.session.flush()
+        self.assertEqual(post.version, 2)
+        request = self._make_request()
+        self._call_fut(request)
+        self.assertNotEqual(request.response.etag, etag)
+
+    def test_home(self):
+        from .views import home_view
+        request = testing.DummyRequest()
+        home_view(request)
+        etag = request.response.headers['ETag']
+        response = home_view(testing.DummyRequest(headers={'If-None-Match': etag}))
+        self.assertEqual(response.status_int, 304)
+
+
+class MigrateTests(unittest.TestCase):
+    def test_upgrade(self):
+        from sqlalchemy import create_engine, inspect
+        from .scripts.migrate import upgrade
+        engine = create_engine('sqlite://')
+        engine.execute('CREATE TABLE posts (id INTEGER PRIMARY KEY, title TEXT NOT NULL UNIQUE, '
+                       'slug TEXT NOT NULL UNIQUE, body TEXT NOT NULL)')
+        engine.execute("INSERT INTO posts (title, slug, body) VALUES ('T', 't', 'b')")
+        upgrade(engine, log=lambda msg: None)
+        upgrade(engine, log=lambda msg: None)
+        columns = set(c['name'] for c in inspect(engine).get_columns('posts'))
+        self.assertTrue(set(['updated_at', 'version']) <= columns)
+        row = engine.execute('SELECT version, updated_at FROM posts').first()
+        self.assertEqual(row.version, 1)
+        self.assertIsNotNone(row.updated_at)
+
+
+class QueryBudgetTests(unittest.TestCase):
+    def setUp(self):
+        from .models import Permission, Group, User, association_table
+        self.session = _init_testing_db()
+        self.config = testing.setUp(settings=_render_settings())
+        _register_routes(self.config)
+        _setup_renderer(self.config)
+        with transaction.manager:
+            for i in range(5):
+                group = Group('group %d' % i, Permission('permission %d' % i))
+                self.session.add(group)
+                self.session.flush()
+                user_id = self.session.execute(User.__table__.insert().values(
+                    username='user%d' % i, password='x',
+                    email='user%d@example.com' % i)).lastrowid
+                self.session.execute(association_table.insert().values(
+                    users_id=user_id, groups_id=group.id))
+
+    def tearDown(self):
+        self.session.remove()
+        testing.tearDown()
+
+    def _render(self, view, template, **matchdict):
+        from pyramid.renderers import render
+        request = testing.DummyRequest()
+        request.matchdict.update(matchdict)
+        return render(template, view(request), request)
+
+    def test_admin(self):
+        from .views import admin
+        with _QueryBudget(self, 4):
+            html = self._render(admin, 'admin.jinja2')
+        self.assertIn('permission 4', html)
+
+    def test_profile(self):
+        from .views import profile
+        with _QueryBudget(self, 1):
+            html = self._render(profile, 'profile.jinja2', username='user3')
+        self.assertIn('group 3', html)
+
+    def test_edit_user(self):
+        from .views import edit_user
+        with _QueryBudget(self, 2):
+            self._render(edit_user, 'edit_user.jinja2', username='user3')
+
+
+class MetricsTests(unittest.TestCase):
+    def setUp(self):
+        from .metrics import metrics
+        self.session = _init_testing_db()
+        self.config = testing.setUp()
+        _register_routes(self.config)
+        self.metrics = metrics
+        self.metrics.reset()
+
+    def tearDown(self):
+        self.metrics.reset()
+        self.session.remove()
+        testing.tearDown()
+
+    def test_histogram(self):
+        from .metrics import Histogram
+        histogram = Histogram()
+        for value in range(1, 101):
+            histogram.add(value)
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.percentile(50), 50)
+        self.assertEqual(histogram.percentile(99), 100)
+
+    def test_tween(self):
+        from pyramid.response import Response
+        from .metrics import timing_tween_factory, instrument_engine
+        from .models import Post
+        instrument_engine(self.session.bind)
+
+        def handler(request):
+            self.session.query(Post).all()
+            return Response('ok')
+        request = testing.DummyRequest()
+        request.matched_route = self.config.get_routes_mapper().get_route('home')
+        response = timing_tween_factory(handler, self.config.registry)(request)
+        self.assertNotIn('Server-Timing', response.headers)
+        self.config.registry.settings['plog.metrics.server_timing'] = 'true'
+        response = timing_tween_factory(handler, self.config.registry)(request)
+        self.assertIn('desc="1 queries"', response.headers['Server-Timing'])
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot['home']['queries']['max'], 1)
+        self.assertEqual(snapshot['home']['total_ms']['count'], 2)
+
+    def test_view(self):
+        from .views import metrics_view
+        response = metrics_view(testing.DummyRequest())
+        self.assertEqual(response['routes'], {})
+        self.assertIn('hits', response['principal_cache'])
+        self.assertIsNone(response['page_cache'])
+
+
+class SearchTests(unittest.TestCase):
+    def setUp(self):
+        from .models import Post
+        self.session = _init_testing_db()
+        self.config = testing.setUp()
+        _register_routes(self.config)
+        with transaction.manager:
+            self.session.add(Post('Python tips', 'Use generators for <large> data sets.'))
+            self.session.add(Post('Cooking', 'A recipe that mentions python once.'))
+
+    def tearDown(self):
+        self.session.remove()
+        testing.tearDown()
+
+    @staticmethod
+    def _call_fut(request):
+        from .views import search_view
+        return search_view(request)
+
+    def _search(self, q, **params):
+        params['q'] = q
+        return self._call_fut(testing.DummyRequest(params=params))['results']
+
+    def _check_backend(self, name):
+        from .search import get_backend
+        self.assertEqual(get_backend(self.session).name, name)
+        results = self._search('python')
+        self.assertEqual([r.slug for r in results], ['python-tips', 'cooking'])
+        self.assertIn('<mark>python</mark>', results.items[1].snippet)
+        self.assertEqual([r.slug for r in self._search('large generators')], ['python-tips'])
+        self.assertIn('&lt;<mark>large</mark>&gt;', self._search('large').items[0].snippet)
+        self.assertEqual(len(self._search('missing')), 0)
+        page = self._search('python', limit='1', page='2')
+        self.assertEqual([r.slug for r in page], ['cooking'])
+        self.assertEqual(page.prev, 1)
+        self.assertIsNone(page.next)
+
+    def test_memory_index(self):
+        self._check_backend('memory')
+
+    def test_fts5(self):
+        from .search import ensure_search_index
+        self.assertTrue(ensure_search_index(self.session.bind))
+        self._check_backend('fts5')
+
+    def test_huge_page(self):
+        from .search import ensure_search_index
+        ensure_search_index(self.session.bind)
+        self.assertEqual(len(self._search('python', page=str(2 ** 62))), 0)
+        self.assertEqual(len(self._search('python', limit='1', page=str(2 ** 63 - 1))), 0)
+
+    def test_memory_index_follows_commits(self):
+        from .models import Post
+        self._search('python')
+        with transaction.manager:
+            post = self.session.query(Post).filter_by(slug='cooking').one()
+            post.body = 'No snakes here.'
+            self.session.add(Post('More python', 'body'))
+        self.assertEqual(sorted(r.slug for r in self._search('python')), ['more-python', 'python-tips'])
+
+
+class ArchiveTests(unittest.TestCase):
+    def setUp(self):
+        self.session = _init_testing_db()
+
+    def tearDown(self):
+        self.session.remove()
+
+    def test_parse_markdown(self):
+        from .scripts.archive import parse_markdown, format_markdown
+        record = parse_markdown('---\ntitle: Hello: World\n---\nBody\n\nmore\n')
+        self.assertEqual(record, {'title': 'Hello: World', 'body': 'Body\n\nmore'})
+        record.update(slug='hello-world', updated_at='')
+        self.assertEqual(parse_markdown(format_markdown(record))['body'], 'Body\n\nmore')
+
+    def test_import(self):
+        from .models import Post
+        from .scripts.archive import import_posts
+        records = [{'title': 'Test Post', 'body': 'already there'},
+                   {'title': 'Test Post!', 'body': 'slug collides'},
+                   {'title': 'Fresh', 'body': 'new', 'updated_at': '2014-01-02T03:04:05'},
+                   {'title': 'Fresh', 'body': 'duplicate in batch'}]
+        import_posts(self.session.bind, iter(records), batch_size=3)
+        rows = self.session.query(Post.title, Post.slug, Post.version).order_by(Post.id).all()
+        self.assertEqual([r.slug for r in rows], ['test-post', 'test-post-2', 'fresh'])
+        self.assertEqual(rows[1].version, 1)
+
+    def test_import_mixed_timestamps(self):
+        from datetime import datetime
+        from .models import Post
+        from .scripts.archive import import_posts
+        stamped = {'body': 'x', 'updated_at': '2014-01-02T03:04:05'}
+        records = [dict(stamped, title='A1'), {'title': 'A2', 'body': 'x'},
+                   {'title': 'B1', 'body': 'x'}, dict(stamped, title='B2')]
+        import_posts(self.session.bind, iter(records), batch_size=2)
+        updated = dict(self.session.query(Post.title, Post.updated_at))
+        self.assertEqual(updated['A1'], datetime(2014, 1, 2, 3, 4, 5))
+        self.assertEqual(updated['B2'], datetime(2014, 1, 2, 3, 4, 5))
+        self.assertGreater(updated['A2'], updated['A1'])
+        self.assertGreater(updated['B1'], updated['B2'])
+
+    def test_export(self):
+        import io
+        import json
+        import sys
+        from .scripts.archive import export_records, write_records
+        out = io.StringIO()
+        records = list(export_records(self.session, batch_size=1))
+        self.assertEqual(records[0]['slug'], 'test-post')
+        self.assertTrue(records[0]['updated_at'])
+        stdout, sys.stdout = sys.stdout, out
+        try:
+            write_records(iter(records), '-', 'jsonl')
+        finally:
+            sys.stdout = stdout
+        self.assertEqual(json.loads(out.getvalue())['body'], 'This is the test post')
+
+
+class PasswordPolicyTests(unittest.TestCase):
+    def setUp(self):
+        self.session = _init_testing_db()
+        self.config = testing.setUp()
+        self.config.testing_securitypolicy()
+        _register_routes(self.config)
+
+    def tearDown(self):
+        from .passwords import configure_passwords
+        configure_passwords({})
+        self.session.remove()
+        testing.tearDown()
+
+    def _login(self, password='password'):
+        from .views import login
+        request = testing.DummyRequest(params={
+            'form.submitted': '1', 'login': 'test_user', 'password': password})
+        return login(request), request
+
+    def test_policy_from_settings(self):
+        from .passwords import policy_from_settings
+        policy = policy_from_settings({'plog.passwords.sha256_crypt__rounds': '6000',
+                                       'plog.passwords.pool.workers': '4',
+                                       'other': 'x'})
+        self.assertEqual(policy, {'schemes': 'sha256_crypt',
+                                  'deprecated': 'auto',
+                                  'sha256_crypt__rounds': '6000',
+                                  'sha256_crypt__min_rounds': '6000',
+                                  'sha256_crypt__max_rounds': '6000'})
+
+    def test_rehash_on_login(self):
+        from passlib.hash import sha256_crypt
+        from .models import User
+        from .passwords import configure_passwords
+        configure_passwords({'plog.passwords.sha256_crypt__rounds': '5000'})
+        response, request = self._login()
+        self.assertEqual(response.status_int, 302)
+        user = self.session.query(User).filter_by(username='test_user').one()
+        self.assertEqual(sha256_crypt.from_string(user.password).rounds, 5000)
+
+    def test_rehash_on_new_scheme(self):
+        from passlib.hash import pbkdf2_sha256
+        from .models import User
+        from .passwords import configure_passwords
+        configure_passwords({'plog.passwords.schemes': 'pbkdf2_sha256, sha256_crypt',
+                             'plog.passwords.pbkdf2_sha256__rounds': '1000'})
+        response, request = self._login()
+        self.assertEqual(response.status_int, 302)
+        user = self.session.query(User).filter_by(username='test_user').one()
+        self.assertTrue(pbkdf2_sha256.identify(user.password))
+
+    def test_wrong_password(self):
+        response, request = self._login('wrong')
+        self.assertEqual(response['message'], 'Wrong password!')
+
+    def test_pool_busy(self):
+        from . import passwords
+        import time
+        passwords.configure_passwords({'plog.passwords.pool.max_pending': '1'})
+        passwords.verify_pool._slots.acquire()
+        start = time.monotonic()
+        try:
+            response, request = self._login()
+        finally:
+            passwords.verify_pool._slots.release()
+        # Turned away without waiting for a slot.
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(request.response.status_int, 503)
+        self.assertEqual(passwords.verify_pool.rejected, 1)
+
+
+class ProfileSettingsTests(unittest.TestCase):
+    def test_production_strips_development_settings(self):
+        from . import apply_profile
+        settings = apply_profile({'plog.profile': 'production',
+                                  'pyramid.reload_templates': 'true',
+                                  'pyramid.includes': 'pyramid_debugtoolbar\npyramid_tm'})
+        self.assertEqual(settings['pyramid.includes'], 'pyramid_tm')
+        self.assertEqual(settings['pyramid.reload_templates'], 'false')
+
+    def test_development_untouched(self):
+        from . import apply_profile
+        settings = {'pyramid.includes': 'pyramid_debugtoolbar'}
+        self.assertEqual(apply_profile(dict(settings)), settings)
+
+    def test_sqlite_engine(self):
+        import os
+        import shutil
+        import tempfile
+        from sqlalchemy.pool import QueuePool
+        from .db import make_engine
+        directory = tempfile.mkdtemp()
+        try:
+            engine = make_engine({
+                'sqlalchemy.url': 'sqlite:///%s' % os.path.join(directory, 'test.sqlite'),
+                'sqlalchemy.pool_size': '4',
+                'plog.sqlite.journal_mode': 'wal',
+                'plog.sqlite.busy_timeout': '1234'})
+            self.assertIsInstance(engine.pool, QueuePool)
+            self.assertEqual(engine.execute('PRAGMA journal_mode').scalar(), 'wal')
+            self.assertEqual(engine.execute('PRAGMA busy_timeout').scalar(), 1234)
+            engine.dispose()
+        finally:
+            shutil.rmtree(directory)
+
+
+class EditPostConflictTests(unittest.TestCase):
+    def setUp(self):
+        self.session = _init_testing_db()
+        self.config = testing.setUp()
+        _register_routes(self.config)
+
+    def tearDown(self):
+        transaction.abort()
+        self.session.remove()
+        testing.tearDown()
+
+    def test_concurrent_edit(self):
+        from sqlalchemy import event
+        from .models import Post
+        from .views import edit_post
+
+        def concurrent_save(session, flush_context, instances):
+            session.execute(Post.__table__.update().values(version=Post.version + 1))
+        request = testing.DummyRequest(params={'title': 'Test Post', 'body': 'mine'})
+        request.method = 'POST'
+        request.matchdict['slug'] = 'test-post'
+        event.listen(self.session, 'before_flush', concurrent_save, once=True)
+        response = edit_post(request)
+        self.assertEqual(response.status_int, 409)
+        self.assertTrue(transaction.get().isDoomed())
+
+
+class BenchmarkTests(unittest.TestCase):
+    def test_summarize(self):
+        from .scripts.benchmark import summarize
+        result = summarize([i / 1000.0 for i in range(100, 0, -1)], [2] * 100, 2.0)
+        self.assertEqual(result['requests'], 100)
+        self.assertEqual(result['req_per_sec'], 50.0)
+        self.assertAlmostEqual(result['p50_ms'], 51.0)
+        self.assertAlmostEqual(result['p99_ms'], 100.0)
+        self.assertEqual(result['queries_per_request'], 2.0)
+
+    def test_compare_flags_regressions(self):
+        import contextlib
+        import io
+        from .scripts.benchmark import compare
+        meta = {'posts': 1, 'users': 1, 'groups': 1, 'requests': 1, 'concurrency': 0}
+        baseline = {'meta': meta, 'results': {
+            'home': {'p50_ms': 10.0, 'req_per_sec': 100.0},
+            'post': {'p50_ms': 10.0, 'req_per_sec': 100.0}}}
+        results = {'home': {'p50_ms': 10.5, 'req_per_sec': 98.0},
+                   'post': {'p50_ms': 20.0, 'req_per_sec': 50.0},
+                   'search': {'p50_ms': 1.0, 'req_per_sec': 1.0}}
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(compare(results, meta, baseline, 10.0), ['post'])
+        self.assertIn('REGRESSION', out.getvalue())
+
+
+class SeedTests(unittest.TestCase):
+    def _seed(self, seed):
+        from sqlalchemy import create_engine
+        from .scripts.seed import seed_database
+        engine = create_engine('sqlite://')
+        seed_database(engine, 50, 20, 5, seed=seed)
+        return engine
+
+    def test_counts_and_unique_slugs(self):
+        from .scripts.seed import post_slug
+        engine = self._seed(0)
+        self.assertEqual(engine.execute('SELECT count(*) FROM posts').scalar(), 50)
+        self.assertEqual(engine.execute('SELECT count(DISTINCT slug) FROM posts').scalar(), 50)
+        self.assertEqual(engine.execute('SELECT count(*) FROM users').scalar(), 21)
+        self.assertEqual(engine.execute('SELECT count(*) FROM groups').scalar(), 6)
+        self.assertEqual(engine.execute('SELECT slug FROM posts WHERE id = 8').scalar(),
+                         post_slug(7))
+
+    def test_deterministic(self):
+        query = 'SELECT body FROM posts ORDER BY id'
+        self.assertEqual(self._seed(1).execute(query).fetchall(),
+                         self._seed(1).execute(query).fetchall())
+        self.assertNotEqual(self._seed(1).execute(query).fetchall(),
+                            self._seed(2).execute(query).fetchall())
+
+    def test_refuses_non_empty_database(self):
+        from .scripts.seed import seed_database
+        engine = self._seed(0)
+        self.assertRaises(ValueError, seed_database, engine, 1, 1, 1)
+
+
+class TemplatingTests(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.directory)
+        testing.tearDown()
+
+    def _environment(self, **settings):
+        from .templating import configure_templates, get_environment
+        settings.update(_render_settings())
+        config = testing.setUp(settings=settings)
+        _setup_renderer(config)
+        configure_templates(config)
+        config.commit()
+        return get_environment(config.registry)
+
+    def test_template_names(self):
+        from .templating import template_names
+        names = template_names()
+        self.assertIn('plog:templates/home.jinja2', names)
+        self.assertIn('plog:templates/base.jinja2', names)
+
+    def test_compile_follows_parents_and_imports(self):
+        from .templating import compile_templates
+        env = self._environment()
+        count = compile_templates(env, ['plog:templates/home.jinja2'])
+        self.assertEqual(count, 3)  # home, its base and its pager import
+        self.assertEqual(len(env.cache), 3)
+
+    def test_precompile_into_bytecode_cache(self):
+        import os
+        directory = os.path.join(self.directory, 'jinja2')
+        env = self._environment(**{'plog.templates.precompile': 'true',
+                                   'jinja2.bytecode_caching': 'true',
+                                   'jinja2.bytecode_caching_directory': directory})
+        self.assertGreater(len(env.cache), 10)
+        self.assertEqual(len(os.listdir(directory)), len(env.cache))
+
+
+class StaticAssetsTests(unittest.TestCase):
+    def setUp(self):
+        import os
+        import tempfile
+        from .assets import ContentHashCacheBuster, static_tween_factory
+        self.root = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.root, 'css'))
+        with open(os.path.join(self.root, 'css', 'site.css'), 'w') as f:
+            f.write('body { color: black; }\n' * 200)
+        config = testing.setUp(settings={})
+        config.registry.static_cache_buster = ContentHashCacheBuster(self.root)
+        self.buster = config.registry.static_cache_buster
+        self.tween = static_tween_factory(lambda request: 'fallthrough', config.registry)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.root)
+        testing.tearDown()
+
+    def _get(self, path, **headers):
+        from pyramid.request import Request
+        return self.tween(Request.blank(path, headers=headers))
+
+    def test_hashed_url_is_immutable(self):
+        token = self.buster.token('css/site.css')
+        response = self._get('/static/css/site.css?v=' + token)
+        self.assertEqual(response.headers['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(response.etag, token)
+        response = self._get('/static/css/site.css?v=stale')
+        self.assertEqual(response.cache_control.max_age, 3600)
+
+    def test_precompressed_variants(self):
+        from .assets import compress_directory, brotli
+        written = compress_directory(self.root)
+        self.assertEqual(len(written), 2 if brotli else 1)
+        self.assertEqual(compress_directory(self.root), [])
+        response = self._get('/static/css/site.css', **{'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertIn('Accept-Encoding', response.vary)
+        response = self._get('/static/css/site.css')
+        self.assertIsNone(response.content_encoding)
+        self.assertEqual(self._get('/static/css/site.css.gz').status_int, 404)
+
+    def test_falls_through(self):
+        self.assertEqual(self._get('/static/css/missing.css'), 'fallthrough')
+        self.assertEqual(self._get('/static/css/../../etc/passwd'), 'fallthrough')
+        self.assertEqual(self._get('/post/css'), 'fallthrough')
+
+    def test_base_template_links_hashed_assets(self):
+        from pyramid.renderers import render
+        config = testing.setUp(settings=_render_settings())
+        _setup_renderer(config)
+        from .assets import ContentHashCacheBuster, STATIC_SPEC, static_root
+        config.add_cache_buster(STATIC_SPEC, ContentHashCacheBuster(static_root()))
+        _register_routes(config)
+        html = render('base.jinja2', {'project': 'Plog'}, testing.DummyRequest())
+        self.assertIn('bootstrap.min.css?v=', html)
+        self.assertNotIn('angular', html)
+
+
+class CompressionTests(unittest.TestCase):
+    def setUp(self):
+        self.config = testing.setUp(settings={'plog.compression': 'true',
+                                              'plog.compression.encodings': 'gzip'})
+        self.seen = []
+
+    def tearDown(self):
+        testing.tearDown()
+
+    def _tween(self, body=b'<p>hello</p>' * 200, content_type='text/html', etag='abc'):
+        from pyramid.response import Response
+        from .compression import compression_tween_factory
+
+        def handler(request):
+            self.seen.append(request.headers.get('If-None-Match'))
+            response = Response(body, content_type=content_type)
+            response.etag = etag
+            return response
+        return compression_tween_factory(handler, self.config.registry)
+
+    def _get(self, tween, **headers):
+        from pyramid.request import Request
+        request = Request.blank('/', headers=headers)
+        request.registry = self.config.registry
+        return tween(request)
+
+    def test_gzip(self):
+        import gzip
+        response = self._get(self._tween(), **{'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertEqual(gzip.decompress(response.body), b'<p>hello</p>' * 200)
+        self.assertEqual(response.etag, 'abc-gzip')
+        self.assertIn('Accept-Encoding', response.vary)
+
+    def test_skips(self):
+        self.assertIsNone(self._get(self._tween()).content_encoding)
+        small = self._get(self._tween(body=b'tiny'), **{'Accept-Encoding': 'gzip'})
+        self.assertIsNone(small.content_encoding)
+        image = self._get(self._tween(content_type='image/png'), **{'Accept-Encoding': 'gzip'})
+        self.assertIsNone(image.content_encoding)
+
+    def test_suffixed_etag_is_normalised(self):
+        response = self._get(self._tween(), **{'Accept-Encoding': 'gzip',
+                                               'If-None-Match': '"abc-gzip"'})
+        self.assertEqual(self.seen, ['"abc"'])
+        self.assertEqual(response.status_int, 304)
+        self.assertEqual(response.etag, 'abc-gzip')
+
+    def test_cached_variant(self):
+        from .cache import PageCache, MemoryBackend, CachedPage
+        from .compression import compression_stats
+        from pyramid.request import Request
+        compression_stats.reset()
+        cache = self.config.registry.page_cache = PageCache(MemoryBackend())
+        tween = self._tween()
+        for _ in range(2):
+            request = Request.blank('/', headers={'Accept-Encoding': 'gzip'})
+            request.registry = self.config.registry
+            request.page_cache_key = ('home', 'anon|')
+            tween(request)
+        self.assertEqual(cache.variant_hits, 1)
+        self.assertEqual(compression_stats.snapshot()['<notfound>']['cached'], 1)
+        cache.set('post', 'anon|x', CachedPage('200 OK', [], b''))
+        cache.set_variant('post', 'anon|x', 'gzip', CachedPage('200 OK', [], b''))
+        cache.delete('post', 'anon|x')
+        self.assertIsNone(cache.get_variant('post', 'anon|x', 'gzip'))
+
+
+class RenderingTests(unittest.TestCase):
+    def setUp(self):
+        self.session = _init_testing_db()
+        self.config = testing.setUp()
+
+    def tearDown(self):
+        transaction.abort()
+        self.session.remove()
+        testing.tearDown()
+
+    def test_markdown(self):
+        from .rendering import render_markdown
+        html = render_markdown('```python\nx = 1\n```\n\n| a | b |\n|---|---|\n| 1 | 2 |\n')
+        self.assertIn('class="codehilite"', html)
+        self.assertIn('<table>', html)
+
+    def test_unsafe_input(self):
+        from .rendering import render_markdown
+        html = render_markdown('<script>alert(1)</script> [x](javascript:alert(1)) '
+                               '[y](https://example.com)')
+        self.assertNotIn('<script>', html)
+        self.assertNotIn('javascript:', html)
+        self.assertIn('href="https://example.com"', html)
+
+    def test_encoded_schemes(self):
+        from .rendering import render_markdown
+        for source in ('[x](javascript&#58;alert(1))', '[x](&#x6A;avascript:alert(1))',
+                       '![x](&#106;avascript:alert(1))', '[x](java&#9;script:alert(1))',
+                       '[x](&#1;javascript:alert(1))', '[x](JaVaScRiPt&colon;alert(1))'):
+            html = render_markdown(source)
+            self.assertNotIn('href=', html, source)
+            self.assertNotIn('src=', html, source)
+        self.assertIn('href="/post/a?x=1&amp;y=2"', render_markdown('[x](/post/a?x=1&y=2)'))
+
+    def test_rendered_on_write(self):
+        from .models import Post
+        from .rendering import RENDERER_VERSION
+        post = self.session.query(Post).one()
+        self.assertEqual(post.body_html, '<p>This is the test post</p>')
+        post.body = '*new*'
+        self.assertEqual(post.body_html, '<p><em>new</em></p>')
+        self.assertEqual(post.body_html_version, RENDERER_VERSION)
+
+    def _make_stale(self):
+        from zope.sqlalchemy import mark_changed
+        from .models import Post
+        table = Post.__table__
+        with transaction.manager:
+            self.session.execute(table.update().values(body_html=None, body_html_version=None,
+                                                       summary=None, updated_at=table.c.updated_at))
+            mark_changed(self.session())
+        self.session.remove()
+
+    def test_lazy_rerender_keeps_version(self):
+        from .models import Post
+        from .views import post_view
+        self._make_stale()
+        before = self.session.query(Post.version, Post.updated_at).one()
+        request = testing.DummyRequest()
+        request.matchdict['slug'] = 'test-post'
+        _register_routes(self.config)
+        with transaction.manager:
+            info = post_view(request)
+        self.assertEqual(info['body_html'], '<p>This is the test post</p>')
+        self.session.remove()
+        self.assertEqual(self.session.query(Post.body_html).scalar(),
+                         '<p>This is the test post</p>')
+        self.assertEqual(self.session.query(Post.version, Post.updated_at).one(), before)
+
+    def test_lazy_rerender_skips_changed_rows(self):
+        from .models import Post
+        from .rendering import post_html
+        from sqlalchemy.orm import undefer
+        self._make_stale()
+        table = Post.__table__
+        with transaction.manager:
+            post = self.session.query(Post).options(undefer(Post.body_html)).one()
+            # Edited by someone else since it was read.
+            self.session.execute(table.update().values(version=table.c.version + 1))
+            self.assertEqual(post_html(self.session, post), '<p>This is the test post</p>')
+        self.session.remove()
+        self.assertIsNone(self.session.query(Post.body_html).scalar())
+
+    def test_lazy_rerender_refreshes_listing(self):
+        from .cache import CachedPage, MemoryBackend, PageCache
+        from .views import home_view, post_view
+        self._make_stale()
+        _register_routes(self.config)
+        cache = self.config.registry.page_cache = PageCache(MemoryBackend())
+        cache.set('home', 'anon|', CachedPage('200 OK', [], b'no summary'))
+        before = testing.DummyRequest()
+        self.assertIsNone(home_view(before)['posts'].items[0].summary)
+        request = testing.DummyRequest()
+        request.matchdict['slug'] = 'test-post'
+        with transaction.manager:
+            post_view(request)
+        self.assertIsNone(cache.get('home', 'anon|'))
+        after = testing.DummyRequest()
+        self.assertEqual(home_view(after)['posts'].items[0].summary, 'This is the test post')
+        self.assertNotEqual(after.response.etag, before.response.etag)
+
+    def test_render_posts(self):
+        from .models import Post
+        from .scripts.render_posts import render_posts
+        self._make_stale()
+        render_posts(self.session.bind, batch_size=1)
+        self.assertEqual(self.session.query(Post.body_html).scalar(),
+                         '<p>This is the test post</p>')
+        self.assertEqual(self.session.query(Post.summary).scalar(), 'This is the test post')
+
+    def test_summary(self):
+        from .rendering import render_post, SUMMARY_WORDS
+        values = render_post('# Title\n\n' + 'word ' * 450 + '\n\n    code block\n')
+        self.assertEqual(values['word_count'], 451)
+        self.assertEqual(values['reading_time'], 3)
+        self.assertEqual(len(values['summary'].split()), SUMMARY_WORDS)
+        self.assertTrue(values['summary'].startswith('Title word'))
+        self.assertTrue(values['summary'].endswith(u'…'))
+        self.assertEqual(render_post('')['reading_time'], 1)
+
+    def test_home_does_not_load_bodies(self):
+        from sqlalchemy import event
+        from .views import home_view
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+        engine = self.session.bind
+        event.listen(engine, 'before_cursor_execute', capture)
+        try:
+            _register_routes(self.config)
+            info = home_view(testing.DummyRequest())
+        finally:
+            event.remove(engine, 'before_cursor_execute', capture)
+        self.assertEqual([p.summary for p in info['posts']], ['This is the test post'])
+        self.assertTrue(statements)
+        for statement in statements:
+            self.assertNotRegex(statement, r'posts\.body(_html)?\b')
+
+
+class FeedTests(unittest.TestCase):
+    def setUp(self):
+        from .feeds import FeedCache
+        self.session = _init_testing_db()
+        self.config = testing.setUp()
+        _register_routes(self.config)
+        self.cache = self.config.registry.feed_cache = FeedCache()
+
+    def tearDown(self):
+        transaction.abort()
+        self.session.remove()
+        testing.tearDown()
+
+    def _get(self, kind='atom'):
+        from .views import feed_view
+        request = testing.DummyRequest()
+        request.matched_route = type('Route', (), {'name': 'feed_' + kind})()
+        return feed_view(request)
+
+    def test_atom(self):
+        from xml.etree import ElementTree
+        response = self._get('atom')
+        self.assertEqual(response.content_type, 'application/atom+xml')
+        ns = {'a': 'http://www.w3.org/2005/Atom'}
+        feed = ElementTree.fromstring(response.body)
+        entry = feed.find('a:entry', ns)
+        self.assertEqual(entry.find('a:title', ns).text, 'Test Post')
+        self.assertEqual(entry.find('a:content', ns).text, '<p>This is the test post</p>')
+        self.assertEqual(entry.find('a:summary', ns).text, 'This is the test post')
+        self.assertTrue(response.etag)
+        self.assertTrue(response.last_modified)
+
+    def test_rss(self):
+        from xml.etree import ElementTree
+        response = self._get('rss')
+        self.assertEqual(response.content_type, 'application/rss+xml')
+        item = ElementTree.fromstring(response.body).find('channel/item')
+        self.assertEqual(item.find('link').text, 'http://example.com/post/test-post')
+
+    def test_conditional(self):
+        from webob import Request
+        response = self._get()
+        request = Request.blank('/feed.atom', headers={'If-None-Match': '"%s"' % response.etag})
+        self.assertEqual(request.get_response(response).status_int, 304)
+
+    def test_generated_once_per_change(self):
+        from .models import Post
+        from .views import add_post
+        self._get()
+        self._get()
+        self.assertEqual(self.cache.generated, 1)
+        request = testing.DummyRequest()
+        request.method = 'POST'
+        request.params['csrf_token'] = request.session.get_csrf_token()
+        request.params['title'] = 'Second'
+        request.params['body'] = 'Two'
+        add_post(request)
+        self.session.flush()
+        self.assertIn(b'Second', self._get().body)
+        self.assertEqual(self.cache.generated, 2)
+        first = self.session.query(Post.id, Post.version).filter_by(slug='test-post').one()
+        self.assertIn(tuple(first), self.cache.entries(('atom', 'http://example.com')))
+
+    def test_shared_directory(self):
+        import shutil
+        import tempfile
+        from .cache import CachedPage
+        from .feeds import FeedCache
+        directory = tempfile.mkdtemp()
+        try:
+            one, two = FeedCache(directory), FeedCache(directory)
+            one.set(('atom', 'x'), CachedPage('200 OK', [], b'feed'))
+            self.assertEqual(two.get(('atom', 'x')).body, b'feed')
+            two.clear()
+            self.assertIsNone(one.get(('atom', 'x')))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_directory_bounded(self):
+        import os
+        import shutil
+        import tempfile
+        from .cache import CachedPage
+        from .feeds import FeedCache, MAX_DOCUMENTS
+        directory = tempfile.mkdtemp()
+        try:
+            cache = FeedCache(directory)
+            for i in range(MAX_DOCUMENTS + 5):
+                cache.set(('atom', 'http://host%d.example' % i), CachedPage('200 OK', [], b'x'))
+            self.assertEqual(len(os.listdir(directory)), MAX_DOCUMENTS)
+        finally:
+            shutil.rmtree(directory)
+
+
+class BuildStaticTests(unittest.TestCase):
+    def setUp(self):
+        import os
+        import tempfile
+        from sqlalchemy import create_engine
+        from .scripts.seed import seed_database
+        self.directory = tempfile.mkdtemp()
+        self.output = os.path.join(self.directory, 'site')
+        self.settings = {'sqlalchemy.url': 'sqlite:///%s/plog.sqlite' % self.directory,
+                         'plog.page_size': '4'}
+        self.settings.update(_render_settings())
+        self.engine = create_engine(self.settings['sqlalchemy.url'])
+        seed_database(self.engine, 10, 1, 1)
+
+    def tearDown(self):
+        import shutil
+        from .models import DBSession
+        DBSession.remove()
+        shutil.rmtree(self.directory)
+
+    def _build(self, jobs=1):
+        from .scripts.build_static import build_static
+        return build_static(self.settings, self.output, 'http://blog.example.com', jobs)
+
+    def _read(self, path):
+        import os
+        with open(os.path.join(self.output, path)) as f:
+            return f.read()
+
+    def test_build(self):
+        import os
+        from .scripts.seed import post_slug, post_title
+        result = self._build()
+        # 10 posts; 3 home pages, the first two also reachable by ?before=.
+        self.assertEqual(result['pages'], 15)
+        self.assertEqual(result['written'], 15)
+        self.assertIn(post_title(0), self._read('post/%s.html' % post_slug(0)))
+        self.assertIn('http://blog.example.com/?after=4', self._read('index.html'))
+        self.assertEqual(self._read('home/after-4.html'), self._read('home/before-9.html'))
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'static/css/pygments.css')))
+
+    def test_incremental(self):
+        import os
+        from .scripts.seed import post_slug
+        self._build()
+        self.assertEqual(self._build()['written'], 0)
+        self.engine.execute("UPDATE posts SET title = 'Renamed', slug = 'renamed', "
+                            "version = version + 1 WHERE id = 10")
+        self.engine.execute("DELETE FROM posts WHERE id = 9")
+        result = self._build(jobs=2)
+        # The renamed post, the last home page (now post 10 alone) and the
+        # middle page's new ?before= copy.
+        self.assertEqual(result['written'], 3)
+        self.assertEqual(result['removed'], 3)
+        self.assertIn('Renamed', self._read('post/renamed.html'))
+        self.assertFalse(os.path.exists(os.path.join(self.output, 'post/%s.html' % post_slug(8))))
+
+
+class SlugTests(unittest.TestCase):
+    def setUp(self):
+        self.session = _init_testing_db()
+        self.config = testing.setUp()
+        _register_routes(self.config)
+
+    def tearDown(self):
+        transaction.abort()
+        self.session.remove()
+        testing.tearDown()
+
+    def _view(self, slug):
+        from .views import post_view
+        request = testing.DummyRequest()
+        request.matchdict['slug'] = slug
+        return post_view(request)
+
+    def _edit(self, slug, title):
+        from .views import edit_post
+        request = testing.DummyRequest()
+        request.method = 'POST'
+        request.matchdict['slug'] = slug
+        request.params['title'] = title
+        request.params['body'] = 'Edited'
+        with transaction.manager:
+            edit_post(request)
+
+    def test_renamed_post_redirects(self):
+        self._edit('test-post', 'New Title')
+        self._edit('new-title', 'Newer Title')
+        for slug in ('test-post', 'new-title'):
+            response = self._view(slug)
+            self.assertEqual(response.status_int, 301)
+            self.assertEqual(response.location, 'http://example.com/post/newer-title')
+        self.assertEqual(self._view('newer-title')['post'].title, 'Newer Title')
+
+    def test_new_post_takes_over_old_slug(self):
+        from .models import Post, SlugRedirect
+        from .slugs import claim_slugs
+        self._edit('test-post', 'New Title')
+        with transaction.manager:
+            claim_slugs(self.session, 'test-post')
+            self.session.add(Post('Test Post', 'Again'))
+        self.assertEqual(self.session.query(SlugRedirect).count(), 0)
+        self.assertEqual(self._view('test-post')['post'].body, 'Again')
+
+    def test_missing_slug_cached(self):
+        response = self._view('no-such-post')
+        self.assertEqual(response.status_int, 404)
+        with _QueryBudget(self, 0):
+            self.assertEqual(self._view('no-such-post').status_int, 404)
+
+    def test_stale_map_entry(self):
+        from .models import Post
+        from .slugs import slug_map
+        slug_map.warm(self.session.bind)
+        # Another process renames the post and reuses its slug.
+        with transaction.manager:
+            self.session.query(Post).filter_by(id=1).update({'title': 'Renamed', 'slug': 'renamed'})
+            self.session.add(Post('Test Post', 'Another'))
+        self.assertEqual(self._view('test-post')['post'].body, 'Another')
+        self.assertEqual(self._view('renamed')['post'].id, 1)
+        with transaction.manager:
+            self.session.query(Post).filter_by(slug='test-post').delete()
+        self.assertEqual(self._view('test-post').status_int, 404)
+
+    def test_map_entries_expire(self):
+        import time
+        from unittest import mock
+        from .slugs import slug_map
+        slug_map.set('test-post', 1)
+        now = time.monotonic()
+        with mock.patch('plog.slugs.time.monotonic', return_value=now + slug_map.ttl + 1):
+            self.assertIs(slug_map.lookup('test-post'), slug_map.unknown)
+        self.assertEqual(slug_map.lookup('test-post'), (1, True))
+
+    def test_warm_map_skips_slug_query(self):
+        from .slugs import slug_map
+        slug_map.warm(self.session.bind)
+        with _QueryBudget(self, 2) as budget:
+            self._view('test-post')
+        self.assertFalse([s for s in budget.statements if 'slug_redirects' in s])
+
+    def test_delete_removes_history(self):
+        from .models import SlugRedirect
+        from .views import delete_post
+        self._edit('test-post', 'New Title')
+        self._view('test-post')
+        request = testing.DummyRequest()
+        request.matchdict['slug'] = 'new-title'
+        with transaction.manager:
+            delete_post(request)
+        self.assertEqual(self.session.query(SlugRedirect).count(), 0)
+        self.assertEqual(self._view('test-post').status_int, 404)
+
+
+class ApiTests(unittest.TestCase):
+    def setUp(self):
+        self.session = _init_testing_db()
+        self.config = testing.setUp()
+        _register_routes(self.config)
+
+    def tearDown(self):
+        transaction.abort()
+        self.session.remove()
+        testing.tearDown()
+
+    @staticmethod
+    def _request(params=None, **matchdict):
+        request = testing.DummyRequest(params=params or {})
+        request.matchdict.update(matchdict)
+        return request
+
+    def _batch(self, body):
+        from .api import batch_posts
+        request = self._request()
+        request.method = 'POST'
+        request.content_type = 'application/json'
+        request.json_body = body
+        return batch_posts(request)
+
+    def test_fields(self):
+        from .api import list_posts
+        result = list_posts(self._request({'fields': 'title,slug'}))
+        self.assertEqual(result['posts'], [{'title': 'Test Post', 'slug': 'test-post'}])
+        self.assertIsNone(result['next'])
+
+    def test_unknown_field(self):
+        from pyramid.httpexceptions import HTTPBadRequest
+        from .api import list_posts
+        with self.assertRaises(HTTPBadRequest) as raised:
+            list_posts(self._request({'fields': 'title,password'}))
+        self.assertEqual(raised.exception.json_body['fields'], ['password'])
+
+    def test_no_orm_objects(self):
+        from sqlalchemy import event
+        from .api import list_posts, get_post
+        from .models import Post
+        loaded = []
+
+        def on_load(target, context):
+            loaded.append(target)
+        event.listen(Post, 'load', on_load)
+        try:
+            list_posts(self._request({'fields': 'title,body_html'}))
+            result = get_post(self._request({'fields': 'body_html,updated_at'}, slug='test-post'))
+        finally:
+            event.remove(Post, 'load', on_load)
+        self.assertEqual(loaded, [])
+        self.assertEqual(result['body_html'], '<p>This is the test post</p>')
+        self.assertIsInstance(result['updated_at'], str)
+
+    def test_keyset_pagination(self):
+        from .api import list_users
+        from .models import User
+        with transaction.manager:
+            for n in range(3):
+                self.session.add(User('user%d' % n, 'password', 'u%d@example.com' % n))
+        first = list_users(self._request({'limit': '2', 'fields': 'username,groups'}))
+        self.assertEqual(first['users'], [{'username': 'test_user', 'groups': ['A group']},
+                                          {'username': 'user0', 'groups': []}])
+        second = list_users(self._request({'limit': '2', 'after': str(first['next'])}))
+        self.assertEqual([u['username'] for u in second['users']], ['user1', 'user2'])
+        self.assertIsNone(second['next'])
+
+    def test_group(self):
+        from .api import get_group
+        self.assertEqual(get_group(self._request(name='A group')),
+                         {'id': 1, 'name': 'A group', 'permission': 'test_permission'})
+
+    def test_batch(self):
+        from .models import Post
+        result = self._batch({
+            'create': [{'title': 'One', 'body': '1'}, {'title': 'Two', 'body': '2'}],
+            'update': [{'slug': 'test-post', 'version': 1, 'title': 'Renamed'}]})
+        self.assertEqual([p['slug'] for p in result['created']], ['one', 'two'])
+        self.assertEqual(result['updated'][0]['slug'], 'renamed')
+        result = self._batch({'delete': [{'slug': 'one'}, {'slug': 'two'}]})
+        self.assertEqual(result['deleted'], 2)
+        self.assertEqual([p.slug for p in self.session.query(Post)], ['renamed'])
+
+    def test_batch_all_or_nothing(self):
+        from pyramid.httpexceptions import HTTPConflict, HTTPNotFound
+        self.assertRaises(HTTPNotFound, self._batch, {
+            'create': [{'title': 'One', 'body': '1'}], 'delete': [{'slug': 'missing'}]})
+        self.assertRaises(HTTPConflict, self._batch, {
+            'update': [{'slug': 'test-post', 'version': 7, 'body': 'x'}]})
+        self.assertTrue(transaction.isDoomed())
+
+    def test_batch_duplicate_titles(self):
+        from pyramid.httpexceptions import HTTPConflict
+        for body in ({'create': [{'title': 'Dup', 'body': '1'}, {'title': 'Dup', 'body': '2'}]},
+                     {'create': [{'title': 'Test post', 'body': '1'}]}):
+            self.assertRaises(HTTPConflict, self._batch, body)
+            self.assertTrue(transaction.isDoomed())
+            transaction.abort()
+
+    def test_batch_invalid_fields(self):
+        from pyramid.httpexceptions import HTTPBadRequest
+        for update in ({'slug': 'test-post', 'title': None}, {'slug': 'test-post', 'body': 5}):
+            self.assertRaises(HTTPBadRequest, self._batch, {'update': [update]})
+
+    def test_batch_requires_json(self):
+        from pyramid.httpexceptions import HTTPUnsupportedMediaType
+        from .api import batch_posts
+        request = self._request({'create': 'x'})
+        request.method = 'POST'
+        request.content_type = 'application/x-www-form-urlencoded'
+        self.assertRaises(HTTPUnsupportedMediaType, batch_posts, request)
+
+
+def _asgi_request(app, method, path, headers=(), body=b''):
+    """ One request through the ASGI application ``app``: ``(status,
+    headers, body)``, with header names lowercased.
+    """
+    import asyncio
+    path, _, query = path.partition('?')
+    scope = {'type': 'http', 'method': method, 'path': path, 'root_path': '',
+             'query_string': query.encode('latin-1'), 'scheme': 'http',
+             'server': ('localhost', 80), 'client': ('127.0.0.1', 1234),
+             'headers': [(k.lower().encode('latin-1'), v.encode('latin-1'))
+                         for k, v in headers]}
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        await app.database.open()
+        try:
+            await app(scope, receive, send)
+        finally:
+            await app.database.close()
+    asyncio.run(run())
+    return (sent[0]['status'],
+            dict((k.decode('latin-1').lower(), v.decode('latin-1'))
+                 for k, v in sent[0]['headers']),
+            sent[1]['body'])
+
+
+@unittest.skipIf(__import__('plog.asgi').asgi.aiosqlite is None, 'aiosqlite is not installed')
+class AsgiTests(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        from webtest import TestApp
+        from . import main
+        from .asgi import asgi_app
+        from .models import Base, DBSession
+        from .scripts.render_posts import render_posts
+        from .scripts.seed import seed_database
+        self.directory = tempfile.mkdtemp()
+        settings = {'sqlalchemy.url': 'sqlite:///%s/plog.sqlite' % self.directory,
+                    'pyramid.includes': 'pyramid_tm\npyramid_jinja2',
+                    'plog.page_size': '4'}
+        settings.update(_render_settings())
+        wsgi = main({}, **settings)
+        Base.metadata.create_all(DBSession.bind)
+        seed_database(DBSession.bind, 10, 1, 1)
+        render_posts(DBSession.bind)
+        self.app = asgi_app(wsgi)
+        self.wsgi = TestApp(wsgi)
+
+    def tearDown(self):
+        import shutil
+        from .models import DBSession
+        self.app.executor.shutdown()
+        DBSession.remove()
+        shutil.rmtree(self.directory)
+
+    def _get(self, path, headers=()):
+        return _asgi_request(self.app, 'GET', path, headers)
+
+    def test_matches_wsgi(self):
+        from .scripts.seed import post_slug
+        for path in ('/', '/?after=4', '/?before=9', '/post/' + post_slug(3)):
+            status, headers, body = self._get(path)
+            expected = self.wsgi.get(path)
+            self.assertEqual(status, 200)
+            self.assertEqual(body, expected.body)
+            self.assertEqual(headers['etag'], expected.headers['ETag'])
+        self.assertEqual((self.app.served, self.app.delegated), (4, 0))
+
+    def test_conditional_and_redirects(self):
+        from .models import DBSession
+        from .scripts.seed import post_slug
+        status, headers, _ = self._get('/')
+        self.assertEqual(self._get('/', [('If-None-Match', headers['etag'])])[0], 304)
+        DBSession.bind.execute("INSERT INTO slug_redirects (slug, post_id) VALUES ('old-slug', 1)")
+        status, headers, _ = self._get('/post/old-slug')
+        self.assertEqual(status, 301)
+        self.assertEqual(headers['location'], 'http://localhost/post/' + post_slug(0))
+        self.assertEqual(self._get('/post/missing')[0], 404)
+        self.assertEqual(self._get('/post/missing')[0], 404)
+        # Two listings, the redirected post, and both slug tables for
+        # each slug.
+        self.assertEqual(self.app.database.queries, 7)
+
+    def test_page_cache_shared_per_host(self):
+        from .cache import MemoryBackend, PageCache
+        self.app.registry.page_cache = PageCache(MemoryBackend())
+        self.wsgi.get('/', headers={'Host': 'evil.example'})
+        status, headers, body = self._get('/')
+        self.assertEqual(headers['x-cache'], 'MISS')
+        self.assertNotIn(b'evil.example', body)
+        self.assertEqual(self.wsgi.get('/').headers['X-Cache'], 'HIT')
+
+    def test_delegates(self):
+        from .models import DBSession
+        from .scripts.seed import post_slug
+        self.assertEqual(self._get('/login')[0], 200)
+        self.assertEqual(self._get('/', [('Cookie', 'auth_tkt=x')])[0], 200)
+        self.assertEqual(_asgi_request(self.app, 'POST', '/login', body=b'x=1')[0], 200)
+        DBSession.bind.execute('UPDATE posts SET body_html_version = NULL')
+        self.assertEqual(self._get('/post/' + post_slug(2))[0], 200)
+        self.assertEqual((self.app.served, self.app.delegated), (0, 4))
+        self._get('/post/' + post_slug(2))
+        self.assertEqual(self.app.served, 1)
+
+
+class WorkerTests(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        from .models import DBSession
+        from .security import principal_cache
+        from .slugs import slug_map
+        from .workers import _forked
+        _forked['registry'] = None
+        principal_cache.generation = slug_map.generation = None
+        DBSession.remove()
+        shutil.rmtree(self.directory)
+
+    def test_secrets(self):
+        import os
+        from unittest import mock
+        from .workers import get_secret
+        with mock.patch.dict(os.environ, {'PLOG_SECRET': 'from env'}):
+            self.assertEqual(get_secret({'plog.secret': 'from ini'}, 'plog.secret'), 'from env')
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertEqual(get_secret({'plog.secret': 'from ini'}, 'plog.secret'), 'from ini')
+            self.assertNotEqual(get_secret({}, 'plog.secret'), get_secret({}, 'plog.secret'))
+            self.assertRaises(ValueError, get_secret, {'plog.prefork': 'true'},
+                              'plog.session_secret')
+
+    def test_merge(self):
+        from .metrics import Histogram
+        from .workers import merge_stats
+
+        def snapshot(value, hits):
+            histogram = Histogram()
+            histogram.add(value)
+            return {'routes': {'home': {'total_ms': histogram.as_dict()}},
+                    'principal_cache': {'hits': hits, 'misses': 1, 'size': 1},
+                    'slug_map': {'hits': hits},
+                    'page_cache': {'hits': hits, 'misses': 1, 'hit_ratio': 0.5},
+                    'compression': {'home': {'responses': 1, 'bytes_in': 10, 'bytes_out': 5,
+                                             'ratio': 0.5}}}
+        merged = merge_stats([snapshot(3, 1), snapshot(300, 3)])
+        self.assertEqual(merged['workers'], 2)
+        total = merged['routes']['home']['total_ms']
+        self.assertEqual((total['count'], total['max'], total['mean']), (2, 300, 151.5))
+        self.assertEqual(merged['principal_cache'], {'hits': 4, 'misses': 2, 'size': 2})
+        self.assertEqual(merged['page_cache']['hit_ratio'], 4 / 6.0)
+        self.assertEqual(merged['compression']['home']['ratio'], 0.5)
+
+    def test_shared_stats(self):
+        import json
+        import os
+        from .workers import SharedStats
+        shared = SharedStats(self.directory, lambda: {
+            'routes': {}, 'principal_cache': {'hits': 1}, 'slug_map': {},
+            'page_cache': None, 'compression': {}}, interval=60)
+        shared.tick()
+        written = os.stat(os.path.join(self.directory, '%d.json' % os.getpid())).st_mtime_ns
+        shared.tick()
+        self.assertEqual(written, os.stat(os.path.join(
+            self.directory, '%d.json' % os.getpid())).st_mtime_ns)
+        # A worker that has exited.
+        dead = os.fork()
+        if not dead:
+            os._exit(0)
+        os.waitpid(dead, 0)
+        with open(os.path.join(self.directory, '%d.json' % dead), 'w') as f:
+            json.dump({}, f)
+        self.assertEqual(shared.aggregate()['principal_cache'], {'hits': 1})
+        self.assertEqual(os.listdir(self.directory), ['%d.json' % os.getpid()])
+
+    def test_prefork(self):
+        import json
+        import os
+        from sqlalchemy import create_engine
+        from . import main
+        from .scripts.seed import seed_database
+        from .slugs import slug_map
+        settings = {'sqlalchemy.url': 'sqlite:///%s/plog.sqlite' % self.directory,
+                    'plog.prefork': 'true', 'plog.secret': 's'}
+        seed_database(create_engine(settings['sqlalchemy.url']), 5, 1, 1)
+        slug_map.clear()
+        # Each worker would have its own memory sessions.
+        self.assertRaises(ValueError, main, {}, **settings)
+        self.assertRaises(ValueError, main, {}, **dict(
+            settings, **{'plog.page_cache': 'memory', 'plog.session.store': 'sqlite',
+                         'plog.session.path': '%s/sessions.sqlite' % self.directory}))
+        settings.update({'plog.session.store': 'sqlite',
+                         'plog.session.path': '%s/sessions.sqlite' % self.directory})
+        # Nor would they hear of each other's invalidations.
+        self.assertRaises(ValueError, main, {}, **settings)
+        settings['plog.invalidation.directory'] = '%s/invalidation' % self.directory
+        main({}, **settings)
+        self.assertEqual(slug_map.stats()['slugs'], 0)
+        read, write = os.pipe()
+        pid = os.fork()
+        if not pid:
+            os.close(read)
+            os.write(write, json.dumps(slug_map.stats()).encode('ascii'))
+            os._exit(0)
+        os.close(write)
+        with os.fdopen(read) as f:
+            child = json.load(f)
+        os.waitpid(pid, 0)
+        self.assertEqual(child['slugs'], 5)
+        self.assertEqual(slug_map.stats()['slugs'], 0)
+
+    def test_shared_invalidation(self):
+        from .generations import Generation
+        from .security import invalidate_principals, principal_cache
+        path = '%s/invalidation/principals' % self.directory
+        one, two = Generation(path), Generation(path)
+        one.bump()
+        self.assertTrue(two.changed())
+        self.assertFalse(two.changed())
+        self.assertFalse(one.changed())
+        principal_cache.generation = one
+        try:
+            principal_cache.set('a', ['x'])
+            principal_cache.generation = two
+            invalidate_principals('b')
+            transaction.abort()
+            principal_cache.generation = one
+            self.assertIs(principal_cache.get('a'), principal_cache.missing)
+        finally:
+            principal_cache.invalidate()
+
+
+class ReplicaTests(unittest.TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+        from sqlalchemy import create_engine
+        from webtest import TestApp
+        from . import main
+        from .metrics import engine_metrics
+        from .models import DBSession
+        from .scripts.seed import seed_database
+        self.directory = tempfile.mkdtemp()
+        primary = '%s/primary.sqlite' % self.directory
+        seed_database(create_engine('sqlite:///' + primary), 3, 1, 1, password='pw')
+        shutil.copy(primary, '%s/replica.sqlite' % self.directory)
+        create_engine('sqlite:///%s/replica.sqlite' % self.directory).execute(
+            "UPDATE posts SET title = 'From the replica' WHERE id = 1")
+        settings = {'sqlalchemy.url': 'sqlite:///' + primary,
+                    'sqlalchemy.replicas.a.url': 'sqlite:///%s/replica.sqlite' % self.directory,
+                    'sqlalchemy.replicas.b.url': 'sqlite:///%s/gone/x.sqlite' % self.directory,
+                    'pyramid.includes': 'pyramid_tm\npyramid_jinja2',
+                    'plog.passwords.sha256_crypt__rounds': '1000'}
+        settings.update(_render_settings())
+        DBSession.remove()
+        self.app = main({}, **settings)
+        self.client = TestApp(self.app)
+        engine_metrics.reset()
+
+    def tearDown(self):
+        import shutil
+        from .models import DBSession
+        DBSession.remove()
+        DBSession.configure(router=None)
+        shutil.rmtree(self.directory)
+
+    def test_reads_from_replica(self):
+        from .metrics import engine_metrics
+        for _ in range(3):
+            self.assertIn('From the replica', self.client.get('/').text)
+        engines = engine_metrics.snapshot()
+        self.assertEqual(engines['replica:a']['query_ms']['count'], 3)
+        self.assertNotIn('primary', engines)
+        # The missing replica was tried once and taken out of rotation.
+        stats = self.app.registry.replica_router.stats()
+        self.assertEqual(stats['b'], {'healthy': 0, 'failures': 1, 'chosen': 0})
+        self.assertEqual(stats['a']['chosen'], 3)
+
+    def test_sticky_after_write(self):
+        from .replicas import STICKY_COOKIE
+        response = self.client.post('/login', {'login': 'admin', 'password': 'pw',
+                                               'came_from': '/', 'form.submitted': '1'})
+        self.assertTrue([c for c in response.headers.getall('Set-Cookie')
+                         if c.startswith(STICKY_COOKIE + '=')])
+        self.assertNotIn('From the replica', self.client.get('/').text)
+        self.client.cookiejar.clear()
+        self.assertIn('From the replica', self.client.get('/').text)
+
+    def test_stale_replica_post_not_saved(self):
+        from sqlalchemy import create_engine, select
+        from .models import Post
+        table = Post.__table__
+        primary = create_engine('sqlite:///%s/primary.sqlite' % self.directory)
+        replica = create_engine('sqlite:///%s/replica.sqlite' % self.directory)
+        replica.execute(table.update().where(table.c.id == 2).values(
+            body='OLDBODY', body_html=None, body_html_version=None))
+        primary.execute(table.update().where(table.c.id == 2).values(
+            body='NEWBODY', body_html=None, body_html_version=None, version=2))
+        slug = primary.execute(select([table.c.slug]).where(table.c.id == 2)).scalar()
+        self.assertIn('OLDBODY', self.client.get('/post/' + slug).text)
+        self.assertEqual(tuple(primary.execute(
+            select([table.c.body, table.c.body_html, table.c.version]).
+            where(table.c.id == 2)).first()), ('NEWBODY', None, 2))
+
+    def test_replica_reads_not_cached(self):
+        from .cache import MemoryBackend, PageCache
+        from .slugs import slug_map
+        cache = self.app.registry.page_cache = PageCache(MemoryBackend())
+        for path in ('/', '/', '/post/just-created'):
+            response = self.client.get(path, status='*')
+            self.assertNotEqual(response.headers.get('X-Cache'), 'HIT')
+        self.client.get('/feed.atom')
+        self.assertEqual(cache.backend._data, {})
+        self.assertEqual(len(self.app.registry.feed_cache._documents), 0)
+        self.assertIs(slug_map.lookup('just-created'), slug_map.unknown)
+
+    def test_writes_go_to_primary(self):
+        from .models import DBSession, Post
+        from .replicas import RoutingSession
+        session = RoutingSession(bind=DBSession.bind, router=self.app.registry.replica_router)
+        session.info['read_only'] = True
+        self.assertEqual(session.query(Post).get(1).title, 'From the replica')
+        session.query(Post).filter_by(id=2).update({'title': 'Changed'})
+        self.assertEqual(session.query(Post.title).filter_by(id=1).scalar(),
+                         session.query(Post).get(1).title)
+        self.assertNotEqual(session.query(Post.title).filter_by(id=1).scalar(),
+                            'From the replica')
+        session.rollback()
+        session.close()
+
+
+class SessionTests(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.directory)
+
+    def _request(self, factory, cookie=None):
+        from pyramid import testing
+        request = testing.DummyRequest()
+        if cookie is not None:
+            request.cookies[factory.cookie_name] = cookie
+        return request
+
+    def _respond(self, request):
+        from pyramid.response import Response
+        response = Response()
+        request._process_response_callbacks(response)
+        return response
+
+    def _cookie(self, response):
+        from webob.cookies import parse_cookie
+        headers = response.headers.getall('Set-Cookie')
+        return dict(parse_cookie(headers[0])) if headers else None
+
+    def test_lazy_and_dirty(self):
+        from .sessions import MemoryStore, ServerSessionFactory
+        store = MemoryStore()
+        factory = ServerSessionFactory(store)
+        # No cookie: nothing to look up, nothing to write.
+        request = self._request(factory)
+        self.assertEqual(factory(request).get('x'), None)
+        self.assertIsNone(self._cookie(self._respond(request)))
+        self.assertEqual((store.stats.reads, store.stats.writes), (0, 0))
+
+        request = self._request(factory)
+        session = factory(request)
+        token = session.get_csrf_token()
+        session.flash('hello')
+        response = self._respond(request)
+        id = self._cookie(response)[b'plog_session'].decode('ascii')
+        self.assertEqual(len(id), 32)
+        self.assertIn('HttpOnly', response.headers['Set-Cookie'])
+        self.assertEqual(store.stats.writes, 1)
+
+        # Reading doesn't write, or set the cookie again.
+        request = self._request(factory, id)
+        session = factory(request)
+        self.assertEqual(session.get_csrf_token(), token)
+        self.assertEqual(session.peek_flash(), ['hello'])
+        self.assertIsNone(self._cookie(self._respond(request)))
+        self.assertEqual((store.stats.reads, store.stats.writes), (1, 1))
+
+        # A changed session is written under the same id.
+        request = self._request(factory, id)
+        self.assertEqual(factory(request).pop_flash(), ['hello'])
+        self.assertIsNone(self._cookie(self._respond(request)))
+        self.assertEqual(store.stats.writes, 2)
+        self.assertNotIn('_f_', store.get(id, 0)[2])
+
+        # Invalidating drops the stored session and the cookie.
+        request = self._request(factory, id)
+        factory(request).invalidate()
+        self.assertIn('Max-Age=0', self._respond(request).headers['Set-Cookie'])
+        self.assertIsNone(store.get(id, 0))
+
+        # Unknown and malformed ids start a new session.
+        self.assertTrue(factory(self._request(factory, 'x' * 32)).new)
+        reads = store.stats.reads
+        self.assertTrue(factory(self._request(factory, '../../etc')).new)
+        self.assertEqual(store.stats.reads, reads)
+
+    def test_expiry_renew_and_sweep(self):
+        from unittest import mock
+        from .sessions import MemoryStore, ServerSessionFactory
+        store = MemoryStore(max_entries=2)
+        factory = ServerSessionFactory(store, timeout=100, renew=10, sweep_interval=50)
+        with mock.patch('time.time', return_value=1000.0):
+            ids = []
+            for _ in range(3):
+                request = self._request(factory)
+                factory(request)['n'] = 1
+                ids.append(self._cookie(self._respond(request))[b'plog_session'].decode())
+        # The least recently used one was evicted.
+        self.assertIsNone(store.get(ids[0], 1000.0))
+        self.assertEqual(store.stats.sweeps, 1)
+        with mock.patch('time.time', return_value=1020.0):
+            request = self._request(factory, ids[1])
+            self.assertEqual(factory(request)['n'], 1)
+            self._respond(request)
+        # Used after ``renew`` seconds, so written again with a later expiry.
+        self.assertEqual(store.stats.writes, 4)
+        self.assertEqual(store.get(ids[1], 0)[0], 1120.0)
+        with mock.patch('time.time', return_value=1110.0):
+            self.assertTrue(factory(self._request(factory, ids[2])).new)
+            request = self._request(factory, ids[1])
+            factory(request)['n'] = 2
+            self._respond(request)
+        self.assertEqual(store.stats.sweeps, 2)
+        self.assertEqual(store.stats.swept, 1)
+        self.assertEqual(list(store._data), [ids[1]])
+
+    def test_sqlite_shared(self):
+        from .sessions import SQLiteStore, ServerSessionFactory
+        path = '%s/sub/sessions.sqlite' % self.directory
+        one = ServerSessionFactory(SQLiteStore(path))
+        two = ServerSessionFactory(SQLiteStore(path), sweep_interval=0)
+        request = self._request(one)
+        token = one(request).get_csrf_token()
+        id = self._cookie(self._respond(request))[b'plog_session'].decode()
+        request = self._request(two, id)
+        self.assertEqual(two(request).get_csrf_token(), token)
+        two(request).invalidate()
+        self._respond(request)
+        self.assertTrue(one(self._request(one, id)).new)
+
+    def test_settings(self):
+        from .sessions import (
+            MemoryStore,
+            ServerSessionFactory,
+            SQLiteStore,
+            session_factory_from_settings,
+        )
+        factory = session_factory_from_settings({'plog.session.max_entries': '5',
+                                                 'plog.session.timeout': '600'})
+        self.assertIsInstance(factory.store, MemoryStore)
+        self.assertEqual((factory.store.max_entries, factory.renew), (5, 60))
+        factory = session_factory_from_settings({
+            'plog.session.store': 'sqlite',
+            'plog.session.path': '%s/s.sqlite' % self.directory})
+        self.assertIsInstance(factory.store, SQLiteStore)
+        self.assertRaises(ValueError, session_factory_from_settings,
+                          {'plog.session.store': 'redis'})
+        factory = session_factory_from_settings({'plog.session.store': 'cookie',
+                                                 'plog.session_secret': 's'})
+        self.assertNotIsInstance(factory, ServerSessionFactory)
+
+    def _app(self):
+        from sqlalchemy import create_engine
+        from webtest import TestApp
+        from . import main
+        from .models import DBSession
+        from .scripts.seed import seed_database
+        url = 'sqlite:///%s/plog.sqlite' % self.directory
+        seed_database(create_engine(url), 1, 1, 1, password='pw')
+        settings = {'sqlalchemy.url': url,
+                    'pyramid.includes': 'pyramid_tm\npyramid_jinja2',
+                    'plog.session.store': 'sqlite',
+                    'plog.session.path': '%s/sessions.sqlite' % self.directory,
+                    'plog.passwords.sha256_crypt__rounds': '1000'}
+        settings.update(_render_settings())
+        DBSession.remove()
+        self.addCleanup(DBSession.remove)
+        app = main({}, **settings)
+        return TestApp(app), app.registry.session_factory.store
+
+    @staticmethod
+    def _login(client):
+        return client.post('/login', {'login': 'admin', 'password': 'pw',
+                                      'came_from': '/', 'form.submitted': '1'})
+
+    def test_app(self):
+        client, store = self._app()
+        client.get('/')
+        self._login(client)
+        self.assertEqual(store.stats.as_dict()['reads'], 0)
+        form = client.get('/post/add')
+        self.assertEqual(store.stats.writes, 1)
+        token = form.html.find('input', {'name': 'csrf_token'})['value']
+        client.post('/post/add', {'title': 'Session post', 'body': 'b',
+                                  'csrf_token': token, 'form.submitted': '1'})
+        self.assertIn('Session post', client.get('/').text)
+        self.assertEqual(store.stats.writes, 1)
+        client.get('/logout')
+        self.assertEqual(store.stats.deletes, 1)
+
+    def test_login_rotates_session(self):
+        import time
+        from .sessions import new_session_id
+        client, store = self._app()
+        planted = new_session_id()
+        store.set(planted, time.time(), {'_csrft_': 'planted'}, time.time() + 60)
+        client.set_cookie('plog_session', planted)
+        self._login(client)
+        self.assertIsNone(store.get(planted, time.time()))
+        form = client.get('/post/add')
+        self.assertNotEqual(client.cookies['plog_session'], planted)
+        self.assertNotEqual(form.html.find('input', {'name': 'csrf_token'})['value'], 'planted')
@@ -1,8 +1,18 @@
+import transaction
+
 from pyramid.response import Response
 from pyramid.view import view_config, forbidden_view_config
-from pyramid.httpexceptions import HTTPFound, HTTPForbidden
+from pyramid.httpexceptions import (
+    HTTPFound,
+    HTTPForbidden,
+    HTTPConflict,
+    HTTPMovedPermanently,
+    HTTPNotFound,
+)
 
 from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import joinedload, selectinload, undefer
+from sqlalchemy.orm.exc import StaleDataError
 
 from plog.models import (
     DBSession,
@@ -11,6 +21,16 @@ from plog.models import (
     Group,
     Permission,
 )
+from plog.security import invalidate_principals
+from plog.pagination import INT_MAX, Page, paginate, page_size, int_param
+from plog.search import search_posts, tokenize
+from plog.cache import cached_page, slug_key, invalidate_listing, invalidate_posts
+from plog.conditional import make_etag, not_modified
+from plog.rendering import is_stale, post_html, saves_renders, RENDERER_VERSION
+from plog.feeds import generate_feed, get_feed_cache
+from plog.replicas import from_replica
+from plog.slugs import slug_map, invalidate_slugs, claim_slugs, rename_post
+from plog.workers import get_shared_stats, process_stats
 
 from pyramid.security import (
     remember,
@@ -18,35 +38,113 @@ from pyramid.security import (
     authenticated_userid,
 )
 
-from passlib.hash import sha256_crypt
+from plog.passwords import verify_and_update, PoolBusy
 from slugify import slugify
 
 conn_err_msg = 'Plog is having a problem using your SQL database.'
 
 
-@view_config(route_name='home', renderer='home.jinja2')
+@view_config(route_name='home', renderer='templates/home.jinja2',
+             decorator=cached_page('home'))
 def home_view(request):
     try:
-        posts = DBSession.query(Post).all()
+        posts = paginate(request, DBSession.query(
+            Post.id, Post.title, Post.slug, Post.version, Post.updated_at,
+            Post.summary, Post.reading_time, Post.body_html_version), Post.id)
     except DBAPIError:
         return Response(conn_err_msg, content_type='text/plain', status_int=500)
+    logged_in = authenticated_userid(request)
+    # The render stamp changes when a lazy re-render fills in a summary.
+    etag = make_etag('home', bool(logged_in), posts.prev, posts.next, RENDERER_VERSION,
+                     *['%s.%s.%s' % (p.id, p.version, p.body_html_version) for p in posts])
+    last_modified = max([p.updated_at for p in posts] or [None])
+    response = not_modified(request, etag, last_modified)
+    if response is not None:
+        return response
     return {'posts': posts,
             'project': 'Plog',
-            'logged_in': authenticated_userid(request)}
+            'logged_in': logged_in}
 
 
-@view_config(route_name='post', renderer='post.jinja2', permission='view')
+@view_config(route_name='post', renderer='templates/post.jinja2', permission='view',
+             decorator=cached_page('post', slug_key))
 def post_view(request):
+    slug = request.matchdict['slug']
+
+    def load(found):
+        return found and DBSession.query(Post).options(undefer(Post.body_html)).\
+            filter_by(id=found[0]).first()
     try:
-        post = DBSession.query(Post).filter_by(slug=request.matchdict['slug']).first()
+        found = slug_map.lookup(slug)
+        cached = found is not slug_map.unknown
+        if not cached:
+            found = slug_map.query(DBSession, slug)
+        post = load(found)
+        if cached and found is not None and (post is None or post.slug != slug):
+            # The map may be stale; redirect or 404 on the database's word.
+            post = load(slug_map.query(DBSession, slug))
     except DBAPIError:
         return Response(conn_err_msg, content_type='text/plain', status_int=500)
+    if post is None:
+        return HTTPNotFound()
+    if post.slug != slug:
+        return HTTPMovedPermanently(location=request.route_url('post', slug=post.slug))
+    logged_in = authenticated_userid(request)
+    etag = make_etag('post', bool(logged_in), post.id, post.version, RENDERER_VERSION)
+    response = not_modified(request, etag, post.updated_at)
+    if response is not None:
+        return response
+    if is_stale(post) and saves_renders(DBSession):
+        # The listing shows the summary the re-render is about to save.
+        invalidate_listing(request)
     return {'post': post,
+            'body_html': post_html(DBSession, post),
+            'project': 'Plog',
+            'logged_in': logged_in}
+
+
+@view_config(route_name='feed_atom', permission='view')
+@view_config(route_name='feed_rss', permission='view')
+def feed_view(request):
+    kind = request.matched_route.name[len('feed_'):]
+    cache = get_feed_cache(request.registry)
+    key = (kind, request.application_url)
+    page = cache.get(key)
+    if page is None:
+        size = int(request.registry.settings.get('plog.feed.size', 20))
+        try:
+            page = generate_feed(request, DBSession, kind, size)
+        except DBAPIError:
+            return Response(conn_err_msg, content_type='text/plain', status_int=500)
+        if from_replica(DBSession):
+            # It may lag the primary: serve it but don't keep it.
+            return page.to_response()
+        cache.set(key, page)
+    # Lets the compression tween keep compressed copies in the page cache.
+    request.page_cache_key = ('feed', '%s|%s' % key)
+    return page.to_response()
+
+
+@view_config(route_name='search', renderer='templates/search.jinja2', permission='view')
+def search_view(request):
+    q = request.params.get('q', '')
+    limit = page_size(request)
+    # Keep the offset within a 64-bit integer.
+    page = min(max(int_param(request, 'page') or 1, 1), INT_MAX // limit)
+    try:
+        results = search_posts(tokenize(q), limit + 1, (page - 1) * limit)
+    except DBAPIError:
+        return Response(conn_err_msg, content_type='text/plain', status_int=500)
+    results = Page(results[:limit],
+                   next=page + 1 if len(results) > limit else None,
+                   prev=page - 1 if page > 1 else None)
+    return {'q': q,
+            'results': results,
             'project': 'Plog',
             'logged_in': authenticated_userid(request)}
 
 
-@view_config(route_name='add_post', renderer='add_post.jinja2', permission='edit')
+@view_config(route_name='add_post', renderer='templates/add_post.jinja2', permission='edit')
 def add_post(request):
     token = request.session.get_csrf_token()
     if request.method == 'POST':
@@ -54,7 +152,10 @@ def add_post(request):
             title = request.params['title']
             body = request.params['body']
             post = Post(title, body)
+            claim_slugs(DBSession, post.slug)
             DBSession.add(post)
+            invalidate_posts(request, post.slug)
+            invalidate_slugs(post.slug)
             return HTTPFound(location=request.route_url('post', slug=post.slug))
         else:
             return HTTPForbidden()
@@ -64,15 +165,23 @@ def add_post(request):
                 'logged_in': authenticated_userid(request)}
 
 
-@view_config(route_name='edit_post', renderer='edit_post.jinja2', permission='edit')
+@view_config(route_name='edit_post', renderer='templates/edit_post.jinja2', permission='edit')
 def edit_post(request):
     slug = request.matchdict['slug']
-    post = DBSession.query(Post).filter_by(slug=slug).one()
+    post = DBSession.query(Post).options(undefer(Post.body)).filter_by(slug=slug).one()
     if request.method == 'POST':
         post.title = request.params['title']
-        post.slug = slugify(request.params['title'])
+        rename_post(DBSession, post, slugify(request.params['title']))
         post.body = request.params['body']
         DBSession.add(post)
+        try:
+            DBSession.flush()
+        except StaleDataError:
+            # Someone else saved this post since we loaded it.
+            transaction.doom()
+            return HTTPConflict()
+        invalidate_posts(request, slug, post.slug)
+        invalidate_slugs(slug, post.slug)
         return HTTPFound(location=request.route_url('post', slug=post.slug))
     else:
         return {'project': 'Plog',
@@ -84,12 +193,15 @@ def edit_post(request):
 def delete_post(request):
     slug = request.matchdict['slug']
     post = DBSession.query(Post).filter_by(slug=slug).one()
+    former = [r.slug for r in post.redirects]
     DBSession.delete(post)
+    invalidate_posts(request, slug)
+    invalidate_slugs(slug, *former)
     return HTTPFound(location=request.route_url('admin'))
 
 
-@view_config(route_name='login', renderer='login.jinja2')
-@forbidden_view_config(renderer='login.jinja2')
+@view_config(route_name='login', renderer='templates/login.jinja2')
+@forbidden_view_config(renderer='templates/login.jinja2')
 def login(request):
     login_url = request.route_url('login')
     referrer = request.url
@@ -111,19 +223,28 @@ def login(request):
         login_name = request.params['login']
         password = request.params['password']
         user = DBSession.query(User).filter_by(username=login_name).first()
-        try:
-            if sha256_crypt.verify(password, user.password):
-                headers = remember(request, login_name)
-                return HTTPFound(location=came_from, headers=headers)
-        except AttributeError:
+        if user is None:
             context['message'] = 'No such user!'
             return context
+        try:
+            valid, new_hash = verify_and_update(password, user.password)
+        except PoolBusy:
+            request.response.status_int = 503
+            context['message'] = 'Too many logins right now, please try again.'
+            return context
+        if valid:
+            if new_hash is not None:
+                user.password = new_hash
+            # A new session, so an id planted before login is worthless.
+            request.session.invalidate()
+            headers = remember(request, login_name)
+            return HTTPFound(location=came_from, headers=headers)
         context['message'] = 'Wrong password!'
 
     return context
 
 
-@view_config(route_name='add_user', renderer='add_user.jinja2', permission='edit')
+@view_config(route_name='add_user', renderer='templates/add_user.jinja2', permission='edit')
 def add_user(request):
     token = request.session.get_csrf_token()
     groups = DBSession.query(Group).all()
@@ -137,6 +258,7 @@ def add_user(request):
             group = DBSession.query(Group).filter_by(name=group_name).one()
             user.group.append(group)
             DBSession.add(user)
+            invalidate_principals(username)
             return HTTPFound(location=request.route_url('admin'))
         else:
             return HTTPForbidden()
@@ -147,7 +269,7 @@ def add_user(request):
                 'groups': groups}
 
 
-@view_config(route_name='add_group', renderer='add_group.jinja2', permission='edit')
+@view_config(route_name='add_group', renderer='templates/add_group.jinja2', permission='edit')
 def add_group(request):
     token = request.session.get_csrf_token()
     permissions = DBSession.query(Permission).all()
@@ -170,11 +292,12 @@ def add_group(request):
         }
 
 
-@view_config(route_name='edit_user', renderer='edit_user.jinja2', permission='edit')
+@view_config(route_name='edit_user', renderer='templates/edit_user.jinja2', permission='edit')
 def edit_user(request):
     token = request.session.get_csrf_token()
     username = request.matchdict['username']
-    user = DBSession.query(User).filter_by(username=username).one()
+    user = DBSession.query(User).options(joinedload(User.group)).\
+        filter_by(username=username).one()
     groups = DBSession.query(Group).all()
     if request.method == 'POST':
         if token == request.params['csrf_token']:
@@ -186,6 +309,8 @@ def edit_user(request):
             user.group[:] = []
             user.group.append(group)
             DBSession.add(user)
+            invalidate_principals(username)
+            invalidate_principals(user.username)
             return HTTPFound(location=request.route_url('admin'))
         else:
             return HTTPForbidden()
@@ -202,6 +327,7 @@ def del_user(request):
     username = request.matchdict['username']
     user = DBSession.query(User).filter_by(username=username).one()
     DBSession.delete(user)
+    invalidate_principals(username)
     return HTTPFound(location=request.route_url('admin'))
 
 
@@ -210,13 +336,15 @@ def del_group(request):
     group_name = request.matchdict['group_name']
     group = DBSession.query(Group).filter_by(name=group_name).one()
     DBSession.delete(group)
+    invalidate_principals()
     return HTTPFound(location=request.route_url('admin'))
 
 
-@view_config(route_name='profile', renderer='profile.jinja2', permission='edit')
+@view_config(route_name='profile', renderer='templates/profile.jinja2', permission='edit')
 def profile(request):
     u_name = request.matchdict['username']
-    user = DBSession.query(User).filter_by(username=u_name).one()
+    user = DBSession.query(User).options(joinedload(User.group)).\
+        filter_by(username=u_name).one()
     group = user.group
     return {'user': user,
             'group': group,
@@ -225,17 +353,28 @@ def profile(request):
 
 @view_config(route_name='logout')
 def logout(request):
+    request.session.invalidate()
     headers = forget(request)
     return HTTPFound(location=request.route_url('admin'), headers=headers)
 
 
-@view_config(route_name='admin', renderer='admin.jinja2', permission='edit')
+@view_config(route_name='admin', renderer='templates/admin.jinja2', permission='edit')
 def admin(request):
-    posts = DBSession.query(Post).all()
-    users = DBSession.query(User).all()
-    groups = DBSession.query(Group).all()
+    posts = paginate(request, DBSession.query(Post.id, Post.title, Post.slug), Post.id, 'posts_')
+    users = paginate(request, DBSession.query(User).options(selectinload(User.group)),
+                     User.id, 'users_')
+    groups = paginate(request, DBSession.query(Group).options(joinedload(Group.permission)),
+                      Group.id, 'groups_')
     return {'project': 'Plog',
             'logged_in': authenticated_userid(request),
             'posts': posts,
             'users': users,
-            'groups': groups}
\ No newline at end of file
+            'groups': groups}
+
+
+@view_config(route_name='metrics', renderer='json', permission='edit')
+def metrics_view(request):
+    shared = get_shared_stats(request.registry)
+    if shared is not None:
+        return shared.aggregate()
+    return process_stats(request.registry)
@@ -0,0 +1,228 @@
+""" Running Plog in several worker processes.
+
+Every worker has to sign and check the same cookies, so the auth ticket
+secret comes from ``$PLOG_SECRET`` or ``plog.secret``, and the cookie
+session store's from ``$PLOG_SESSION_SECRET`` or ``plog.session_secret``.
+Without them each process makes up its own, which only works with a
+single process and logs everyone out on restart.
+
+With ``plog.prefork = true`` the application is meant to be loaded once
+in a master process and forked (uwsgi without ``lazy-apps``, gunicorn
+with ``--preload``): missing secrets are an error, nothing connects to
+the database before the fork, and each worker disposes of the engine's
+pool, starts its own password pool and warms the slug map as it starts.
+Templates are still compiled before the fork, so workers share them.
+The principal cache and the slug map stay per process, and learn of
+other workers' invalidations through ``plog.invalidation.directory``
+(see :mod:`plog.generations`).
+
+Per-process statistics are merged across workers through
+``plog.stats.directory``: each worker writes its snapshot there at most
+every ``plog.stats.interval`` seconds, and ``/admin/metrics`` adds up the
+snapshots of the workers that are still alive.
+"""
+import json
+import os
+import tempfile
+import time
+from uuid import uuid4
+
+from pyramid.settings import asbool
+
+from plog.cache import get_page_cache
+from plog.compression import compression_stats
+from plog.metrics import Histogram, engine_metrics, metrics
+from plog.models import DBSession
+from plog.passwords import configure_passwords
+from plog.replicas import get_router
+from plog.security import principal_cache
+from plog.sessions import get_session_store
+from plog.slugs import slug_map, warm_slug_map
+
+SECRETS = {'plog.secret': 'PLOG_SECRET',
+           'plog.session_secret': 'PLOG_SESSION_SECRET'}
+
+
+def get_secret(settings, name):
+    """ The secret ``name`` from the environment or the settings. """
+    value = os.environ.get(SECRETS[name]) or settings.get(name)
+    if value:
+        return value
+    if asbool(settings.get('plog.prefork')):
+        raise ValueError('%s (or $%s) must be set when several workers share '
+                         'cookies' % (name, SECRETS[name]))
+    return uuid4().hex
+
+
+def process_stats(registry):
+    """ This process's statistics, as ``/admin/metrics`` shows them. """
+    page_cache = get_page_cache(registry)
+    router = get_router(registry)
+    sessions = get_session_store(registry)
+    return {'routes': metrics.snapshot(),
+            'engines': engine_metrics.snapshot(),
+            'replicas': router.stats() if router is not None else {},
+            'principal_cache': principal_cache.stats(),
+            'slug_map': slug_map.stats(),
+            'page_cache': page_cache.stats() if page_cache is not None else None,
+            'compression': compression_stats.snapshot(),
+            'sessions': sessions.stats.as_dict() if sessions is not None else {}}
+
+
+def _add_counters(total, stats):
+    for key, value in stats.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+def merge_stats(snapshots):
+    """ Add up :func:`process_stats` snapshots of several workers. """
+    routes, engines, compression = {}, {}, {}
+    merged = {'routes': {}, 'engines': {}, 'replicas': {}, 'principal_cache': {},
+              'slug_map': {}, 'page_cache': None, 'compression': {}, 'sessions': {},
+              'workers': len(snapshots)}
+    for snapshot in snapshots:
+        for route, m in snapshot['routes'].items():
+            histograms = routes.setdefault(route, {})
+            for name, h in m.items():
+                histograms.setdefault(name, Histogram()).merge(h)
+        for name, e in snapshot.get('engines', {}).items():
+            engine = engines.setdefault(name, {'query_ms': Histogram(), 'errors': 0})
+            engine['query_ms'].merge(e['query_ms'])
+            engine['errors'] += e['errors']
+        for name, r in snapshot.get('replicas', {}).items():
+            # 'healthy' becomes the number of workers that see it healthy.
+            _add_counters(merged['replicas'].setdefault(name, {}), r)
+        for route, c in snapshot['compression'].items():
+            _add_counters(compression.setdefault(route, {}), c)
+        _add_counters(merged['principal_cache'], snapshot['principal_cache'])
+        _add_counters(merged['slug_map'], snapshot['slug_map'])
+        _add_counters(merged['sessions'], snapshot.get('sessions', {}))
+        if snapshot['page_cache'] is not None:
+            merged['page_cache'] = _add_counters(merged['page_cache'] or {},
+                                                 snapshot['page_cache'])
+    for route, histograms in routes.items():
+        merged['routes'][route] = dict((name, h.as_dict()) for name, h in histograms.items())
+    for name, e in engines.items():
+        merged['engines'][name] = {'query_ms': e['query_ms'].as_dict(), 'errors': e['errors']}
+    for route, c in compression.items():
+        c['ratio'] = float(c['bytes_out']) / c['bytes_in'] if c['bytes_in'] else None
+        merged['compression'][route] = c
+    page_cache = merged['page_cache']
+    if page_cache is not None:
+        lookups = page_cache['hits'] + page_cache['misses']
+        page_cache['hit_ratio'] = float(page_cache['hits']) / lookups if lookups else 0.0
+    return merged
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class SharedStats(object):
+    """ Worker snapshots in a directory, one ``<pid>.json`` file each. """
+
+    def __init__(self, directory, collect, interval=5.0):
+        self.directory = directory
+        self.collect = collect
+        self.interval = interval
+        self._written = 0.0
+
+    def write(self):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.collect(), f)
+        os.replace(tmp, os.path.join(self.directory, '%d.json' % os.getpid()))
+        self._written = time.monotonic()
+
+    def tick(self):
+        """ :meth:`write` if the last write is older than the interval. """
+        if time.monotonic() - self._written >= self.interval:
+            self.write()
+
+    def read(self):
+        """ The snapshots of live workers; files of dead ones are removed. """
+        snapshots = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            if not _alive(int(name[:-len('.json')])):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (IOError, OSError, ValueError):
+                pass
+        return snapshots
+
+    def aggregate(self):
+        self.write()
+        return merge_stats(self.read())
+
+
+def shared_stats_from_settings(registry):
+    settings = registry.settings
+    directory = settings.get('plog.stats.directory')
+    if not directory:
+        return None
+    return SharedStats(directory, lambda: process_stats(registry),
+                       float(settings.get('plog.stats.interval', 5)))
+
+
+def get_shared_stats(registry):
+    return getattr(registry, 'shared_stats', None)
+
+
+_forked = {'pid': os.getpid(), 'registry': None}
+
+
+def after_fork():
+    """ Make a forked worker independent of its master.  Runs once per
+    process, however many fork hooks call it.
+    """
+    registry = _forked['registry']
+    if registry is None or _forked['pid'] == os.getpid():
+        return
+    _forked['pid'] = os.getpid()
+    settings = registry.settings
+    # Connections opened by the master must not be shared.
+    DBSession.bind.dispose()
+    router = get_router(registry)
+    if router is not None:
+        for replica in router.replicas:
+            replica.engine.dispose()
+    configure_passwords(settings)
+    metrics.reset()
+    engine_metrics.reset()
+    compression_stats.reset()
+    warm_slug_map(settings, DBSession.bind)
+
+
+def install_fork_hooks(registry):
+    """ Run :func:`after_fork` in every worker forked from this process. """
+    first = _forked['registry'] is None
+    _forked['registry'] = registry
+    _forked['pid'] = os.getpid()
+    if not first:
+        return
+    os.register_at_fork(after_in_child=after_fork)
+    try:
+        # uwsgi forks from C; its own hook covers that.
+        from uwsgidecorators import postfork
+    except ImportError:
+        pass
+    else:
+        postfork(after_fork)
@@ -15,6 +15,7 @@ requires = [
     'pyramid_jinja2',
     'zope.sqlalchemy',
     'uwsgi', 'passlib', 'python-slugify',
+    'Markdown', 'Pygments',
 ]
 
 setup(name='Plog',
@@ -36,10 +37,24 @@ setup(name='Plog',
       zip_safe=False,
       test_suite='plog',
       install_requires=requires,
+      extras_require={'brotli': ['brotli'],
+                      'asgi': ['aiosqlite', 'uvicorn']},
       entry_points="""\
       [paste.app_factory]
       main = plog:main
       [console_scripts]
       initialize_Plog_db = plog.scripts.initializedb:main
+      migrate_Plog_db = plog.scripts.migrate:main
+      plog_import = plog.scripts.archive:import_main
+      plog_export = plog.scripts.archive:export_main
+      plog_bench_login = plog.scripts.bench_login:main
+      plog_bench_profiles = plog.scripts.bench_profiles:main
+      plog_bench = plog.scripts.benchmark:main
+      plog_seed = plog.scripts.seed:main
+      plog_compile_templates = plog.scripts.compile_templates:main
+      plog_compress_static = plog.scripts.compress_static:main
+      plog_render_posts = plog.scripts.render_posts:main
+      plog_build_static = plog.scripts.build_static:main
+      plog_bench_asgi = plog.scripts.bench_asgi:main
       """,
       )